@@ -3,6 +3,7 @@ import sys
 
 from tabulate import tabulate
 
+from src.game_enums import Color
 from src.games.chess import Chess
 from src.games.draughts import Draughts
 from src.games.othello import Othello
@@ -55,7 +56,8 @@ class TerminalGame():
             sys.exit()
 
     def _display_board_and_winner(self):
-        self.display_message = f'\n{self.BLUE}{self.player} wins!!! Thanks for playing.....{self.END}\n'
+        result = 'Draw!!!' if self.game.winner is Color.NONE else f'{self.player} wins!!!'
+        self.display_message = f'\n{self.BLUE}{result} Thanks for playing.....{self.END}\n'
         self._display_board_to_terminal()
 
     def _make_move(self):
@@ -1,15 +1,23 @@
 """Create main app."""
 import os
+import uuid
 
 from flask import Flask, jsonify, request, render_template, session, url_for
 from flask_session import Session
 
+from src.engines import ENGINES
+from src.engines.jobs import DONE, JobQueueFull, SEARCH_JOBS
+from src.game_enums import Color
 from src.games.chess import Chess
 from src.games.draughts import Draughts
 from src.games.othello import Othello
 from src.game_errors import IllegalMoveError
 
 
+# Upper limit on seconds a computer move poll may wait for its search to finish
+MAX_POLL_SECONDS = float(os.environ.get('MAX_POLL_SECONDS', 2))
+
+
 def create_app():
     app = Flask(__name__)
     app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY')
@@ -23,7 +31,10 @@ def create_app():
 
     def play_game(game, *, move_piece_game=True):
         session['current_game'] = game
-        return render_template('game.html', game=game, move_piece_game=move_piece_game)
+        # Keys the Monte Carlo tree kept for this game between computer moves
+        session['search_tree_key'] = uuid.uuid4().hex
+        return render_template('game.html', game=game, move_piece_game=move_piece_game,
+                               computer_player=type(game) in ENGINES)
 
     @app.route('/chess')
     def chess():
@@ -49,12 +60,89 @@ def create_app():
         except IllegalMoveError as err:
             return json_response(game, err=err.message)
 
-    def json_response(game, err=None):
+    @app.route('/computer_move/submit')
+    def submit_computer_move():
+        """Queue computer move search. Return job id, reusing the ponder job if it predicted this position.
+
+           ?ponder=1 opts in to pondering on the opponent's time once this move is played.
+        """
+        game = session['current_game']
+        session['computer_move'] = {
+            'seconds': float(request.args.get('seconds', 1)),
+            'method': request.args.get('method', 'search'),
+            'ponder': request.args.get('ponder') == '1'
+        }
+        ponder_job_id = session.pop('ponder_job_id', None)
+        job_id = ponder_job_id and SEARCH_JOBS.reuse(ponder_job_id, game)
+        if job_id:
+            return jsonify(job_id=job_id, err=None, pondered=True)
+        try:
+            job_id = SEARCH_JOBS.submit(game, session['computer_move']['seconds'],
+                                        method=session['computer_move']['method'],
+                                        tree_key=session.get('search_tree_key'))
+        except JobQueueFull as err:
+            return jsonify(job_id=None, err=str(err)), 503
+        return jsonify(job_id=job_id, err=None, pondered=False)
+
+    @app.route('/computer_move/<job_id>')
+    def computer_move(job_id):
+        """Return job state, waiting up to ?wait= seconds for it to finish.
+
+           A finished search's move is played if the game is still in the position searched.
+        """
+        game = session['current_game']
+        wait = min(float(request.args.get('wait', 0)), MAX_POLL_SECONDS)
+        try:
+            status = SEARCH_JOBS.wait(job_id, wait)
+        except KeyError:
+            return jsonify(job=None, err='Unknown computer move job'), 404
+
+        search = None
+        if status.state == DONE:
+            result = status.result
+            if result.move and game.position_hash == status.position_hash:
+                game.move(*result.move)
+                start_pondering(game)
+            search = {
+                'depth': result.depth,
+                'nodes': result.nodes,
+                'nodes_per_second': result.nodes_per_second,
+                'score': result.score
+            }
+        return json_response(game, err=status.error, search=search, job=status.state)
+
+    @app.route('/computer_move/<job_id>/cancel')
+    def cancel_computer_move(job_id):
+        game = session['current_game']
+        try:
+            status = SEARCH_JOBS.cancel(job_id)
+        except KeyError:
+            return jsonify(job=None, err='Unknown computer move job'), 404
+        return json_response(game, job=status.state)
+
+    @app.route('/must_capture')
+    def must_capture():
+        game = session['current_game']
+        capturing_coords = game.must_capture() if isinstance(game, Draughts) else ()
+        return jsonify(must_capture=sorted(f'{coords.x}{coords.y}' for coords in capturing_coords))
+
+    def start_pondering(game):
+        settings = session.get('computer_move')
+        if not settings or not settings['ponder'] or game.winner:
+            return
+        # None if no worker is idle, as pondering never holds up other searches
+        session['ponder_job_id'] = SEARCH_JOBS.submit(game, settings['seconds'], method=settings['method'],
+                                                      ponder=True, tree_key=session.get('search_tree_key'))
+
+    def json_response(game, err=None, search=None, job=None):
         return jsonify(
             board=game.display_board(),
             next_player=game.playing_color.value,
-            winner=game.winner,
-            err=err
+            winner=game.winner and game.winner.value,
+            draw=game.winner is Color.NONE,
+            err=err,
+            search=search,
+            job=job
         )
 
     return app
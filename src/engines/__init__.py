@@ -0,0 +1,56 @@
+"""Computer opponents for each game, called through best_move(game, budget).
+
+   Functions:
+        best_move: return SearchResult for player to move in any supported game
+
+   Each game has its own alpha-beta engine, and src.engines.mcts plays any
+   Game through the legal_moves/apply_move/undo_move/outcome protocol. Games
+   with an opening book (see src.engines.opening_book) play book moves
+   without searching while the position is in the book.
+"""
+from src.engines.search import SearchBudget, SearchResult
+from src.engines import chess_engine, draughts_engine, mcts, opening_book, othello_engine
+from src.games.chess import Chess
+from src.games.draughts import Draughts
+from src.games.othello import Othello
+
+
+# Game class: engine best_move function
+ENGINES = {
+    Chess: chess_engine.best_move,
+    Draughts: draughts_engine.best_move,
+    Othello: othello_engine.best_move,
+}
+
+
+def best_move(game, budget=None, method='search', use_book=True, tree=None, table=None, random_generator=None):
+    """Search game for player to move within SearchBudget. Return SearchResult.
+
+       method:   'search' for the game's own engine from ENGINES, or 'mcts' for
+                 Monte Carlo Tree Search, which plays any Game.
+       use_book: play the opening book move, if any, without searching. Book
+                 moves come back with depth and nodes of 0.
+       tree:     MonteCarloTree kept for this game by method 'mcts' (see
+                 src.engines.mcts.best_move), default a new tree per search.
+       table:    TranspositionTable for method 'search', default the engine's
+                 own SEARCH_TABLE shared by every game.
+       random_generator: random.Random choosing between book moves.
+
+       SearchResult.move can be played with game.move(*result.move).
+       Raises ValueError for unknown methods or games without an engine.
+    """
+    if use_book:
+        move = opening_book.book_move(game, random_generator)
+        if move is not None:
+            return SearchResult(move, 0, 0, 0, 0.0, 0)
+    if method == 'mcts':
+        return mcts.best_move(game, budget or SearchBudget(), tree)
+    if method != 'search':
+        raise ValueError(f'Unknown search method {method}')
+    try:
+        engine = ENGINES[type(game)]
+    except KeyError:
+        raise ValueError(f'No engine for {game.__class__.__name__}') from None
+    if table is None:
+        return engine(game, budget or SearchBudget())
+    return engine(game, budget or SearchBudget(), table)
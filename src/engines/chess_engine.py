@@ -0,0 +1,281 @@
+"""Alpha-beta search engine for Chess.
+
+   Negamax alpha-beta with iterative deepening, principal variation move
+   ordering from a transposition table, MVV-LVA captures, killer moves and a
+   quiescence search over captures. Search runs on a copy of the game using
+   Chess.apply_move/undo_move, so the passed game is never changed.
+
+   Functions:
+        best_move: return SearchResult for Chess player to move
+        evaluate:  return int score of position for player to move
+
+   Usage: python -m src.engines.chess_engine [SECONDS] [FEN]
+"""
+from copy import deepcopy
+import os
+import sys
+
+from src.game_enums import Color
+from src.games.bitboard import squares
+from src.games.chess import Chess
+from src.games.game import ALPHABET
+from src.games.transposition import TranspositionTable
+from src.engines.search import iterative_deepening, SearchBudget, SearchClock
+from src.engines.tablebase import search_score, TABLEBASES
+
+
+PIECE_VALUES = {'King': 0, 'Queen': 900, 'Rook': 500, 'Bishop': 330, 'Knight': 320, 'Pawn': 100}
+MATE_SCORE = 100_000
+# Scores beyond this are mates, adjusted by distance from root so shorter mates score higher
+MATE_THRESHOLD = MATE_SCORE - 1000
+
+EXACT, LOWER_BOUND, UPPER_BOUND = 0, 1, 2
+
+# Shared by every search in the process, so later moves of a game reuse earlier work
+SEARCH_TABLE = TranspositionTable(max_entries=int(os.environ.get('CHESS_SEARCH_TABLE_ENTRIES', 500_000)))
+
+
+def _centre_bonus(weight):
+    """Return 64 tuple of bonuses growing towards board centre."""
+    return tuple(weight * (3 - max(abs(2 * (square % 8) - 7), abs(2 * (square // 8) - 7)) // 2)
+                 for square in range(64))
+
+
+def _pawn_bonus():
+    """Return 64 tuple of bonuses for White Pawns advancing, centre files worth more."""
+    return tuple(0 if square // 8 in (0, 7) else (square // 8 - 1) * (6 if 2 <= square % 8 <= 5 else 3)
+                 for square in range(64))
+
+
+def _king_bonus():
+    """Return 64 tuple favouring a White King staying on its back rank, away from centre files."""
+    return tuple((20 if square % 8 in (1, 2, 6) else 0) - 10 * min(square // 8, 3) for square in range(64))
+
+
+# Bonuses from White's point of view, index square ^ 56 flips a square for Black
+PIECE_SQUARE_BONUS = {
+    'King': _king_bonus(),
+    'Queen': _centre_bonus(2),
+    'Rook': _centre_bonus(1),
+    'Bishop': _centre_bonus(5),
+    'Knight': _centre_bonus(10),
+    'Pawn': _pawn_bonus()
+}
+
+
+def evaluate(game):
+    """Return int score of game position in centipawns from point of view of player to move."""
+    score = 0
+    for color, sign, flip in ((Color.WHITE, 1, 0), (Color.BLACK, -1, 56)):
+        for name, mask in game.bitboards.pieces[color].items():
+            value = PIECE_VALUES[name]
+            bonus = PIECE_SQUARE_BONUS[name]
+            for square in squares(mask):
+                score += sign * (value + bonus[square ^ flip])
+    return score if game.playing_color == Color.WHITE else -score
+
+
+def best_move(game, budget=None, table=SEARCH_TABLE, root_moves=None, history=None, tablebases=TABLEBASES):
+    """Search Chess game for player to move within budget. Return SearchResult.
+
+       SearchResult.move is a (from_coords, to_coords) tuple for game.move, or
+       None if the game is over. score is in centipawns for the player to move.
+
+       root_moves: optional moves to search at the root instead of every legal move.
+       history:    optional list, (depth, move, score) appended for each completed depth.
+       tablebases: Tablebases probed for exact results of endgame positions below the root.
+    """
+    return ChessSearch(game, budget or SearchBudget(), table, root_moves, tablebases).run(history)
+
+
+class ChessSearch():
+    """State of one Chess search: game copy, clock, killer moves and search path.
+
+       Methods:
+            run
+    """
+
+    def __init__(self, game, budget, table, root_moves=None, tablebases=TABLEBASES):
+        self.game = deepcopy(game)
+        self.root_moves = root_moves
+        self.tablebases = tablebases
+        self.clock = SearchClock(budget)
+        self.table = table
+        self.killers = {}
+        self.path_hashes = []
+        self.root_move = None
+
+    def run(self, history=None):
+        """Return SearchResult from iterative deepening of the root position."""
+        moves = self._root_legal_moves()
+        if self.game.winner or not moves:
+            return self.clock.result(None, 0, 0)
+        return iterative_deepening(self._search_root, self.clock, moves[0], decisive_score=MATE_THRESHOLD,
+                                   history=history)
+
+    def _root_legal_moves(self):
+        moves = self.game.legal_moves()
+        if self.root_moves is None:
+            return moves
+        return [move for move in moves if move in self.root_moves]
+
+    def _search_root(self, depth):
+        score = self._negamax(depth, -MATE_SCORE, MATE_SCORE, 0)
+        return self.root_move, score
+
+    def _negamax(self, depth, alpha, beta, ply):
+        self.clock.tick()
+        game = self.game
+        position_hash = game.position_hash
+
+        if ply and position_hash in self.path_hashes:
+            # Repeating a position on the search path is treated as a draw
+            return 0
+
+        if ply:
+            result = self.tablebases.probe(game)
+            if result is not None:
+                return search_score(result, ply, MATE_SCORE)
+
+        entry = self.table.get(position_hash)
+        table_move = None
+        if entry:
+            entry_depth, entry_score, bound, table_move = entry
+            entry_score = _score_from_table(entry_score, ply)
+            if ply and entry_depth >= depth:
+                if (bound == EXACT or (bound == LOWER_BOUND and entry_score >= beta)
+                        or (bound == UPPER_BOUND and entry_score <= alpha)):
+                    return entry_score
+
+        moves = game.legal_moves() if ply else self._root_legal_moves()
+        if not moves:
+            return -MATE_SCORE + ply if game.in_check() else 0
+        if depth <= 0:
+            return self._quiescence(alpha, beta, ply)
+
+        original_alpha = alpha
+        best_score, best = -MATE_SCORE, None
+        self.path_hashes.append(position_hash)
+        try:
+            for move in self._ordered_moves(moves, table_move, ply):
+                undo_record = game.apply_move(*move)
+                try:
+                    score = -self._negamax(depth - 1, -beta, -alpha, ply + 1)
+                finally:
+                    game.undo_move(undo_record)
+                if score > best_score:
+                    best_score, best = score, move
+                if score > alpha:
+                    alpha = score
+                if alpha >= beta:
+                    if not self._capture(move):
+                        self._add_killer(move, ply)
+                    break
+        finally:
+            self.path_hashes.pop()
+
+        if best_score <= original_alpha:
+            bound = UPPER_BOUND
+        elif best_score >= beta:
+            bound = LOWER_BOUND
+        else:
+            bound = EXACT
+        if ply or self.root_moves is None:
+            # A root searched over only some moves has no true score to share
+            self.table.put(position_hash, (depth, _score_to_table(best_score, ply), bound, best))
+        if not ply:
+            self.root_move = best
+        return best_score
+
+    def _quiescence(self, alpha, beta, ply):
+        """Search captures only until position is quiet, so evaluation isn't taken mid exchange."""
+        self.clock.tick()
+        game = self.game
+        in_check = game.in_check()
+        if not in_check:
+            stand_pat = evaluate(game)
+            if stand_pat >= beta:
+                return stand_pat
+            alpha = max(alpha, stand_pat)
+
+        moves = game.legal_moves()
+        if not moves:
+            return -MATE_SCORE + ply if in_check else 0
+        if not in_check:
+            moves = [move for move in moves if self._capture(move)]
+
+        for move in self._ordered_moves(moves, None, ply):
+            undo_record = game.apply_move(*move)
+            try:
+                score = -self._quiescence(-beta, -alpha, ply + 1)
+            finally:
+                game.undo_move(undo_record)
+            if score >= beta:
+                return score
+            alpha = max(alpha, score)
+        return alpha
+
+    def _ordered_moves(self, moves, table_move, ply):
+        """Return moves sorted best first: table move, captures by MVV-LVA, killers, the rest."""
+        killers = self.killers.get(ply, ())
+        board = self.game.board
+
+        def move_order(move):
+            from_coords, to_coords = move
+            if move == table_move:
+                return -1_000_000
+            victim = board[to_coords.x][to_coords.y]
+            if victim:
+                attacker = board[from_coords.x][from_coords.y]
+                return -10 * PIECE_VALUES[victim.name] + PIECE_VALUES[attacker.name] // 100 - 10_000
+            if move in killers:
+                return -5_000
+            return 0
+        return sorted(moves, key=move_order)
+
+    def _capture(self, move):
+        from_coords, to_coords = move
+        game = self.game
+        if game.board[to_coords.x][to_coords.y] is not None:
+            return True
+        # En passant lands on empty square diagonally
+        piece = game.board[from_coords.x][from_coords.y]
+        return piece.name == 'Pawn' and from_coords.x != to_coords.x
+
+    def _add_killer(self, move, ply):
+        killers = self.killers.get(ply, ())
+        if move not in killers:
+            self.killers[ply] = (move,) + killers[:1]
+
+
+def _score_to_table(score, ply):
+    # Mate scores are stored as distance from this position, not from the search root
+    if score > MATE_THRESHOLD:
+        return score + ply
+    if score < -MATE_THRESHOLD:
+        return score - ply
+    return score
+
+
+def _score_from_table(score, ply):
+    if score > MATE_THRESHOLD:
+        return score - ply
+    if score < -MATE_THRESHOLD:
+        return score + ply
+    return score
+
+
+def _notation(coords):
+    return f'{ALPHABET[coords.x]}{coords.y + 1}'
+
+
+def _print_search(seconds, fen=None):
+    game = Chess.from_fen(fen) if fen else Chess()
+    result = best_move(game, SearchBudget(seconds=seconds))
+    move = ' '.join(_notation(coords) for coords in result.move) if result.move else 'none'
+    print(f'best move {move}  score {result.score}  depth {result.depth}  nodes {result.nodes}  '
+          f'{result.seconds:.2f}s  {result.nodes_per_second} nps')
+
+
+if __name__ == '__main__':
+    _print_search(float(sys.argv[1]) if len(sys.argv) > 1 else 1.0, ' '.join(sys.argv[2:]) or None)
@@ -0,0 +1,240 @@
+"""Alpha-beta search engine for Draughts.
+
+   Negamax alpha-beta with iterative deepening and a transposition table, run
+   on a copy of the game using Draughts.apply_move/undo_move. Captures are
+   compulsory, so they are always searched first and a position is never
+   evaluated while the player to move still has a capture to make: the search
+   carries on through capture sequences until the position is quiet.
+
+   Functions:
+        best_move: return SearchResult for Draughts player to move
+        evaluate:  return int score of position for player to move
+
+   Usage: python -m src.engines.draughts_engine [SECONDS]
+"""
+from copy import deepcopy
+import os
+import sys
+
+from src.game_enums import Color
+from src.games.draughts import Draughts
+from src.games.transposition import TranspositionTable
+from src.engines.search import iterative_deepening, SearchBudget, SearchClock
+from src.engines.tablebase import search_score, TABLEBASES
+
+
+MAN_VALUE = 100
+KING_VALUE = 250
+# Men left on their own back row stop opponent counters being crowned
+BACK_RANK_BONUS = 10
+MOBILITY_WEIGHT = 3
+WIN_SCORE = 100_000
+# Scores beyond this are wins, adjusted by distance from root so quicker wins score higher
+WIN_THRESHOLD = WIN_SCORE - 1000
+
+EXACT, LOWER_BOUND, UPPER_BOUND = 0, 1, 2
+
+# Shared by every search in the process, so later moves of a game reuse earlier work
+SEARCH_TABLE = TranspositionTable(max_entries=int(os.environ.get('DRAUGHTS_SEARCH_TABLE_ENTRIES', 500_000)))
+
+BACK_ROW = {Color.WHITE: 0, Color.BLACK: 7}
+KING_ROW = {Color.WHITE: 7, Color.BLACK: 0}
+
+
+def evaluate(game):
+    """Return int score of game position from point of view of player to move.
+
+       Counts material (crowned counters worth more), men guarding their back
+       row and the number of non capturing moves each side has.
+    """
+    score = 0
+    for color, sign in ((Color.WHITE, 1), (Color.BLACK, -1)):
+        back_row = BACK_ROW[color]
+        for coords, piece in game.color_positions(color):
+            if piece.crowned:
+                score += sign * KING_VALUE
+            else:
+                score += sign * (MAN_VALUE + (BACK_RANK_BONUS if coords.y == back_row else 0))
+        score += sign * MOBILITY_WEIGHT * game.simple_move_count(color)
+    return score if game.playing_color == Color.WHITE else -score
+
+
+def best_move(game, budget=None, table=SEARCH_TABLE, root_moves=None, history=None, tablebases=TABLEBASES):
+    """Search Draughts game for player to move within budget. Return SearchResult.
+
+       SearchResult.move is a (from_coords, to_coords) tuple for game.move, or
+       None if the player to move has no legal move (and so has lost).
+
+       root_moves: optional moves to search at the root instead of every legal move.
+       history:    optional list, (depth, move, score) appended for each completed depth.
+       tablebases: Tablebases probed for exact results of endgame positions below the root.
+    """
+    return DraughtsSearch(game, budget or SearchBudget(), table, root_moves, tablebases).run(history)
+
+
+class DraughtsSearch():
+    """State of one Draughts search: game copy, clock, killer moves and search path.
+
+       Methods:
+            run
+    """
+
+    def __init__(self, game, budget, table, root_moves=None, tablebases=TABLEBASES):
+        self.game = deepcopy(game)
+        self.root_moves = root_moves
+        self.tablebases = tablebases
+        self.clock = SearchClock(budget)
+        self.table = table
+        self.killers = {}
+        self.path_hashes = []
+        self.root_move = None
+
+    def run(self, history=None):
+        """Return SearchResult from iterative deepening of the root position."""
+        moves = self._root_legal_moves()
+        if not moves:
+            return self.clock.result(None, 0, 0)
+        return iterative_deepening(self._search_root, self.clock, moves[0], decisive_score=WIN_THRESHOLD,
+                                   history=history)
+
+    def _root_legal_moves(self):
+        moves = self.game.legal_moves()
+        if self.root_moves is None:
+            return moves
+        return [move for move in moves if move in self.root_moves]
+
+    def _search_root(self, depth):
+        score = self._negamax(depth, -WIN_SCORE, WIN_SCORE, 0)
+        return self.root_move, score
+
+    def _negamax(self, depth, alpha, beta, ply):
+        self.clock.tick()
+        game = self.game
+        position_hash = game.position_hash
+
+        if ply and position_hash in self.path_hashes:
+            # Crowned counters can shuffle forever, repeating a position on the search path is a draw
+            return 0
+
+        if ply:
+            result = self.tablebases.probe(game)
+            if result is not None:
+                return search_score(result, ply, WIN_SCORE)
+
+        entry = self.table.get(position_hash)
+        table_move = None
+        if entry:
+            entry_depth, entry_score, bound, table_move = entry
+            entry_score = _score_from_table(entry_score, ply)
+            if ply and entry_depth >= depth:
+                if (bound == EXACT or (bound == LOWER_BOUND and entry_score >= beta)
+                        or (bound == UPPER_BOUND and entry_score <= alpha)):
+                    return entry_score
+
+        captures = bool(game.must_capture())
+        if depth <= 0 and not captures:
+            return self._quiescence(alpha, beta, ply)
+        moves = game.legal_moves() if ply else self._root_legal_moves()
+        if not moves:
+            return -WIN_SCORE + ply
+
+        original_alpha = alpha
+        best_score, best = -WIN_SCORE, None
+        self.path_hashes.append(position_hash)
+        try:
+            for move in self._ordered_moves(moves, captures, table_move, ply):
+                undo_record = game.apply_move(*move)
+                try:
+                    # Captures don't use up depth, so exchanges are always searched to the end
+                    score = -self._negamax(depth if captures and depth <= 0 else depth - 1, -beta, -alpha, ply + 1)
+                finally:
+                    game.undo_move(undo_record)
+                if score > best_score:
+                    best_score, best = score, move
+                if score > alpha:
+                    alpha = score
+                if alpha >= beta:
+                    if not captures:
+                        self._add_killer(move, ply)
+                    break
+        finally:
+            self.path_hashes.pop()
+
+        if best_score <= original_alpha:
+            bound = UPPER_BOUND
+        elif best_score >= beta:
+            bound = LOWER_BOUND
+        else:
+            bound = EXACT
+        if ply or self.root_moves is None:
+            # A root searched over only some moves has no true score to share
+            self.table.put(position_hash, (max(depth, 0), _score_to_table(best_score, ply), bound, best))
+        if not ply:
+            self.root_move = best
+        return best_score
+
+    def _quiescence(self, alpha, beta, ply):
+        """Return evaluation of quiet position, or loss if player to move is blocked in."""
+        game = self.game
+        if not game.simple_move_count(game.playing_color):
+            return -WIN_SCORE + ply
+        return evaluate(game)
+
+    def _ordered_moves(self, moves, captures, table_move, ply):
+        """Return moves sorted best first: table move, longest captures, crowning moves, killers, the rest."""
+        killers = self.killers.get(ply, ())
+        board = self.game.board
+
+        def move_order(move):
+            from_coords, to_coords = move
+            if move == table_move:
+                return -1_000_000
+            if captures:
+                # Further jumps usually take more counters
+                return -abs(to_coords.y - from_coords.y) - abs(to_coords.x - from_coords.x)
+            piece = board[from_coords.x][from_coords.y]
+            if not piece.crowned and to_coords.y == KING_ROW[piece.color]:
+                return -10_000
+            if move in killers:
+                return -5_000
+            return 0
+        return sorted(moves, key=move_order)
+
+    def _add_killer(self, move, ply):
+        killers = self.killers.get(ply, ())
+        if move not in killers:
+            self.killers[ply] = (move,) + killers[:1]
+
+
+def _score_to_table(score, ply):
+    # Win scores are stored as distance from this position, not from the search root
+    if score > WIN_THRESHOLD:
+        return score + ply
+    if score < -WIN_THRESHOLD:
+        return score - ply
+    return score
+
+
+def _score_from_table(score, ply):
+    if score > WIN_THRESHOLD:
+        return score - ply
+    if score < -WIN_THRESHOLD:
+        return score + ply
+    return score
+
+
+def _print_search(seconds, max_plies=200):
+    game = Draughts()
+    for _ in range(max_plies):
+        result = best_move(game, SearchBudget(seconds=seconds))
+        if not result.move:
+            print(f'Result: {game.opponent_color.value} wins')
+            return
+        print(f'{game.playing_color.value:<6} {result.move[0]} -> {result.move[1]}  score {result.score:>6}  '
+              f'depth {result.depth:>2}  nodes {result.nodes:>7}  {result.nodes_per_second:>6} nps')
+        game.move(*result.move)
+    print(f'Result: no winner after {max_plies} plies')
+
+
+if __name__ == '__main__':
+    _print_search(float(sys.argv[1]) if len(sys.argv) > 1 else 0.5)
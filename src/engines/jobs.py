@@ -0,0 +1,241 @@
+"""Background computer move searches, so web requests never wait on a search.
+
+   A request submits a search job and gets a job id back at once. The search
+   runs on a bounded pool of threads in the web process, with no external
+   broker, and the result is fetched by polling (optionally waiting a short
+   while for it to finish). Jobs can be cancelled whether queued or running:
+   a running search is told to stop through its SearchBudget stop event.
+
+   Monte Carlo jobs submitted with a tree_key (e.g. one per game) search the
+   MonteCarloTree kept for that key, so its statistics carry over between
+   moves. A job has the tree to itself while it runs: another job for the
+   same key meanwhile searches a new tree, as trees aren't thread safe.
+
+   Pondering jobs use the opponent's thinking time. They take the same
+   workers as other jobs, so are only started when a worker is idle. They
+   predict the opponent's reply with a short search (warming each reply's
+   outcome and check status on the way), then search the position after it.
+   If the opponent plays the predicted reply, reuse hands back the ponder
+   job, so its result is ready at once or sooner than a fresh search.
+
+   Classes:
+        SearchJobs:   bounded pool of search jobs
+        JobStatus:    state and (once done) SearchResult of a job
+        JobQueueFull: raised when too many jobs are waiting
+"""
+from collections import namedtuple, OrderedDict
+from concurrent.futures import CancelledError, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from copy import deepcopy
+import os
+import threading
+import uuid
+
+from src.engines import best_move
+from src.engines.mcts import MonteCarloTree
+from src.engines.search import SearchBudget
+
+
+QUEUED, RUNNING, DONE, CANCELLED, FAILED = 'queued', 'running', 'done', 'cancelled', 'failed'
+
+SEARCH_JOB_WORKERS = int(os.environ.get('SEARCH_JOB_WORKERS', 2))
+# Jobs allowed to wait for a free worker, further submits raise JobQueueFull
+MAX_QUEUED_SEARCH_JOBS = int(os.environ.get('MAX_QUEUED_SEARCH_JOBS', 8))
+# Upper limit on seconds any job may search for
+MAX_SEARCH_SECONDS = float(os.environ.get('MAX_SEARCH_SECONDS', 5))
+# Finished jobs kept for polling, oldest forgotten first
+MAX_FINISHED_JOBS = 1000
+# Monte Carlo trees kept by tree_key, least recently searched forgotten first
+MAX_KEPT_TREES = 100
+# Seconds a ponder job spends predicting the opponent's reply
+PONDER_PREDICT_SECONDS = float(os.environ.get('PONDER_PREDICT_SECONDS', 0.2))
+
+# position_hash is of the position searched, so a result is only played on that position
+JobStatus = namedtuple('JobStatus', 'job_id state position_hash result error')
+
+
+class JobQueueFull(Exception):
+    """Raised when a job is submitted with MAX_QUEUED_SEARCH_JOBS already waiting."""
+
+
+class _Job():
+    """One submitted search: its future, stop event and position searched."""
+    __slots__ = ('job_id', 'future', 'stop', 'position_hash', 'started', 'ponder', 'predicted')
+
+    def __init__(self, job_id, position_hash, ponder):
+        self.job_id = job_id
+        self.future = None
+        self.stop = threading.Event()
+        self.position_hash = position_hash
+        self.started = False
+        self.ponder = ponder
+        # Ponder jobs search position_hash only once the reply is predicted
+        self.predicted = False
+
+
+class SearchJobs():
+    """Bounded pool of background search jobs, looked up by job id.
+
+       Methods:
+            submit
+            reuse
+            status
+            wait
+            cancel
+            shutdown
+    """
+
+    def __init__(self, max_workers=SEARCH_JOB_WORKERS, max_queued=MAX_QUEUED_SEARCH_JOBS,
+                 max_seconds=MAX_SEARCH_SECONDS):
+        self.max_workers = max_workers
+        self.max_queued = max_queued
+        self.max_seconds = max_seconds
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='search-job')
+        self._jobs = OrderedDict()
+        self._trees = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, game, seconds=None, method='search', ponder=False, tree_key=None):
+        """Queue search of game for player to move. Return str job id, or None for a skipped ponder job.
+
+           seconds is capped at max_seconds. The game is copied, so it can
+           carry on changing while the job waits. Raises JobQueueFull if
+           max_queued jobs are already waiting for a worker.
+
+           ponder: search the position after the predicted reply of the player
+                   to move instead. The job's position_hash changes to that
+                   position once the reply is predicted. Skipped unless a
+                   worker is idle, so pondering never delays other jobs.
+           tree_key: search the MonteCarloTree kept for tree_key if method is
+                     'mcts', default a new tree for this job only.
+        """
+        seconds = min(seconds or self.max_seconds, self.max_seconds)
+        job = _Job(uuid.uuid4().hex, game.position_hash, ponder)
+        game = deepcopy(game)
+        with self._lock:
+            if ponder and self._unfinished_count() >= self.max_workers:
+                return None
+            if self._queued_count() >= self.max_queued:
+                raise JobQueueFull(f'{self.max_queued} search jobs already waiting')
+            self._forget_finished_jobs()
+            self._jobs[job.job_id] = job
+            job.future = self._executor.submit(self._run, job, game, SearchBudget(seconds, stop=job.stop),
+                                               method, ponder, tree_key)
+        return job.job_id
+
+    def reuse(self, job_id, game):
+        """Return job_id if job searches game's current position, else cancel job and return None.
+
+           Used with ponder jobs once the opponent's real reply is known. A
+           ponder job still predicting the reply is always cancelled.
+        """
+        try:
+            status = self.status(job_id)
+        except KeyError:
+            return None
+        with self._lock:
+            job = self._jobs[job_id]
+        searching = not job.ponder or job.predicted
+        if searching and status.state in (QUEUED, RUNNING, DONE) and status.position_hash == game.position_hash:
+            return job_id
+        self.cancel(job_id)
+        return None
+
+    def status(self, job_id):
+        """Return JobStatus of job. Raises KeyError for unknown (or long finished) job ids."""
+        with self._lock:
+            job = self._jobs[job_id]
+        future = job.future
+        if future.cancelled() or (job.stop.is_set() and not future.done()):
+            return JobStatus(job_id, CANCELLED, job.position_hash, None, None)
+        if not future.done():
+            return JobStatus(job_id, RUNNING if job.started else QUEUED, job.position_hash, None, None)
+        error = future.exception()
+        if error is not None:
+            return JobStatus(job_id, FAILED, job.position_hash, None, str(error))
+        state = CANCELLED if job.stop.is_set() else DONE
+        return JobStatus(job_id, state, job.position_hash, future.result(), None)
+
+    def wait(self, job_id, timeout):
+        """Wait up to timeout seconds for job to finish. Return JobStatus."""
+        with self._lock:
+            job = self._jobs[job_id]
+        try:
+            job.future.exception(timeout=timeout)
+        except (CancelledError, FutureTimeoutError):
+            pass
+        return self.status(job_id)
+
+    def cancel(self, job_id):
+        """Cancel job, stopping its search if already running. Return JobStatus."""
+        with self._lock:
+            job = self._jobs[job_id]
+        if not job.future.cancel() and not job.future.done():
+            job.stop.set()
+        return self.status(job_id)
+
+    def shutdown(self):
+        """Stop every running search and wait for worker threads to finish."""
+        with self._lock:
+            jobs = list(self._jobs.values())
+        for job in jobs:
+            if not job.future.cancel():
+                job.stop.set()
+        self._executor.shutdown(wait=True)
+
+    def _run(self, job, game, budget, method, ponder, tree_key):
+        job.started = True
+        tree = self._take_tree(tree_key) if method == 'mcts' else None
+        try:
+            if ponder:
+                _warm_reply_outcomes(game)
+                prediction = best_move(game, budget._replace(seconds=PONDER_PREDICT_SECONDS), method=method,
+                                       tree=tree)
+                if prediction.move is None or job.stop.is_set():
+                    return prediction
+                game.apply_move(*prediction.move)
+                job.position_hash = game.position_hash
+                job.predicted = True
+            return best_move(game, budget, method=method, tree=tree)
+        finally:
+            if tree is not None:
+                self._keep_tree(tree_key, tree)
+
+    def _take_tree(self, tree_key):
+        """Return tree kept for tree_key, removed until _keep_tree so no other job searches it."""
+        with self._lock:
+            tree = self._trees.pop(tree_key, None) if tree_key is not None else None
+        return tree or MonteCarloTree()
+
+    def _keep_tree(self, tree_key, tree):
+        if tree_key is None:
+            return
+        with self._lock:
+            self._trees[tree_key] = tree
+            while len(self._trees) > MAX_KEPT_TREES:
+                self._trees.popitem(last=False)
+
+    def _unfinished_count(self):
+        return sum(1 for job in self._jobs.values() if not job.future.done())
+
+    def _queued_count(self):
+        # Jobs beyond max_workers not yet finished are waiting for a worker
+        return max(self._unfinished_count() - self.max_workers, 0)
+
+    def _forget_finished_jobs(self):
+        while len(self._jobs) >= MAX_FINISHED_JOBS:
+            oldest_id = next(iter(self._jobs))
+            if not self._jobs[oldest_id].future.done():
+                break
+            del self._jobs[oldest_id]
+
+
+def _warm_reply_outcomes(game):
+    """Work out outcome (for Chess, the cached check status) of every reply to game."""
+    for move in game.legal_moves():
+        undo_record = game.apply_move(*move)
+        game.outcome()
+        game.undo_move(undo_record)
+
+
+# Shared by every request handled by this process
+SEARCH_JOBS = SearchJobs()
@@ -0,0 +1,186 @@
+"""Monte Carlo Tree Search engine for any Game.
+
+   Uses only the Game search protocol (legal_moves, apply_move, undo_move and
+   outcome), so every game, and any future one implementing the protocol,
+   can be played without game specific search code. Each iteration walks the
+   tree by UCT, expands one new move, plays random moves to the end of the
+   game (or max_playout_plies, scored as a draw) and backs the result up the
+   path. Everything runs on one copy of the game with apply_move/undo_move.
+
+   A MonteCarloTree can be kept for one game between its searches: when the
+   next search starts from a position already in the tree (e.g. after the
+   opponent's reply) that subtree becomes the new root and its statistics
+   carry over. Searching changes the tree, so a tree belongs to one game and
+   is only searched by one thread at a time.
+
+   Functions:
+        best_move: return SearchResult for player to move
+
+   Classes:
+        MonteCarloTree: search tree kept between moves of one game
+"""
+from copy import deepcopy
+import math
+import os
+import random
+
+from src.game_enums import Color
+from src.engines.search import SearchBudget, SearchClock, SearchTimeout
+
+
+# UCT exploration constant, higher tries less visited moves more often
+EXPLORATION = float(os.environ.get('MCTS_EXPLORATION', 1.4))
+# Random playouts still going after this many moves are scored as draws
+MAX_PLAYOUT_PLIES = int(os.environ.get('MCTS_MAX_PLAYOUT_PLIES', 200))
+# Tree reuse looks this many moves below the previous root for the new position
+REUSE_PLIES = 2
+
+
+def best_move(game, budget=None, tree=None):
+    """Search game for player to move within budget. Return SearchResult.
+
+       SearchResult.nodes counts playouts and score runs from -1000 (certain
+       loss) to 1000 (certain win) for the player to move. budget.nodes
+       limits playouts; budget.depth is unused.
+
+       tree: MonteCarloTree kept for this game, reused when the game carries
+             on from a position it already holds. Default a new tree for
+             this search only.
+    """
+    return (tree or MonteCarloTree()).search(game, budget or SearchBudget())
+
+
+class _Node():
+    """One position in the search tree, reached by move made by player."""
+    __slots__ = ('move', 'player', 'position_hash', 'parent', 'children', 'untried', 'winning', 'visits', 'wins')
+
+    def __init__(self, move, player, position_hash, parent, untried, winning):
+        self.move = move
+        self.player = player
+        self.position_hash = position_hash
+        self.parent = parent
+        self.children = []
+        self.untried = untried
+        # Move ends the game with player winning, so is always chosen once found
+        self.winning = winning
+        self.visits = 0
+        # Wins for player who made move, draws count half
+        self.wins = 0.0
+
+    def depth(self):
+        """Return int depth of deepest descendant below node."""
+        return 1 + max((child.depth() for child in self.children), default=-1)
+
+
+class MonteCarloTree():
+    """Monte Carlo search tree for one game, kept between searches. Not thread safe.
+
+       Methods:
+            search
+    """
+
+    def __init__(self, exploration=EXPLORATION, max_playout_plies=MAX_PLAYOUT_PLIES, seed=None):
+        self.exploration = exploration
+        self.max_playout_plies = max_playout_plies
+        self.random = random.Random(seed)
+        self.root = None
+
+    def search(self, game, budget):
+        """Return SearchResult for player to move in game, spending budget on playouts."""
+        clock = SearchClock(budget)
+        game = deepcopy(game)
+        if game.outcome() is not None:
+            self.root = None
+            return clock.result(None, 0, 0)
+
+        self.root = self._reused_root(game) or self._new_node(game, None, None, None)
+        if len(self.root.untried) + len(self.root.children) == 1:
+            # Only one legal move, nothing to search
+            move = (self.root.untried or [child.move for child in self.root.children])[0]
+            return clock.result(move, 0, 0)
+
+        while True:
+            try:
+                clock.tick()
+            except SearchTimeout:
+                break
+            self._iterate(game)
+            # A playout can be long, so time is checked after every one rather than every CHECK_EVERY
+            if clock.out_of_time():
+                break
+
+        if not self.root.children:
+            return clock.result(self.root.untried[0], 0, 0)
+        best = max(self.root.children, key=lambda child: (child.winning, child.visits))
+        score = round(1000 * (2 * best.wins / best.visits - 1))
+        return clock.result(best.move, score, self.root.depth())
+
+    def _iterate(self, game):
+        """Select, expand, play out and back up one path from the root."""
+        node = self.root
+        undo_records = []
+        while not node.untried and node.children:
+            node = self._select_child(node)
+            undo_records.append(game.apply_move(*node.move))
+
+        if node.untried:
+            move = node.untried.pop(self.random.randrange(len(node.untried)))
+            player = game.playing_color
+            undo_records.append(game.apply_move(*move))
+            child = self._new_node(game, move, player, node)
+            node.children.append(child)
+            node = child
+
+        outcome = self._playout(game)
+        for undo_record in reversed(undo_records):
+            game.undo_move(undo_record)
+
+        while node is not None:
+            node.visits += 1
+            if outcome == node.player:
+                node.wins += 1
+            elif outcome is None or outcome == Color.NONE:
+                node.wins += 0.5
+            node = node.parent
+
+    def _select_child(self, node):
+        """Return child with highest upper confidence bound (UCT)."""
+        log_visits = math.log(node.visits)
+        exploration = self.exploration
+        return max(node.children, key=lambda child: (
+            child.winning, child.wins / child.visits + exploration * math.sqrt(log_visits / child.visits)))
+
+    def _playout(self, game):
+        """Play random moves to end of game, then take them back. Return outcome (None if cut short)."""
+        undo_records = []
+        choice = self.random.choice
+        try:
+            for _ in range(self.max_playout_plies):
+                moves = game.legal_moves()
+                if not moves:
+                    break
+                undo_records.append(game.apply_move(*choice(moves)))
+            return game.outcome()
+        finally:
+            for undo_record in reversed(undo_records):
+                game.undo_move(undo_record)
+
+    @staticmethod
+    def _new_node(game, move, player, parent):
+        outcome = game.outcome()
+        untried = game.legal_moves() if outcome is None else []
+        return _Node(move, player, game.position_hash, parent, untried, player is not None and outcome == player)
+
+    def _reused_root(self, game):
+        """Return node for game position from previous search tree, or None if not found."""
+        if self.root is None:
+            return None
+        nodes = [self.root]
+        for _ in range(REUSE_PLIES + 1):
+            for node in nodes:
+                if node.position_hash == game.position_hash:
+                    node.parent = None
+                    node.move = node.player = None
+                    return node
+            nodes = [child for node in nodes for child in node.children]
+        return None
@@ -0,0 +1,200 @@
+"""Memory mapped opening books of weighted moves by position hash.
+
+   A book file is a header followed by fixed size (position hash, from
+   square, to square, weight) records sorted by position hash. Lookups binary
+   search the file through mmap, so every web worker shares one copy of the
+   book in the page cache and a lookup reads only the few pages it touches.
+   Position hashes are the games' Zobrist hashes, which are the same in every
+   process, so books stay valid between runs.
+
+   Game records are text, one game per line as moves in square notation, e.g.
+   'e2e4 e7e5 g1f3'. A single square is a placement with no from square.
+   Anything after # is a comment.
+
+   Functions:
+        build_book: write book file from game records
+        book_move:  return weighted random book move for game, or None
+
+   Classes:
+        OpeningBook: read only memory mapped book file
+
+   Usage: python -m src.engines.opening_book GAME RECORDS BOOK [PLIES]
+"""
+from collections import Counter, namedtuple
+import mmap
+import os
+import random
+import struct
+import sys
+
+from src.games.chess import Chess
+from src.games.draughts import Draughts
+from src.games.game import ALPHABET
+
+
+MAGIC = b'GRBOOK01'
+HEADER = struct.Struct('<8sI4x')
+# Position hash, from square (NO_SQUARE for placements), to square, weight
+RECORD = struct.Struct('<QBBH')
+NO_SQUARE = 255
+MAX_WEIGHT = 0xFFFF
+# Moves past this many plies into a game record aren't added to the book
+BOOK_PLIES = 20
+
+# Game class: environment variable naming its book file
+BOOK_PATH_VARIABLES = {
+    Chess: 'CHESS_OPENING_BOOK',
+    Draughts: 'DRAUGHTS_OPENING_BOOK'
+}
+
+BookStats = namedtuple('BookStats', 'games positions moves skipped_lines')
+
+_books = {}
+_random = random.Random()
+
+
+def book_move(game, random_generator=None):
+    """Return weighted random (from_coords, to_coords) book move for game, or None if out of book.
+
+       The book for the game comes from its BOOK_PATH_VARIABLES environment
+       variable and is opened on first use. Games without a book always
+       return None. Book moves are checked to be legal before being returned.
+    """
+    book = _book_for(type(game))
+    if book is None:
+        return None
+    return book.choose(game, random_generator or _random)
+
+
+def _book_for(game_class):
+    try:
+        return _books[game_class]
+    except KeyError:
+        path = os.environ.get(BOOK_PATH_VARIABLES.get(game_class, ''))
+        book = _books[game_class] = OpeningBook(path) if path and os.path.exists(path) else None
+        return book
+
+
+class OpeningBook():
+    """Read only opening book file, memory mapped and binary searched by position hash.
+
+       Methods:
+            moves
+            choose
+            close
+    """
+
+    def __init__(self, path):
+        with open(path, 'rb') as book_file:
+            self._mmap = mmap.mmap(book_file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self._count = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            self._mmap.close()
+            raise ValueError(f'{path} is not an opening book')
+
+    def __len__(self):
+        return self._count
+
+    def moves(self, position_hash):
+        """Return list of ((from square or None, to square), weight) for position_hash."""
+        book = self._mmap
+        record_size = RECORD.size
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            if RECORD.unpack_from(book, HEADER.size + middle * record_size)[0] < position_hash:
+                low = middle + 1
+            else:
+                high = middle
+
+        moves = []
+        for index in range(low, self._count):
+            record_hash, from_square, to_square, weight = RECORD.unpack_from(book, HEADER.size + index * record_size)
+            if record_hash != position_hash:
+                break
+            moves.append(((None if from_square == NO_SQUARE else from_square, to_square), weight))
+        return moves
+
+    def choose(self, game, random_generator):
+        """Return weighted random legal book move for game position, or None if out of book."""
+        moves = self.moves(game.position_hash)
+        if not moves:
+            return None
+        squares, weights = zip(*moves)
+        from_square, to_square = random_generator.choices(squares, weights)[0]
+        geometry = game.geometry
+        move = (None if from_square is None else geometry.squares[from_square], geometry.squares[to_square])
+        # Guards against the (very unlikely) hash collision with an unrelated position
+        return move if _legal(game, move) else None
+
+    def close(self):
+        self._mmap.close()
+
+
+def build_book(game_class, records, book_path, max_plies=BOOK_PLIES):
+    """Write opening book for game_class from iterable of game record lines. Return BookStats.
+
+       Weights are how often each move was played from each position. Records
+       with an illegal or unreadable move are skipped from that move on and
+       their line numbers reported. The book is written to a temporary file
+       and moved into place, so open books are never seen half written.
+    """
+    move_counts = Counter()
+    games, skipped_lines = 0, []
+    for line_number, line in enumerate(records, 1):
+        tokens = line.split('#')[0].split()
+        if not tokens:
+            continue
+        games += 1
+        game = game_class()
+        for token in tokens[:max_plies]:
+            try:
+                move = _parse_move(game, token)
+            except (ValueError, IndexError):
+                move = None
+            if move is None or not _legal(game, move):
+                skipped_lines.append(line_number)
+                break
+            from_coords, to_coords = move
+            from_square = NO_SQUARE if from_coords is None else game.geometry.square_index(from_coords)
+            move_counts[game.position_hash, from_square, game.geometry.square_index(to_coords)] += 1
+            game.move(*move)
+
+    temporary_path = f'{book_path}.tmp'
+    with open(temporary_path, 'wb') as book_file:
+        book_file.write(HEADER.pack(MAGIC, len(move_counts)))
+        for (position_hash, from_square, to_square), count in sorted(move_counts.items()):
+            book_file.write(RECORD.pack(position_hash, from_square, to_square, min(count, MAX_WEIGHT)))
+    os.replace(temporary_path, book_path)
+
+    positions = len({position_hash for position_hash, _, _ in move_counts})
+    return BookStats(games, positions, len(move_counts), skipped_lines)
+
+
+def _legal(game, move):
+    """Return True if move is legal in game, generating only the moves from its from square."""
+    from_coords, to_coords = move
+    # Placements (from_coords None) are looked up by the square placed on
+    return move in game.legal_moves_from(to_coords if from_coords is None else from_coords)
+
+
+def _parse_move(game, token):
+    """Return (from_coords, to_coords) for token such as 'e2e4', or 'd3' for a placement."""
+    squares = [game.geometry.coords(ALPHABET.index(token[index]), int(token[index + 1]) - 1)
+               for index in range(0, len(token) - 1, 2)]
+    if len(squares) == 1:
+        return None, squares[0]
+    return squares[0], squares[1]
+
+
+def _build(game_name, records_path, book_path, max_plies):
+    game_class = {'chess': Chess, 'draughts': Draughts}[game_name.lower()]
+    with open(records_path) as records:
+        stats = build_book(game_class, records, book_path, max_plies)
+    print(f'{stats.games} games, {stats.positions} positions, {stats.moves} moves written to {book_path}')
+    if stats.skipped_lines:
+        print(f'Illegal moves, records cut short on lines: {", ".join(map(str, stats.skipped_lines))}')
+
+
+if __name__ == '__main__':
+    _build(sys.argv[1], sys.argv[2], sys.argv[3], int(sys.argv[4]) if len(sys.argv) > 4 else BOOK_PLIES)
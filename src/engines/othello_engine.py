@@ -0,0 +1,247 @@
+"""Negascout search engine for Othello with an exact endgame solver.
+
+   Search runs on (own discs, opponent discs) bitboard masks rather than the
+   Othello game object, so making a move is two mask updates. Midgame
+   positions are scored on mobility, corners, squares next to empty corners
+   and parity. Once no more than endgame_empties squares are empty the
+   position is solved exactly for final disc difference.
+
+   Functions:
+        best_move: return SearchResult for Othello player to move
+        evaluate:  return int heuristic score of position for player to move
+
+   Usage: python -m src.engines.othello_engine [SECONDS]
+"""
+import os
+import sys
+
+from src.game_enums import Color
+from src.games.bitboard import othello_flips, othello_moves, pop_count, square_coords, square_index, squares
+from src.games.othello import Othello
+from src.games.transposition import TranspositionTable
+from src.engines.search import iterative_deepening, SearchBudget, SearchClock
+
+
+# Solve exactly when this many or fewer squares are empty
+ENDGAME_EMPTIES = int(os.environ.get('OTHELLO_ENDGAME_EMPTIES', 10))
+# Exact disc differences are scaled so any solved result outweighs heuristic scores
+DISC_SCORE = 1000
+MAX_SCORE = 64 * DISC_SCORE + 1
+
+EXACT, LOWER_BOUND, UPPER_BOUND = 0, 1, 2
+
+SEARCH_TABLE = TranspositionTable(max_entries=int(os.environ.get('OTHELLO_SEARCH_TABLE_ENTRIES', 500_000)))
+
+CORNERS = (0, 7, 56, 63)
+CORNER_MASK = sum(1 << square for square in CORNERS)
+# Corner: (X square diagonally inside it, C squares beside it)
+CORNER_NEIGHBOURS = {
+    0: (9, (1, 8)),
+    7: (14, (6, 15)),
+    56: (49, (48, 57)),
+    63: (54, (55, 62))
+}
+CORNER_WEIGHT = 30
+X_SQUARE_WEIGHT = 15
+C_SQUARE_WEIGHT = 5
+MOBILITY_WEIGHT = 8
+PARITY_WEIGHT = 5
+
+# Static move ordering: corners first, squares next to corners last
+SQUARE_ORDER = tuple(
+    0 if square in CORNERS
+    else 3 if square in {x_square for x_square, _ in CORNER_NEIGHBOURS.values()}
+    else 2 if square in {c_square for _, c_squares in CORNER_NEIGHBOURS.values() for c_square in c_squares}
+    else 1
+    for square in range(64)
+)
+
+
+def evaluate(own, opponent):
+    """Return int heuristic score of position for player owning own discs mask."""
+    empty = ~(own | opponent) & ((1 << 64) - 1)
+    score = MOBILITY_WEIGHT * (pop_count(othello_moves(own, opponent)) - pop_count(othello_moves(opponent, own)))
+    score += CORNER_WEIGHT * (pop_count(own & CORNER_MASK) - pop_count(opponent & CORNER_MASK))
+
+    for corner, (x_square, c_squares) in CORNER_NEIGHBOURS.items():
+        if empty & (1 << corner):
+            # Discs next to an empty corner give the opponent a way in
+            score -= X_SQUARE_WEIGHT * (((own >> x_square) & 1) - ((opponent >> x_square) & 1))
+            for c_square in c_squares:
+                score -= C_SQUARE_WEIGHT * (((own >> c_square) & 1) - ((opponent >> c_square) & 1))
+
+    # With an odd number of empty squares the player to move expects the last move
+    if pop_count(empty) % 2:
+        score += PARITY_WEIGHT
+    return score
+
+
+def best_move(game, budget=None, table=SEARCH_TABLE, endgame_empties=None, root_moves=None, history=None):
+    """Search Othello game for player to move within budget. Return SearchResult.
+
+       SearchResult.move is a (None, to_coords) tuple for game.move, or None if
+       the game is over. Solved scores are final disc difference * DISC_SCORE.
+
+       root_moves: optional moves to search at the root instead of every legal move.
+       history:    optional list, (depth, move, score) appended for each completed depth.
+    """
+    own, opponent = game.discs[game.playing_color], game.discs[game.opponent_color]
+    endgame_empties = ENDGAME_EMPTIES if endgame_empties is None else endgame_empties
+    root_mask = None
+    if root_moves is not None:
+        root_mask = sum(1 << square_index(to_coords) for _, to_coords in root_moves)
+    search = OthelloSearch(own, opponent, budget or SearchBudget(), table, endgame_empties, root_mask)
+    return search.run(game.winner, history)
+
+
+class OthelloSearch():
+    """State of one Othello search over bitboard masks.
+
+       Methods:
+            run
+    """
+
+    def __init__(self, own, opponent, budget, table, endgame_empties, root_mask=None):
+        self.own = own
+        self.root_mask = root_mask
+        self.opponent = opponent
+        self.clock = SearchClock(budget)
+        self.table = table
+        self.endgame_empties = endgame_empties
+        self.root_move = None
+
+    def run(self, winner=None, history=None):
+        """Return SearchResult for root position, None move if game over."""
+        moves = self._root_moves_mask()
+        if winner or not moves:
+            return self.clock.result(None, 0, 0)
+
+        fallback = min(squares(moves), key=SQUARE_ORDER.__getitem__)
+        empties = 64 - pop_count(self.own | self.opponent)
+        if empties <= self.endgame_empties:
+            # Every child is solved exactly, so one iteration is the whole search
+            self.clock.budget = self.clock.budget._replace(depth=1)
+        depth_results = []
+        result = iterative_deepening(self._search_root, self.clock, fallback, history=depth_results)
+        if history is not None:
+            history.extend((depth, (None, square_coords(square)), score) for depth, square, score in depth_results)
+        move = (None, square_coords(result.move))
+        return result._replace(move=move)
+
+    def _root_moves_mask(self):
+        moves = othello_moves(self.own, self.opponent)
+        return moves if self.root_mask is None else moves & self.root_mask
+
+    def _search_root(self, depth):
+        score = self._negascout(self.own, self.opponent, depth, -MAX_SCORE, MAX_SCORE, True)
+        return self.root_move, score
+
+    def _negascout(self, own, opponent, depth, alpha, beta, root=False):
+        self.clock.tick()
+        empties = 64 - pop_count(own | opponent)
+        if empties <= self.endgame_empties and not root:
+            return self._solve(own, opponent, alpha, beta, False)
+
+        moves = self._root_moves_mask() if root else othello_moves(own, opponent)
+        if not moves:
+            if not othello_moves(opponent, own):
+                return self._final_score(own, opponent)
+            return -self._negascout(opponent, own, depth, -beta, -alpha)
+        if depth <= 0:
+            return evaluate(own, opponent)
+
+        key = (own, opponent)
+        entry = self.table.get(key)
+        table_move = None
+        if entry:
+            entry_depth, entry_score, bound, table_move = entry
+            if not root and entry_depth >= depth:
+                if (bound == EXACT or (bound == LOWER_BOUND and entry_score >= beta)
+                        or (bound == UPPER_BOUND and entry_score <= alpha)):
+                    return entry_score
+
+        original_alpha = alpha
+        best_score, best = -MAX_SCORE, None
+        for index, square in enumerate(self._ordered_moves(moves, table_move)):
+            flips = othello_flips(square, own, opponent)
+            child_own, child_opponent = opponent & ~flips, own | flips | (1 << square)
+            if index == 0:
+                score = -self._negascout(child_own, child_opponent, depth - 1, -beta, -alpha)
+            else:
+                # Null window test that the move can't beat the best so far, re-search if it can
+                score = -self._negascout(child_own, child_opponent, depth - 1, -alpha - 1, -alpha)
+                if alpha < score < beta:
+                    score = -self._negascout(child_own, child_opponent, depth - 1, -beta, -score)
+            if score > best_score:
+                best_score, best = score, square
+            alpha = max(alpha, score)
+            if alpha >= beta:
+                break
+
+        if best_score <= original_alpha:
+            bound = UPPER_BOUND
+        elif best_score >= beta:
+            bound = LOWER_BOUND
+        else:
+            bound = EXACT
+        if not root or self.root_mask is None:
+            # A root searched over only some moves has no true score to share
+            self.table.put(key, (depth, best_score, bound, best))
+        if root:
+            self.root_move = best
+        return best_score
+
+    def _solve(self, own, opponent, alpha, beta, passed):
+        """Return exact final disc difference * DISC_SCORE with alpha-beta over every move."""
+        self.clock.tick()
+        moves = othello_moves(own, opponent)
+        if not moves:
+            if passed:
+                return self._final_score(own, opponent)
+            return -self._solve(opponent, own, -beta, -alpha, True)
+
+        for square in self._solver_ordered_moves(moves, own, opponent):
+            flips = othello_flips(square, own, opponent)
+            score = -self._solve(opponent & ~flips, own | flips | (1 << square), -beta, -alpha, False)
+            if score >= beta:
+                return score
+            alpha = max(alpha, score)
+        return alpha
+
+    def _ordered_moves(self, moves, table_move):
+        ordered = sorted(squares(moves), key=SQUARE_ORDER.__getitem__)
+        if table_move is not None and moves & (1 << table_move):
+            ordered.remove(table_move)
+            ordered.insert(0, table_move)
+        return ordered
+
+    @staticmethod
+    def _solver_ordered_moves(moves, own, opponent):
+        """Return moves leaving opponent fewest replies first, which cuts off soonest."""
+        move_squares = list(squares(moves))
+        if len(move_squares) < 3:
+            return move_squares
+
+        def opponent_mobility(square):
+            flips = othello_flips(square, own, opponent)
+            return pop_count(othello_moves(opponent & ~flips, own | flips | (1 << square)))
+        return sorted(move_squares, key=opponent_mobility)
+
+    @staticmethod
+    def _final_score(own, opponent):
+        return (pop_count(own) - pop_count(opponent)) * DISC_SCORE
+
+
+def _print_search(seconds):
+    game = Othello()
+    while not game.winner:
+        result = best_move(game, SearchBudget(seconds=seconds))
+        print(f'{game.playing_color.value:<6} {result.move[1]}  score {result.score:>6}  depth {result.depth:>2}  '
+              f'nodes {result.nodes:>7}  {result.nodes_per_second:>6} nps')
+        game.move(*result.move)
+    print(f'Result: {game.winner.value or "Draw"}  '
+          f'White {game.disc_count(Color.WHITE)} Black {game.disc_count(Color.BLACK)}')
+
+
+if __name__ == '__main__':
+    _print_search(float(sys.argv[1]) if len(sys.argv) > 1 else 0.5)
@@ -0,0 +1,149 @@
+"""Root split parallel search across a process pool.
+
+   The root moves of a position are dealt out between worker processes, so
+   search isn't held to one core by the GIL. Each worker rebuilds the position
+   from its FEN string (rather than a pickled game) and runs the game's own
+   engine over just its share of root moves, to a deadline shared by all
+   workers. Engines report every depth they complete, so results are compared
+   at the deepest depth all workers reached and node counts are summed. A
+   worker that starts too late to finish depth 1 in time (e.g. waiting for a
+   free process) still searches its moves to depth 1, so every root move is
+   compared.
+
+   Functions:
+        parallel_best_move: return SearchResult for player to move using every worker
+
+   Usage: python -m src.engines.parallel [WORKERS] [EXTRA_DEPTH]
+"""
+from concurrent.futures import ProcessPoolExecutor
+import os
+import sys
+import time
+
+from src.engines import ENGINES
+from src.engines.search import SearchBudget, SearchResult
+from src.games.chess import Chess
+from src.games.draughts import Draughts
+from src.games.othello import Othello
+
+
+WORKERS = int(os.environ.get('PARALLEL_SEARCH_WORKERS', os.cpu_count() or 1))
+
+GAMES = {game_class.__name__: game_class for game_class in ENGINES}
+
+# (game class, FEN, depth searched to), depths taking a few seconds for one process
+BENCHMARK_POSITIONS = (
+    (Chess, 'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1', 5),
+    (Chess, 'r1bqk2r/pppp1ppp/2n2n2/2b1p3/2B1P3/3P1N2/PPP2PPP/RNBQK2R w KQkq - 0 1', 4),
+    (Draughts, Draughts().to_fen(), 9),
+    (Othello, Othello().to_fen(), 10),
+)
+
+_executor = None
+
+
+def parallel_best_move(game, budget=None, workers=None, executor=None):
+    """Search game for player to move, root moves split between worker processes. Return SearchResult.
+
+       budget.seconds sets one deadline for every worker and budget.nodes is
+       shared out between them. depth and score are those of the deepest depth
+       every worker completed. Every worker is waited for, which takes past
+       the deadline only while late workers search to depth 1. executor
+       defaults to a process pool shared by every call, started on first use.
+    """
+    budget = budget or SearchBudget()
+    start = time.perf_counter()
+    deadline = time.time() + budget.seconds if budget.seconds is not None else None
+    moves = game.legal_moves()
+    if game.winner or not moves:
+        return SearchResult(None, 0, 0, 0, 0.0, 0)
+
+    workers = min(workers or WORKERS, len(moves))
+    executor = executor or _shared_executor()
+    fen = game.to_fen()
+    nodes = budget.nodes // workers if budget.nodes is not None else None
+    futures = [
+        executor.submit(_search_moves, type(game).__name__, fen,
+                        [_encode_move(move) for move in moves[index::workers]], deadline, nodes, budget.depth)
+        for index in range(workers)
+    ]
+    histories, total_nodes = [], 0
+    # Every share of root moves has to be compared, so no worker is left behind
+    for future in futures:
+        history, worker_nodes = future.result()
+        total_nodes += worker_nodes
+        histories.append(history)
+
+    seconds = time.perf_counter() - start
+    nodes_per_second = int(total_nodes / seconds) if seconds else 0
+    # Scores are only comparable between workers at the same depth
+    depth = min(history[-1][0] for history in histories)
+    move, score = max((history[depth - 1][1:] for history in histories), key=lambda result: result[1])
+    return SearchResult(_decode_move(game, move), score, depth, total_nodes, seconds, nodes_per_second)
+
+
+def _shared_executor():
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=WORKERS)
+    return _executor
+
+
+def _search_moves(game_name, fen, encoded_moves, deadline, nodes, depth):
+    """Search position from fen over encoded root moves only. Return (history, nodes searched).
+
+       Runs in a worker process. history holds (depth, encoded move, score) per completed depth,
+       at least depth 1 however little time is left.
+    """
+    game = GAMES[game_name].from_fen(fen)
+    seconds = max(deadline - time.time(), 0) if deadline is not None else None
+    history = []
+    root_moves = [_decode_move(game, move) for move in encoded_moves]
+    engine = ENGINES[type(game)]
+    result = engine(game, SearchBudget(seconds, nodes, depth), root_moves=root_moves, history=history)
+    searched_nodes = result.nodes
+    if not history:
+        # Out of time or nodes before depth 1 finished, moves would be left out of the comparison
+        searched_nodes += engine(game, SearchBudget(None, None, 1), root_moves=root_moves, history=history).nodes
+    return [(depth, _encode_move(move), score) for depth, move, score in history], searched_nodes
+
+
+def _encode_move(move):
+    """Return move as short string, e.g. '1224' for Coords(1, 2) to Coords(2, 4), '--' for no from_coords."""
+    return ''.join('--' if coords is None else f'{coords.x}{coords.y}' for coords in move)
+
+
+def _decode_move(game, encoded_move):
+    coords = game.geometry.coords
+    from_coords = None if encoded_move[:2] == '--' else coords(int(encoded_move[0]), int(encoded_move[1]))
+    return from_coords, coords(int(encoded_move[2]), int(encoded_move[3]))
+
+
+def _benchmark(workers, extra_depth=0):
+    """Print seconds for one and for workers processes to search each benchmark position to the same depth.
+
+       Each worker searches its share of root moves without the alpha bound
+       of the best move found by the others, so extra nodes are partly wasted
+       search and nodes per second overstates scaling. Time to reach the same
+       depth is the real speedup.
+    """
+    for game_class, fen, depth in BENCHMARK_POSITIONS:
+        game = game_class.from_fen(fen)
+        budget = SearchBudget(seconds=None, depth=depth + extra_depth)
+        single, split = (_timed_search(game, budget, worker_count) for worker_count in (1, workers))
+        print(f'{game_class.__name__:<8} depth {budget.depth:>2}  1 worker {single.seconds:>7.2f}s  '
+              f'{workers} workers {split.seconds:>7.2f}s  speedup {single.seconds / split.seconds:.2f}x  '
+              f'nodes {split.nodes / max(single.nodes, 1):.2f}x')
+
+
+def _timed_search(game, budget, workers):
+    # New pool every time, so no worker starts with a search table filled by an earlier search
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # Processes are started before the clock does
+        list(executor.map(abs, range(workers)))
+        return parallel_best_move(game, budget, workers=workers, executor=executor)
+
+
+if __name__ == '__main__':
+    _benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else WORKERS,
+               int(sys.argv[2]) if len(sys.argv) > 2 else 0)
@@ -0,0 +1,95 @@
+"""Search budget, results and iterative deepening shared by all game engines.
+
+   Functions:
+        iterative_deepening: return SearchResult of deepest fully searched depth
+
+   Classes:
+        SearchBudget:  wall clock, node and depth limits and stop event for one search
+        SearchResult:  best move found and search statistics
+        SearchClock:   counts nodes and stops search when budget spent
+        SearchTimeout: raised inside search when budget spent
+"""
+from collections import namedtuple
+import time
+
+
+SearchBudget = namedtuple('SearchBudget', 'seconds nodes depth stop')
+# Any limit can be None, but at least one should be set for a search to finish.
+# stop is an optional threading.Event, the search ends early once it is set.
+SearchBudget.__new__.__defaults__ = (1.0, None, None, None)
+
+SearchResult = namedtuple('SearchResult', 'move score depth nodes seconds nodes_per_second')
+
+# Deepest iteration searched when budget has no depth limit
+MAX_SEARCH_DEPTH = 64
+
+
+class SearchTimeout(Exception):
+    """Raised inside search when SearchClock budget is spent."""
+
+
+class SearchClock():
+    """Count nodes searched and raise SearchTimeout once budget is spent.
+
+       Wall clock is only read every CHECK_EVERY nodes to keep counting cheap.
+
+       Methods:
+            tick
+            out_of_time
+            elapsed
+            result
+    """
+    CHECK_EVERY = 16
+
+    def __init__(self, budget):
+        self.budget = budget
+        self.nodes = 0
+        self.start = time.perf_counter()
+        self.deadline = self.start + budget.seconds if budget.seconds is not None else None
+
+    def tick(self):
+        """Count one node. Raise SearchTimeout if node or time budget spent."""
+        self.nodes += 1
+        if self.budget.nodes is not None and self.nodes >= self.budget.nodes:
+            raise SearchTimeout()
+        if self.nodes % self.CHECK_EVERY == 0 and self.out_of_time():
+            raise SearchTimeout()
+
+    def out_of_time(self):
+        """Return True if wall clock budget spent or search told to stop."""
+        if self.budget.stop is not None and self.budget.stop.is_set():
+            return True
+        return self.deadline is not None and time.perf_counter() >= self.deadline
+
+    def elapsed(self):
+        """Return float seconds since search started."""
+        return time.perf_counter() - self.start
+
+    def result(self, move, score, depth):
+        """Return SearchResult for move with statistics so far."""
+        seconds = self.elapsed()
+        return SearchResult(move, score, depth, self.nodes, seconds, int(self.nodes / seconds) if seconds else 0)
+
+
+def iterative_deepening(search_root, clock, fallback_move, decisive_score=None, history=None):
+    """Search depth 1, 2, ... until budget spent. Return SearchResult of deepest completed depth.
+
+       search_root:    callable taking depth and returning (move, score). It raises
+                       SearchTimeout (via clock.tick) if budget runs out part way.
+       fallback_move:  move returned if not even depth 1 completes.
+       decisive_score: optional score (e.g. a forced mate) at which deeper search stops.
+       history:        optional list, (depth, move, score) appended for each completed depth.
+    """
+    max_depth = clock.budget.depth or MAX_SEARCH_DEPTH
+    result = clock.result(fallback_move, 0, 0)
+    for depth in range(1, max_depth + 1):
+        try:
+            move, score = search_root(depth)
+        except SearchTimeout:
+            break
+        result = clock.result(move, score, depth)
+        if history is not None:
+            history.append((depth, move, score))
+        if clock.out_of_time() or (decisive_score is not None and abs(score) >= decisive_score):
+            break
+    return clock.result(result.move, result.score, result.depth)
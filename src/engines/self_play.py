@@ -0,0 +1,185 @@
+"""Headless self-play of complete games across a process pool.
+
+   Plays Chess, Draughts or Othello games with both sides choosing random
+   legal moves, or both searching with src.engines.best_move ('search' or
+   'mcts') after a few random opening moves for variety. Games are dealt out
+   to worker processes in batches and stream to a records file as batches
+   finish, one game per line in the square notation src.engines.opening_book
+   builds books from, followed by the result:
+
+       e2e4 e7e5 g1f3 b8c6 ... # white
+
+   Every move is played through game.move, so the rules check each move
+   legal_moves offers. A move they reject, or any other failure, ends that
+   game with an error result (and the error in its record) rather than
+   stopping the run, which makes self-play a stress test of the rules.
+
+   Functions:
+        play_game:     return GameRecord of one complete game
+        run_self_play: play games on a process pool, appending records to a file
+
+   Usage: python -m src.engines.self_play GAME GAMES RECORDS [PLAYER] [WORKERS]
+"""
+from collections import Counter, namedtuple
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+import gzip
+import os
+import random
+import sys
+import time
+
+from src.engines import best_move
+from src.engines.mcts import MonteCarloTree
+from src.engines.search import SearchBudget
+from src.game_enums import Color
+from src.games.chess import Chess
+from src.games.draughts import Draughts
+from src.games.game import ALPHABET
+from src.games.othello import Othello
+from src.games.transposition import TranspositionTable
+
+
+PLAYERS = ('random', 'search', 'mcts')
+WHITE, BLACK, DRAW, UNFINISHED, ERROR = 'white', 'black', 'draw', 'unfinished', 'error'
+RESULTS = {Color.WHITE: WHITE, Color.BLACK: BLACK, Color.NONE: DRAW}
+
+SELF_PLAY_WORKERS = int(os.environ.get('SELF_PLAY_WORKERS', os.cpu_count() or 1))
+# Engine players search this many nodes (Monte Carlo playouts) per move
+SELF_PLAY_NODES = int(os.environ.get('SELF_PLAY_NODES', 500))
+# Size of the transposition table each game's 'search' player starts with
+SELF_PLAY_TABLE_ENTRIES = int(os.environ.get('SELF_PLAY_TABLE_ENTRIES', 100_000))
+# Games still going after this many moves are recorded as unfinished
+MAX_PLIES = int(os.environ.get('SELF_PLAY_MAX_PLIES', 400))
+# Engine players make this many random moves first, so their games differ
+RANDOM_OPENING_PLIES = 4
+# Games per task sent to a worker process
+BATCH_GAMES = 16
+
+GAMES = {'chess': Chess, 'draughts': Draughts, 'othello': Othello}
+
+GameRecord = namedtuple('GameRecord', 'moves result error')
+SelfPlayStats = namedtuple('SelfPlayStats', 'games moves seconds games_per_second moves_per_second results')
+
+
+def play_game(game_class, player='random', budget=None, max_plies=MAX_PLIES,
+              random_plies=RANDOM_OPENING_PLIES, seed=None):
+    """Play one game of game_class to the end, both sides played by player. Return GameRecord.
+
+       GameRecord.moves holds moves in square notation, e.g. 'e2e4', or 'd3'
+       for an Othello disc placement. result is 'white', 'black', 'draw',
+       'unfinished' (max_plies reached) or 'error', with error describing it.
+
+       budget: SearchBudget for engine players, default SELF_PLAY_NODES nodes.
+       seed:   seed for random moves, so games can be played again exactly.
+               Engine players search a transposition table or Monte Carlo
+               tree of the game's own, and choose book moves with the seeded
+               random moves, so they replay too while budget limits nodes
+               rather than seconds.
+    """
+    if player not in PLAYERS:
+        raise ValueError(f'Unknown player {player}, choose from {", ".join(PLAYERS)}')
+    budget = budget or SearchBudget(seconds=None, nodes=SELF_PLAY_NODES)
+    random_generator = random.Random(seed)
+    table = TranspositionTable(max_entries=SELF_PLAY_TABLE_ENTRIES) if player == 'search' else None
+    tree = MonteCarloTree(seed=random_generator.random()) if player == 'mcts' else None
+    game = game_class()
+    moves = []
+    try:
+        while len(moves) < max_plies:
+            outcome = game.outcome()
+            if outcome is not None:
+                return GameRecord(moves, RESULTS[outcome], None)
+            if player == 'random' or len(moves) < random_plies:
+                move = random_generator.choice(game.legal_moves())
+            else:
+                move = best_move(game, budget, method=player, tree=tree, table=table,
+                                 random_generator=random_generator).move
+            game.move(*move)
+            moves.append(_notation(move))
+        return GameRecord(moves, UNFINISHED, None)
+    except Exception as error:
+        # Recorded against the game, so one rules failure doesn't stop a long run
+        return GameRecord(moves, ERROR, f'{error.__class__.__name__}: {error}')
+
+
+def run_self_play(game_class, games, path, player='random', budget=None, workers=None, max_plies=MAX_PLIES,
+                  random_plies=RANDOM_OPENING_PLIES, seed=None, executor=None):
+    """Play games of game_class on a process pool, appending a record per game to path. Return SelfPlayStats.
+
+       Records are written in the order games finish and flushed after every
+       batch. Paths ending .gz are gzip compressed. seed numbers the games'
+       seeds from seed upwards, so a run can be played again exactly.
+       executor defaults to a pool of workers processes (SELF_PLAY_WORKERS).
+    """
+    start = time.perf_counter()
+    own_executor = executor is None
+    workers = workers or SELF_PLAY_WORKERS
+    executor = executor or ProcessPoolExecutor(max_workers=workers)
+    results, move_count = Counter(), 0
+    batches = ((first_game, min(BATCH_GAMES, games - first_game)) for first_game in range(0, games, BATCH_GAMES))
+    try:
+        with _open_records(path) as records:
+            pending = set()
+            for first_game, count in batches:
+                pending.add(executor.submit(_play_batch, game_class.__name__.lower(), first_game, count, player,
+                                            budget, max_plies, random_plies, seed))
+                # Only a few batches per worker wait at once, so memory stays flat however many games
+                if len(pending) >= 2 * workers:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    move_count += _write_batches(done, records, results)
+            move_count += _write_batches(wait(pending).done, records, results)
+    finally:
+        if own_executor:
+            executor.shutdown()
+
+    seconds = time.perf_counter() - start
+    return SelfPlayStats(games, move_count, seconds, games / seconds, move_count / seconds, dict(results))
+
+
+def _play_batch(game_name, first_game, count, player, budget, max_plies, random_plies, seed):
+    """Play count games in a worker process. Return list of (record line, result, move count)."""
+    batch = []
+    for game_number in range(first_game, first_game + count):
+        record = play_game(GAMES[game_name], player, budget, max_plies, random_plies,
+                           None if seed is None else seed + game_number)
+        batch.append((_record_line(record), record.result, len(record.moves)))
+    return batch
+
+
+def _write_batches(futures, records, results):
+    """Write records of finished batches and count their results. Return number of moves written."""
+    move_count = 0
+    for future in futures:
+        for line, result, game_moves in future.result():
+            records.write(line + '\n')
+            results[result] += 1
+            move_count += game_moves
+    records.flush()
+    return move_count
+
+
+def _record_line(record):
+    comment = record.result if record.error is None else f'{record.result} {" ".join(record.error.split())}'
+    return f'{" ".join(record.moves)} # {comment}'.lstrip()
+
+
+def _notation(move):
+    return ''.join(f'{ALPHABET[coords.x]}{coords.y + 1}' for coords in move if coords is not None)
+
+
+def _open_records(path):
+    if path.endswith('.gz'):
+        return gzip.open(path, 'at')
+    return open(path, 'a')
+
+
+def _self_play(game_name, games, path, player, workers):
+    stats = run_self_play(GAMES[game_name.lower()], games, path, player, workers=workers)
+    results = ', '.join(f'{result} {count}' for result, count in sorted(stats.results.items()))
+    print(f'{stats.games} games, {stats.moves} moves in {stats.seconds:.1f}s: '
+          f'{stats.games_per_second:.1f} games/s, {stats.moves_per_second:.0f} moves/s ({results})')
+
+
+if __name__ == '__main__':
+    _self_play(sys.argv[1], int(sys.argv[2]), sys.argv[3], sys.argv[4] if len(sys.argv) > 4 else 'random',
+               int(sys.argv[5]) if len(sys.argv) > 5 else None)
@@ -0,0 +1,535 @@
+"""Endgame tablebases from retrograde analysis, stored in memory mapped files.
+
+   A table holds every position of one material signature, e.g. 'KQvK' (White
+   King and Queen against Black King) for Chess or 'KKvK' (two White crowned
+   counters against one Black) for Draughts, where M is an uncrowned man. Each
+   position is one byte: win or loss for the player to move and plies until
+   the game ends with best play, or a draw if neither side can force a win.
+
+   Generation uses the games' own legal_moves/apply_move, so tables follow the
+   project's rules (e.g. Pawns always promote to Queens). Successors of every
+   position are worked out in chunks on a process pool, each chunk saved as it
+   finishes so an interrupted run picks up where it stopped. Results are then
+   propagated back from lost positions one ply at a time. Moves leaving the
+   table (captures, promotions) are looked up in smaller tables, which are
+   generated first.
+
+   Positions are only stored with the stronger side as White. Chess tables
+   without Pawns also use the board's 8 symmetries and tables with Pawns its
+   left to right mirror, so the White King stands on a tenth or half of the
+   board respectively.
+
+   Functions:
+        generate:     write table for signature and every smaller table it needs
+        search_score: return engine score for probe result
+
+   Classes:
+        Tablebases:      read only tables in a directory, probed by game position
+        TablebaseResult: win, draw or loss for player to move and plies to the end
+
+   Usage: python -m src.engines.tablebase GAME SIGNATURE [SIGNATURE ...]
+"""
+from array import array
+from collections import defaultdict, namedtuple
+from concurrent.futures import as_completed, ProcessPoolExecutor
+import mmap
+import os
+import pickle
+import shutil
+import sys
+import time
+
+from src.game_enums import Color
+from src.game_pieces.draughts_counter import Counter
+from src.games.chess import Chess, FEN_CHARS, FEN_PIECES
+from src.games.draughts import Draughts
+
+
+MAGIC = b'GRTB0001'
+WIN, DRAW, LOSS = 1, 0, -1
+# Position values: DRAW, win in plies (1 to MAX_PLIES), LOSS_FLAG | plies or ILLEGAL
+LOSS_FLAG = 0x80
+ILLEGAL = 0xFF
+# Only used while generating, for positions not yet known to be won or lost
+UNKNOWN = 0xFE
+MAX_PLIES = 0x7D
+
+TABLEBASE_WORKERS = int(os.environ.get('TABLEBASE_WORKERS', os.cpu_count() or 1))
+# Positions per chunk of successor generation, the unit of work saved for resuming
+CHUNK_POSITIONS = 4096
+
+GAMES = {'chess': Chess, 'draughts': Draughts}
+# Piece letters strongest first, the order pieces take in signatures and table indexes
+PIECE_LETTERS = {Chess: 'KQRBNP', Draughts: 'KM'}
+
+TablebaseResult = namedtuple('TablebaseResult', 'wdl plies')
+# Counts of legal positions in a generated table, longest is plies of its slowest win
+TableStats = namedtuple('TableStats', 'signature positions wins draws losses longest seconds')
+
+
+def _board_transform(function):
+    """Return 64 tuple mapping each square index to its index after function(x, y)."""
+    return tuple(y_idx * 8 + x_idx for x_idx, y_idx in (function(square % 8, square // 8) for square in range(64)))
+
+
+IDENTITY = _board_transform(lambda x, y: (x, y))
+MIRROR = _board_transform(lambda x, y: (7 - x, y))
+# Every rotation and reflection of the board
+SYMMETRIES = (
+    IDENTITY, MIRROR,
+    _board_transform(lambda x, y: (x, 7 - y)), _board_transform(lambda x, y: (7 - x, 7 - y)),
+    _board_transform(lambda x, y: (y, x)), _board_transform(lambda x, y: (7 - y, x)),
+    _board_transform(lambda x, y: (y, 7 - x)), _board_transform(lambda x, y: (7 - y, 7 - x))
+)
+# Swapping colors turns the board around, so Pawns and men keep moving towards the far side
+COLOR_FLIP = _board_transform(lambda x, y: (7 - x, 7 - y))
+DARK_SQUARES = tuple(square for square in range(64) if (square % 8 + square // 8) % 2 == 0)
+
+
+def search_score(result, ply, win_score):
+    """Return negamax score of probed position ply moves from the search root.
+
+       Wins score win_score less plies from the root to the end of the game,
+       as engines score mates, so quicker wins and slower losses rank higher.
+    """
+    if result.wdl == WIN:
+        return win_score - ply - result.plies
+    if result.wdl == LOSS:
+        return -win_score + ply + result.plies
+    return 0
+
+
+class Tablebases():
+    """Read only tables in a directory, memory mapped on first probe.
+
+       Every process probing the same files shares one copy of them in the page
+       cache. Missing or unset directories simply have no tables.
+
+       Methods:
+            probe
+            outcome
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self._tables = None
+        self._max_pieces = {}
+
+    def probe(self, game):
+        """Return TablebaseResult for player to move in game, or None if no table holds the position."""
+        value = self.value(game)
+        if value is None or value == ILLEGAL:
+            return None
+        return _result(value)
+
+    def outcome(self, game):
+        """Return Color winning with best play, Color.NONE for a draw or None if not in a table."""
+        result = self.probe(game)
+        if result is None:
+            return None
+        if result.wdl == DRAW:
+            return Color.NONE
+        return game.playing_color if result.wdl == WIN else game.opponent_color
+
+    def value(self, game):
+        """Return int stored value of game position, or None if no table holds it."""
+        if self._tables is None:
+            self._open_tables()
+        game_class = type(game)
+        if game.piece_count(Color.WHITE) + game.piece_count(Color.BLACK) > self._max_pieces.get(game_class, 0):
+            return None
+        signature, squares, white_to_move = _material(game)
+        table_signature = _canonical_signature(game_class, signature)
+        table = self._tables.get((game_class, table_signature))
+        if table is None:
+            return None
+        if table_signature != signature:
+            signature, squares, white_to_move = _flip_colors(signature, squares, white_to_move)
+        return table.value(table.layout.index(squares, white_to_move))
+
+    def _open_tables(self):
+        tables = {}
+        if self.directory and os.path.isdir(self.directory):
+            for file_name in sorted(os.listdir(self.directory)):
+                game_name, _, signature = file_name[:-len('.tb')].partition('_')
+                if file_name.endswith('.tb') and game_name in GAMES and 'v' in signature:
+                    game_class = GAMES[game_name]
+                    tables[game_class, signature] = _TableFile(os.path.join(self.directory, file_name),
+                                                               _Layout(game_class, signature))
+                    self._max_pieces[game_class] = max(self._max_pieces.get(game_class, 0),
+                                                       len(signature) - 1)
+        self._tables = tables
+
+
+class _TableFile():
+    """One memory mapped table file: header, then one value byte per position index."""
+
+    HEADER_BYTES = len(MAGIC)
+
+    def __init__(self, path, layout):
+        self.layout = layout
+        with open(path, 'rb') as table_file:
+            self._mmap = mmap.mmap(table_file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mmap[:self.HEADER_BYTES] != MAGIC or len(self._mmap) != self.HEADER_BYTES + layout.size:
+            self._mmap.close()
+            raise ValueError(f'{path} is not a {layout.signature} table')
+
+    def value(self, index):
+        return self._mmap[self.HEADER_BYTES + index]
+
+
+class _Layout():
+    """Numbering of every position of one material signature.
+
+       An index packs the (symmetry reduced) square of the first piece, the
+       squares of the rest and the player to move.
+    """
+
+    def __init__(self, game_class, signature):
+        self.game_class = game_class
+        self.signature = signature
+        white_letters, black_letters = signature.split('v')
+        self.pieces = tuple([(Color.WHITE, letter) for letter in white_letters]
+                            + [(Color.BLACK, letter) for letter in black_letters])
+        if game_class is Chess:
+            self.squares = tuple(range(64))
+            if 'P' in signature:
+                self.transforms = (IDENTITY, MIRROR)
+                self.first_squares = tuple(square for square in range(64) if square % 8 <= 3)
+            else:
+                self.transforms = SYMMETRIES
+                self.first_squares = tuple(square for square in range(64) if square % 8 <= 3
+                                           and square // 8 <= square % 8)
+        else:
+            # Uncrowned men only move forwards, so Draughts has no symmetry to use
+            self.squares = self.first_squares = DARK_SQUARES
+            self.transforms = (IDENTITY,)
+        self._slots = {square: slot for slot, square in enumerate(self.squares)}
+        self._first_slots = {square: slot for slot, square in enumerate(self.first_squares)}
+        self.size = 2 * len(self.first_squares) * len(self.squares) ** (len(self.pieces) - 1)
+
+    def index(self, squares, white_to_move):
+        """Return int index of position with pieces on squares, in signature order."""
+        for transform in self.transforms:
+            index = self._first_slots.get(transform[squares[0]])
+            if index is not None:
+                break
+        slots, square_count = self._slots, len(self.squares)
+        for square in squares[1:]:
+            index = index * square_count + slots[transform[square]]
+        return 2 * index + (0 if white_to_move else 1)
+
+    def position(self, index):
+        """Return (squares in signature order, white_to_move) for index."""
+        index, black_to_move = divmod(index, 2)
+        squares = []
+        for _ in self.pieces[1:]:
+            index, slot = divmod(index, len(self.squares))
+            squares.append(self.squares[slot])
+        squares.append(self.first_squares[index])
+        squares.reverse()
+        return squares, not black_to_move
+
+
+def generate(game_class, signature, directory, workers=None, executor=None):
+    """Write table for material signature, and every smaller table it leads to, into directory.
+
+       Signatures list White's pieces then Black's, e.g. 'KRvK'. Tables are
+       stored with the stronger side as White, so 'KvKR' writes 'KRvK'.
+       Existing tables are kept. Return list of TableStats for tables written.
+    """
+    os.makedirs(directory, exist_ok=True)
+    own_executor = executor is None
+    executor = executor or ProcessPoolExecutor(max_workers=workers or TABLEBASE_WORKERS)
+    try:
+        stats = []
+        for table_signature in _required_signatures(game_class, _canonical_signature(game_class, signature)):
+            if not os.path.exists(_table_path(directory, game_class, table_signature)):
+                stats.append(_generate_table(game_class, table_signature, directory, executor))
+        return stats
+    finally:
+        if own_executor:
+            executor.shutdown()
+
+
+def _generate_table(game_class, signature, directory, executor):
+    start = time.perf_counter()
+    layout = _Layout(game_class, signature)
+    parts_directory = _table_path(directory, game_class, signature) + '.parts'
+    chunk_starts = range(0, layout.size, CHUNK_POSITIONS)
+    futures = [executor.submit(_successor_chunk, game_class.__name__.lower(), signature, directory, chunk_start,
+                               min(chunk_start + CHUNK_POSITIONS, layout.size))
+               for chunk_start in chunk_starts
+               if not os.path.exists(_chunk_path(parts_directory, chunk_start))]
+    for future in as_completed(futures):
+        future.result()
+
+    values, offsets, successors, external = bytearray(), array('I', [0]), array('I'), []
+    for chunk_start in chunk_starts:
+        with open(_chunk_path(parts_directory, chunk_start), 'rb') as chunk_file:
+            chunk_values, chunk_offsets, chunk_successors, chunk_external = pickle.load(chunk_file)
+        base = len(successors)
+        values += chunk_values
+        offsets.extend(base + offset for offset in chunk_offsets[1:])
+        successors += chunk_successors
+        external.extend(chunk_external)
+
+    _propagate(values, offsets, successors, external)
+
+    path = _table_path(directory, game_class, signature)
+    with open(path + '.tmp', 'wb') as table_file:
+        table_file.write(MAGIC)
+        table_file.write(values)
+    os.replace(path + '.tmp', path)
+    shutil.rmtree(parts_directory)
+
+    legal = [value for value in values if value != ILLEGAL]
+    wins = [value for value in legal if value != DRAW and not value & LOSS_FLAG]
+    losses = sum(1 for value in legal if value & LOSS_FLAG)
+    return TableStats(signature, len(legal), len(wins), len(legal) - len(wins) - losses, losses,
+                      max(wins, default=0), time.perf_counter() - start)
+
+
+def _successor_chunk(game_name, signature, directory, chunk_start, chunk_stop):
+    """Work out successors of positions chunk_start to chunk_stop and save them for the table.
+
+       Runs in a worker process. Saves (values, offsets, successors, external):
+       values holds final values of illegal and finished positions and UNKNOWN
+       for the rest, successors[offsets[i]:offsets[i + 1]] the table indexes
+       reached from position i and external (index, value) for moves leaving
+       the table, valued from the smaller tables.
+    """
+    game_class = GAMES[game_name]
+    layout = _Layout(game_class, signature)
+    smaller_tables = Tablebases(directory)
+    values, offsets, successors, external = bytearray(), array('I', [0]), array('I'), []
+
+    for index in range(chunk_start, chunk_stop):
+        game = _position_game(layout, *layout.position(index))
+        if game is None:
+            values.append(ILLEGAL)
+        else:
+            moves = game.legal_moves()
+            values.append(_finished_value(game) if not moves else UNKNOWN)
+            for move in moves:
+                undo_record = game.apply_move(*move)
+                successor_signature, squares, white_to_move = _material(game)
+                if _canonical_signature(game_class, successor_signature) == signature:
+                    if successor_signature != signature:
+                        successor_signature, squares, white_to_move = _flip_colors(
+                            successor_signature, squares, white_to_move)
+                    successors.append(layout.index(squares, white_to_move))
+                else:
+                    external.append((index, _external_value(game, successor_signature, smaller_tables)))
+                game.undo_move(undo_record)
+        offsets.append(len(successors))
+
+    parts_directory = _table_path(directory, game_class, signature) + '.parts'
+    os.makedirs(parts_directory, exist_ok=True)
+    path = _chunk_path(parts_directory, chunk_start)
+    with open(path + '.tmp', 'wb') as chunk_file:
+        pickle.dump((values, offsets, successors, external), chunk_file)
+    os.replace(path + '.tmp', path)
+
+
+def _external_value(game, signature, smaller_tables):
+    """Return value of position outside the table being generated, from its table or as finished game."""
+    value = smaller_tables.value(game)
+    if value is not None:
+        return value
+    if not game.legal_moves():
+        return _finished_value(game)
+    raise LookupError(f'No {signature} table for {game.to_fen()}, generate it first')
+
+
+def _finished_value(game):
+    """Return value of position where player to move has no legal move."""
+    return LOSS_FLAG if game.outcome() == game.opponent_color else DRAW
+
+
+def _propagate(values, offsets, successors, external):
+    """Fill in UNKNOWN values, working back from finished positions one ply at a time.
+
+       A position is won in n + 1 plies once any successor is lost in n, and
+       lost in n + 1 once every successor is won, the slowest in n. Positions
+       never resolved are draws.
+    """
+    size = len(values)
+    predecessor_offsets = array('I', bytes(4 * (size + 1)))
+    for successor in successors:
+        predecessor_offsets[successor + 1] += 1
+    for index in range(size):
+        predecessor_offsets[index + 1] += predecessor_offsets[index]
+    predecessors = array('I', bytes(4 * len(successors)))
+    next_slot = array('I', predecessor_offsets[:-1])
+    for index in range(size):
+        for successor in successors[offsets[index]:offsets[index + 1]]:
+            predecessors[next_slot[successor]] = index
+            next_slot[successor] += 1
+
+    remaining = array('I', (offsets[index + 1] - offsets[index] for index in range(size)))
+    # Plies to the end of a successor: (position, successor lost) found at that many plies
+    events = defaultdict(list)
+    for index, value in external:
+        remaining[index] += 1
+        if value != DRAW:
+            result = _result(value)
+            events[result.plies].append((index, result.wdl == LOSS))
+    resolved = {0: [index for index in range(size) if values[index] == LOSS_FLAG]}
+
+    plies = 0
+    while resolved or events:
+        level_events = events.pop(plies, [])
+        for successor in resolved.pop(plies, ()):
+            successor_lost = bool(values[successor] & LOSS_FLAG)
+            level_events.extend((predecessor, successor_lost) for predecessor in
+                                predecessors[predecessor_offsets[successor]:predecessor_offsets[successor + 1]])
+        newly_resolved = []
+        for index, successor_lost in level_events:
+            if values[index] != UNKNOWN:
+                continue
+            if successor_lost:
+                values[index] = plies + 1
+            else:
+                remaining[index] -= 1
+                if remaining[index]:
+                    continue
+                values[index] = LOSS_FLAG | (plies + 1)
+            newly_resolved.append(index)
+        if newly_resolved:
+            if plies + 1 > MAX_PLIES:
+                raise ValueError(f'Positions more than {MAX_PLIES} plies from the end')
+            resolved[plies + 1] = newly_resolved
+        plies += 1
+
+    for index in range(size):
+        if values[index] == UNKNOWN:
+            values[index] = DRAW
+
+
+def _result(value):
+    if value == DRAW:
+        return TablebaseResult(DRAW, 0)
+    if value & LOSS_FLAG:
+        return TablebaseResult(LOSS, value & ~LOSS_FLAG)
+    return TablebaseResult(WIN, value)
+
+
+def _position_game(layout, squares, white_to_move):
+    """Return game set up with layout pieces on squares, or None if position can't arise in play."""
+    if len(set(squares)) != len(squares):
+        return None
+    board = [['1'] * 8 for _ in range(8)]
+    for (color, letter), square in zip(layout.pieces, squares):
+        y_idx = square // 8
+        if letter == 'P' and y_idx in (0, 7):
+            return None
+        if letter == 'M' and y_idx == (7 if color == Color.WHITE else 0):
+            # Men reaching their king row are crowned
+            return None
+        board[y_idx][square % 8] = letter if color == Color.WHITE else letter.lower()
+    placement = '/'.join(''.join(row) for row in reversed(board))
+    game = layout.game_class.from_fen(f'{placement} {"w" if white_to_move else "b"} - - 0 1')
+
+    if layout.game_class is Chess:
+        # Player not to move can't be in check
+        game.switch_players()
+        opponent_in_check = game.in_check()
+        game.switch_players()
+        if opponent_in_check:
+            return None
+    return game
+
+
+def _material(game):
+    """Return (signature, squares in signature order, white_to_move) for game position."""
+    letters = PIECE_LETTERS[type(game)]
+    sides = []
+    for color in (Color.WHITE, Color.BLACK):
+        pieces = sorted((letters.index(_piece_letter(piece)), coords.y * 8 + coords.x)
+                        for coords, piece in game.color_positions(color))
+        sides.append(pieces)
+    signature = 'v'.join(''.join(letters[letter] for letter, _ in pieces) for pieces in sides)
+    return signature, [square for pieces in sides for _, square in pieces], game.playing_color == Color.WHITE
+
+
+def _piece_letter(piece):
+    if isinstance(piece, Counter):
+        return 'K' if piece.crowned else 'M'
+    return FEN_CHARS[type(piece)].upper()
+
+
+def _flip_colors(signature, squares, white_to_move):
+    """Return position with colors swapped and board turned around."""
+    white_letters, black_letters = signature.split('v')
+    white_squares, black_squares = squares[:len(white_letters)], squares[len(white_letters):]
+    return (f'{black_letters}v{white_letters}', [COLOR_FLIP[square] for square in black_squares + white_squares],
+            not white_to_move)
+
+
+def _canonical_signature(game_class, signature):
+    """Return signature tables are stored under: more pieces, then stronger pieces, as White."""
+    white_letters, black_letters = signature.split('v')
+    flipped = f'{black_letters}v{white_letters}'
+    letters = PIECE_LETTERS[game_class]
+
+    def strength(side_letters):
+        return -len(side_letters), [letters.index(letter) for letter in side_letters]
+    return flipped if strength(black_letters) < strength(white_letters) else signature
+
+
+def _required_signatures(game_class, signature, found=None):
+    """Return list of canonical signatures signature's table needs, smallest first, ending with signature."""
+    found = [] if found is None else found
+    for smaller in _smaller_signatures(game_class, signature):
+        smaller = _canonical_signature(game_class, smaller)
+        if smaller not in found:
+            _required_signatures(game_class, smaller, found)
+    if signature not in found:
+        found.append(signature)
+    return found
+
+
+def _smaller_signatures(game_class, signature):
+    """Return set of signatures one capture or promotion away. Sides with no pieces left are game over."""
+    letters = PIECE_LETTERS[game_class]
+    promotions = {'P': 'Q', 'M': 'K'}
+    sides = signature.split('v')
+    smaller = set()
+    for side_index, side_letters in enumerate(sides):
+        for position, letter in enumerate(side_letters):
+            changed = [side_letters[:position] + side_letters[position + 1:]]
+            if letter in promotions:
+                changed.append(side_letters[:position] + promotions[letter] + side_letters[position + 1:])
+            for new_letters in changed:
+                if not new_letters or (game_class is Chess and 'K' not in new_letters):
+                    continue
+                new_sides = list(sides)
+                new_sides[side_index] = ''.join(sorted(new_letters, key=letters.index))
+                smaller.add('v'.join(new_sides))
+    return smaller
+
+
+def _table_path(directory, game_class, signature):
+    return os.path.join(directory, f'{game_class.__name__.lower()}_{signature}.tb')
+
+
+def _chunk_path(parts_directory, chunk_start):
+    return os.path.join(parts_directory, f'{chunk_start}.pickle')
+
+
+def _generate_tables(game_name, signatures):
+    directory = os.environ.get('TABLEBASE_DIR', 'tablebases')
+    for signature in signatures:
+        for stats in generate(GAMES[game_name.lower()], signature, directory):
+            print(f'{stats.signature:<8} {stats.positions:>8} positions  {stats.wins:>8} wins  '
+                  f'{stats.draws:>8} draws  {stats.losses:>8} losses  longest win {stats.longest:>3} plies  '
+                  f'{stats.seconds:.1f}s')
+
+
+# Shared by every search in the process, tables found in TABLEBASE_DIR (none if unset)
+TABLEBASES = Tablebases(os.environ.get('TABLEBASE_DIR'))
+
+
+if __name__ == '__main__':
+    _generate_tables(sys.argv[1], sys.argv[2:])
@@ -6,18 +6,16 @@ from src.games.game import move_direction
 
 class Bishop(GamePiece):
     """Bishop chess game piece. Inherits from GamePiece."""
-    def __init__(self, color):
-        super().__init__()
-        self.color = color
+    __slots__ = ()
 
     def __str__(self):
         return '\u2657' if self.color == Color.WHITE else '\u265D'
 
-    def legal_move(self, to_coords):
-        return self._legal(to_coords)
+    def legal_move(self, from_coords, to_coords):
+        return self._legal(from_coords, to_coords)
 
-    def legal_capture(self, to_coords):
-        return self._legal(to_coords)
+    def legal_capture(self, from_coords, to_coords):
+        return self._legal(from_coords, to_coords)
 
-    def _legal(self, to_coords):
-        return move_direction(self.coords, to_coords) == Direction.DIAGONAL
+    def _legal(self, from_coords, to_coords):
+        return move_direction(from_coords, to_coords) == Direction.DIAGONAL
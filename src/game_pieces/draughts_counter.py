@@ -1,33 +1,46 @@
 from src.game_enums import Color
 from src.game_pieces.game_piece import GamePiece
-from src.games.game import NEXT_ADJACENT_COORD
+from src.games.geometry import DIRECTION_STEPS
 
 class Counter(GamePiece):
-    def __init__(self, color):
-        super().__init__()
-        self.color = color
-        self.crowned = False
-        self._to_coords = None
+    __slots__ = ('crowned',)
+
+    def __new__(cls, color, crowned=False):
+        return cls._intern(color, crowned)
+
+    def _set_kind(self, color, crowned):
+        super()._set_kind(color)
+        object.__setattr__(self, 'crowned', crowned)
+
+    def __reduce__(self):
+        return (self.__class__, (self.color, self.crowned))
+
+    def __repr__(self):
+        if self.crowned:
+            return f'{self.name}({self.color.value!r}, crowned=True)'
+        return super().__repr__()
 
     def __str__(self):
         if self.crowned:
             return '\u26C1' if self.color == Color.WHITE else '\u26C3'
         return '\u26C0' if self.color == Color.WHITE else '\u26C2'
 
+    def crown(self):
+        """Return crowned Counter of same color."""
+        return Counter(self.color, crowned=True)
+
     def legal_move_directions(self):
         if self.crowned:
             return ['NE', 'SE', 'SW', 'NW']
         return ['NE', 'NW'] if self.color == Color.WHITE else ['SE', 'SW']
 
-    def legal_move(self, to_coords):
-        for direction in self.legal_move_directions():
-            if to_coords == NEXT_ADJACENT_COORD[direction](self.coords):
-                return True
-        return False
+    def legal_move(self, from_coords, to_coords):
+        step = (to_coords.x - from_coords.x, to_coords.y - from_coords.y)
+        return any(DIRECTION_STEPS[direction] == step for direction in self.legal_move_directions())
 
-    def legal_capture(self, to_coords):
+    def legal_capture(self, from_coords, to_coords):
         # Only cursory check here. Main capture logic in Draughts game
-        for coords in (self.coords, to_coords):
+        for coords in (from_coords, to_coords):
             if self._white_square(coords):
                 return False
         return True
@@ -4,22 +4,62 @@ from abc import ABC, abstractmethod
 from src.game_enums import Color
 
 
+PIECE_COLORS = (Color.WHITE, Color.BLACK)
+
+# Interned piece instances keyed by (class, color, *kind)
+_PIECES = {}
+
+
 class GamePiece(ABC):
     """Abstract Base class for game pieces.
 
+       Pieces are immutable flyweights. There is one shared instance per class,
+       color and kind, so King(Color.WHITE) is King(Color.WHITE) and comparisons
+       are identity checks that allocate nothing. Per square state (coordinates,
+       moved King/Rook, etc.) is kept by the game.
+
        Attributes:
-            name:   Class name as str
-            color:  Piece color (Color Enum)
-            coords: Piece current coordinates on board
+            name:      Class name as str
+            color:     Piece color (Color Enum)
 
        Abstract methods:
             legal_move:    Logic to decide legal move for piece
             legal_capture: Logic to decide legal capture for piece
     """
-    def __init__(self):
-        self.name = self.__class__.__name__
-        self._color = None
-        self.coords = None
+    __slots__ = ('name', 'color')
+
+    def __new__(cls, color):
+        return cls._intern(color)
+
+    @classmethod
+    def _intern(cls, color, *kind):
+        """Return shared instance for color and kind, creating it on first use."""
+        key = (cls, color, *kind)
+        piece = _PIECES.get(key)
+        if piece is None:
+            if color not in PIECE_COLORS:
+                raise ValueError('Not a legal game color')
+            piece = super().__new__(cls)
+            piece._set_kind(color, *kind)
+            _PIECES[key] = piece
+        return piece
+
+    def _set_kind(self, color):
+        object.__setattr__(self, 'name', self.__class__.__name__)
+        object.__setattr__(self, 'color', color)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f'{self.name} pieces are immutable')
+
+    def __reduce__(self):
+        # Unpickling goes back through __new__ so restored pieces stay interned
+        return (self.__class__, (self.color,))
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
 
     def __repr__(self):
         return f'{self.name}({self.color.value!r})'
@@ -27,28 +67,12 @@ class GamePiece(ABC):
     def __str__(self):
         raise NotImplementedError()
 
-    def __eq__(self, other):
-        if other.__class__ is self.__class__:
-            return (self.name, self.color) == (other.name, other.color)
-        return NotImplemented
-
-    @property
-    def color(self):
-        return self._color
-
-    @color.setter
-    def color(self, color):
-        if color not in Color:
-            # AttributeError thrown if illegal Color Enum, TODO Why can't I catch it?
-            raise ValueError('Not a legal game color')
-        self._color = color
-
     @abstractmethod
-    def legal_move(self, to_coords):
-        """Confirm if move at passed coordinates supported by this piece. Return bool."""
+    def legal_move(self, from_coords, to_coords):
+        """Confirm if move between passed coordinates supported by this piece. Return bool."""
         raise NotImplementedError()
 
     @abstractmethod
-    def legal_capture(self, to_coords):
-        """Confirm if capture at passed coordinates supported by this piece. Return bool."""
+    def legal_capture(self, from_coords, to_coords):
+        """Confirm if capture between passed coordinates supported by this piece. Return bool."""
         raise NotImplementedError()
@@ -5,21 +5,19 @@ from src.game_pieces.game_piece import GamePiece
 
 class Knight(GamePiece):
     """Knight chess game piece. Inherits from GamePiece."""
-    def __init__(self, color):
-        super().__init__()
-        self.color = color
+    __slots__ = ()
 
     def __str__(self):
         return '\u2658' if self.color == Color.WHITE else '\u265E'
 
-    def legal_move(self, to_coords):
-        return self._legal(to_coords)
+    def legal_move(self, from_coords, to_coords):
+        return self._legal(from_coords, to_coords)
 
-    def legal_capture(self, to_coords):
-        return self._legal(to_coords)
+    def legal_capture(self, from_coords, to_coords):
+        return self._legal(from_coords, to_coords)
 
-    def _legal(self, to_coords):
-        from_x, from_y = self.coords.x, self.coords.y
+    def _legal(self, from_coords, to_coords):
+        from_x, from_y = from_coords.x, from_coords.y
         to_x, to_y = to_coords.x, to_coords.y
         # Only the following 8 combinations of move/capture legal
         if (to_x == from_x + 1 and to_y in (from_y + 2, from_y - 2)
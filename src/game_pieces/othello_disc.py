@@ -4,15 +4,17 @@ from src.game_pieces.game_piece import GamePiece
 
 class Disc(GamePiece):
     """Disc is a dumb object. Can only be placed or flipped so doesn't implement legal move/capture."""
-    def __init__(self, color):
-        super().__init__()
-        self.color = color
+    __slots__ = ()
 
     def __str__(self):
         return '\u25EF' if self.color == Color.WHITE else '\u2B24'
 
-    def legal_move(self, to_coords):
+    def flip(self):
+        """Return Disc of opposite color."""
+        return Disc(Color.BLACK if self.color == Color.WHITE else Color.WHITE)
+
+    def legal_move(self, from_coords, to_coords):
         raise NotImplementedError()
 
-    def legal_capture(self, to_coords):
+    def legal_capture(self, from_coords, to_coords):
         raise NotImplementedError()
@@ -6,18 +6,16 @@ from src.games.game import move_direction
 
 class Queen(GamePiece):
     """Queen chess game piece. Inherits from GamePiece."""
-    def __init__(self, color):
-        super().__init__()
-        self.color = color
+    __slots__ = ()
 
     def __str__(self):
         return '\u2655' if self.color == Color.WHITE else '\u265B'
 
-    def legal_move(self, to_coords):
-        return self._legal(to_coords)
+    def legal_move(self, from_coords, to_coords):
+        return self._legal(from_coords, to_coords)
 
-    def legal_capture(self, to_coords):
-        return self._legal(to_coords)
+    def legal_capture(self, from_coords, to_coords):
+        return self._legal(from_coords, to_coords)
 
-    def _legal(self, to_coords):
-        return move_direction(self.coords, to_coords) != Direction.NON_LINEAR
+    def _legal(self, from_coords, to_coords):
+        return move_direction(from_coords, to_coords) != Direction.NON_LINEAR
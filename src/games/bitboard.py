@@ -0,0 +1,293 @@
+"""Bitboard tables and helpers for 8x8 games.
+
+   Squares are indexed a1=0, b1=1 ... h8=63 (index = y * 8 + x).
+   Bit n of a mask represents square index n.
+
+   Functions:
+        square_index:   return int square index of Coords
+        square_coords:  return Coords of int square index
+        squares:        return generator of square indexes set in mask
+        lsb_square:     return int index of lowest set bit in mask
+        pop_count:      return int count of bits set in mask
+        bishop_attacks: return attack mask for diagonal slider
+        rook_attacks:   return attack mask for horizontal/vertical slider
+        shift:          return mask moved one square in direction, dropping bits leaving board
+        othello_moves:  return mask of legal Othello disc placements
+        othello_flips:  return mask of discs flipped by Othello placement
+
+   Classes:
+        ChessBitboards: chess position as piece and occupancy masks
+"""
+from src.game_enums import Color
+from src.games.geometry import board_geometry, DIRECTION_STEPS
+
+
+BOARD_SIZE = 8
+ALL_SQUARES = (1 << 64) - 1
+# Interned Coords by square index, shared with the 8x8 game boards
+SQUARE_COORDS = board_geometry(BOARD_SIZE, BOARD_SIZE).squares
+# Rays in these directions run towards higher square indexes
+POSITIVE_DIRECTIONS = {'N', 'NE', 'E', 'NW'}
+DIAGONAL_DIRECTIONS = ('NE', 'SE', 'SW', 'NW')
+STRAIGHT_DIRECTIONS = ('N', 'E', 'S', 'W')
+
+KNIGHT_STEPS = ((1, 2), (2, 1), (2, -1), (1, -2), (-1, -2), (-2, -1), (-2, 1), (-1, 2))
+KING_STEPS = tuple(DIRECTION_STEPS.values())
+
+
+def square_index(coords):
+    """Return int square index (0-63) for Coords."""
+    return coords.y * BOARD_SIZE + coords.x
+
+
+def square_coords(square):
+    """Return interned Coords for int square index (0-63)."""
+    return SQUARE_COORDS[square]
+
+
+def squares(mask):
+    """Generator of square indexes set in mask, lowest first."""
+    while mask:
+        lowest_bit = mask & -mask
+        yield lowest_bit.bit_length() - 1
+        mask ^= lowest_bit
+
+
+def lsb_square(mask):
+    """Return square index of lowest set bit in mask."""
+    return (mask & -mask).bit_length() - 1
+
+
+def pop_count(mask):
+    """Return int count of bits set in mask."""
+    return bin(mask).count('1')
+
+
+def _on_board(x_coord, y_coord):
+    return 0 <= x_coord < BOARD_SIZE and 0 <= y_coord < BOARD_SIZE
+
+
+def _step_table(steps):
+    table = []
+    for square in range(64):
+        x_coord, y_coord = square % BOARD_SIZE, square // BOARD_SIZE
+        mask = 0
+        for x_step, y_step in steps:
+            if _on_board(x_coord + x_step, y_coord + y_step):
+                mask |= 1 << ((y_coord + y_step) * BOARD_SIZE + x_coord + x_step)
+        table.append(mask)
+    return table
+
+
+def _ray_table(x_step, y_step):
+    table = []
+    for square in range(64):
+        x_coord, y_coord = square % BOARD_SIZE + x_step, square // BOARD_SIZE + y_step
+        mask = 0
+        while _on_board(x_coord, y_coord):
+            mask |= 1 << (y_coord * BOARD_SIZE + x_coord)
+            x_coord, y_coord = x_coord + x_step, y_coord + y_step
+        table.append(mask)
+    return table
+
+
+def _between_table():
+    table = [[0] * 64 for _ in range(64)]
+    for direction in DIRECTION_STEPS:
+        for from_square in range(64):
+            between = 0
+            # squares() yields lowest first, so negative rays are walked from the far end
+            ray_squares = list(squares(RAYS[direction][from_square]))
+            if direction not in POSITIVE_DIRECTIONS:
+                ray_squares.reverse()
+            for to_square in ray_squares:
+                table[from_square][to_square] = between
+                between |= 1 << to_square
+    return table
+
+
+KNIGHT_ATTACKS = _step_table(KNIGHT_STEPS)
+KING_ATTACKS = _step_table(KING_STEPS)
+PAWN_ATTACKS = {
+    Color.WHITE: _step_table(((1, 1), (-1, 1))),
+    Color.BLACK: _step_table(((1, -1), (-1, -1)))
+}
+# Squares a pawn of color must stand on to attack a square, i.e. the opposite color pawn attacks
+PAWN_ATTACKERS = {Color.WHITE: PAWN_ATTACKS[Color.BLACK], Color.BLACK: PAWN_ATTACKS[Color.WHITE]}
+RAYS = {direction: _ray_table(*step) for direction, step in DIRECTION_STEPS.items()}
+BETWEEN = _between_table()
+
+_DIAGONAL_RAYS = tuple((RAYS[direction], direction in POSITIVE_DIRECTIONS)
+                       for direction in DIAGONAL_DIRECTIONS)
+_STRAIGHT_RAYS = tuple((RAYS[direction], direction in POSITIVE_DIRECTIONS)
+                       for direction in STRAIGHT_DIRECTIONS)
+
+
+def _slider_attacks(square, occupied, rays):
+    attacks = 0
+    for ray_table, positive in rays:
+        ray = ray_table[square]
+        blockers = ray & occupied
+        if blockers:
+            if positive:
+                ray ^= ray_table[(blockers & -blockers).bit_length() - 1]
+            else:
+                ray ^= ray_table[blockers.bit_length() - 1]
+        attacks |= ray
+    return attacks
+
+
+def bishop_attacks(square, occupied):
+    """Return mask of squares attacked diagonally from square, stopping at first blocker."""
+    return _slider_attacks(square, occupied, _DIAGONAL_RAYS)
+
+
+def rook_attacks(square, occupied):
+    """Return mask of squares attacked horizontally/vertically from square, stopping at first blocker."""
+    return _slider_attacks(square, occupied, _STRAIGHT_RAYS)
+
+
+NOT_A_FILE = ALL_SQUARES & ~sum(1 << (y_idx * BOARD_SIZE) for y_idx in range(BOARD_SIZE))
+NOT_H_FILE = ALL_SQUARES & ~sum(1 << (y_idx * BOARD_SIZE + 7) for y_idx in range(BOARD_SIZE))
+
+# direction: (bit shift, positive shift, mask of squares a bit can land on)
+SHIFTS = {
+    'N': (8, True, ALL_SQUARES),
+    'NE': (9, True, NOT_A_FILE),
+    'E': (1, True, NOT_A_FILE),
+    'SE': (7, False, NOT_A_FILE),
+    'S': (8, False, ALL_SQUARES),
+    'SW': (9, False, NOT_H_FILE),
+    'W': (1, False, NOT_H_FILE),
+    'NW': (7, True, NOT_H_FILE)
+}
+_SHIFTS = tuple(SHIFTS.values())
+
+
+def shift(mask, direction):
+    """Return mask with every bit moved one square in direction. Bits leaving the board are dropped."""
+    bits, positive, landing_mask = SHIFTS[direction]
+    return ((mask << bits) if positive else (mask >> bits)) & landing_mask
+
+
+def othello_moves(own, opponent):
+    """Return mask of empty squares where a disc would trap at least one opponent disc.
+
+       Runs of opponent discs are grown from own discs in all 8 directions at
+       once per direction (at most 6 opponent discs fit between two squares).
+    """
+    empty = ALL_SQUARES & ~(own | opponent)
+    moves = 0
+    for bits, positive, landing_mask in _SHIFTS:
+        inner = opponent & landing_mask
+        if positive:
+            run = (own << bits) & inner
+            for _ in range(5):
+                run |= (run << bits) & inner
+            moves |= (run << bits) & landing_mask & empty
+        else:
+            run = (own >> bits) & inner
+            for _ in range(5):
+                run |= (run >> bits) & inner
+            moves |= (run >> bits) & landing_mask & empty
+    return moves
+
+
+def othello_flips(square, own, opponent):
+    """Return mask of opponent discs flipped by own disc placed on square index."""
+    flips = 0
+    for bits, positive, landing_mask in _SHIFTS:
+        run = 0
+        bit = 1 << square
+        while True:
+            bit = ((bit << bits) if positive else (bit >> bits)) & landing_mask
+            if not bit & opponent:
+                break
+            run |= bit
+        if bit & own:
+            flips |= run
+    return flips
+
+
+class ChessBitboards():
+    """Chess position stored as one 64 bit mask per piece name and color plus occupancy masks.
+
+       Attributes:
+            pieces:    {Color: {piece name: mask}}
+            occupancy: {Color: mask of all pieces of that color}
+            occupied:  mask of all occupied squares
+
+       Methods:
+            place
+            remove
+            attackers
+            attacked
+            attacks
+    """
+    PIECE_NAMES = ('King', 'Queen', 'Rook', 'Bishop', 'Knight', 'Pawn')
+
+    def __init__(self):
+        self.pieces = {color: dict.fromkeys(self.PIECE_NAMES, 0)
+                       for color in (Color.WHITE, Color.BLACK)}
+        self.occupancy = {Color.WHITE: 0, Color.BLACK: 0}
+        self.occupied = 0
+
+    def place(self, piece, square):
+        """Set piece bit at square index."""
+        bit = 1 << square
+        self.pieces[piece.color][piece.name] |= bit
+        self.occupancy[piece.color] |= bit
+        self.occupied |= bit
+
+    def remove(self, piece, square):
+        """Clear piece bit at square index."""
+        bit = ~(1 << square)
+        self.pieces[piece.color][piece.name] &= bit
+        self.occupancy[piece.color] &= bit
+        self.occupied &= bit
+
+    def attackers(self, square, color, occupied=None):
+        """Return mask of color pieces attacking square index.
+
+           occupied: optional occupancy mask used for slider blocking, e.g. with a King lifted off board.
+        """
+        if occupied is None:
+            occupied = self.occupied
+        pieces = self.pieces[color]
+        diagonal_sliders = pieces['Bishop'] | pieces['Queen']
+        straight_sliders = pieces['Rook'] | pieces['Queen']
+
+        attackers = ((KNIGHT_ATTACKS[square] & pieces['Knight'])
+                     | (KING_ATTACKS[square] & pieces['King'])
+                     | (PAWN_ATTACKERS[color][square] & pieces['Pawn']))
+        if diagonal_sliders:
+            attackers |= bishop_attacks(square, occupied) & diagonal_sliders
+        if straight_sliders:
+            attackers |= rook_attacks(square, occupied) & straight_sliders
+        return attackers
+
+    def attacked(self, square, color, occupied=None):
+        """Return bool of whether any color piece attacks square index."""
+        return self.attackers(square, color, occupied) != 0
+
+    def attacks(self, color, occupied=None):
+        """Return mask of all squares attacked by color pieces.
+
+           occupied: optional occupancy mask used for slider blocking, e.g. with a King lifted off board.
+        """
+        if occupied is None:
+            occupied = self.occupied
+        pieces = self.pieces[color]
+        if color == Color.WHITE:
+            attacks = shift(pieces['Pawn'], 'NE') | shift(pieces['Pawn'], 'NW')
+        else:
+            attacks = shift(pieces['Pawn'], 'SE') | shift(pieces['Pawn'], 'SW')
+        for square in squares(pieces['Knight']):
+            attacks |= KNIGHT_ATTACKS[square]
+        for square in squares(pieces['King']):
+            attacks |= KING_ATTACKS[square]
+        for square in squares(pieces['Bishop'] | pieces['Queen']):
+            attacks |= bishop_attacks(square, occupied)
+        for square in squares(pieces['Rook'] | pieces['Queen']):
+            attacks |= rook_attacks(square, occupied)
+        return attacks
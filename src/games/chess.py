@@ -1,9 +1,15 @@
 """Contains Chess class."""
-from copy import deepcopy
+from collections import namedtuple
+import os
 
-from src.game_enums import ChessPiece, Color, Direction
+from src.game_enums import ChessPiece, Color
 from src.game_errors import IllegalMoveError
-from src.games.game import Coords, Game, move_direction, NEXT_ADJACENT_COORD, TWO_COORD_ERR_MSG
+from src.games.bitboard import (ALL_SQUARES, BETWEEN, bishop_attacks, ChessBitboards, KING_ATTACKS,
+                                KNIGHT_ATTACKS, lsb_square, PAWN_ATTACKS, rook_attacks,
+                                square_coords, square_index, squares)
+from src.games.game import ALPHABET, Coords, Game, TWO_COORD_ERR_MSG
+from src.games.transposition import TranspositionTable
+from src.games.zobrist import zobrist_key
 
 from src.game_pieces.bishop import Bishop
 from src.game_pieces.king import King
@@ -13,8 +19,49 @@ from src.game_pieces.queen import Queen
 from src.game_pieces.rook import Rook
 
 
+UndoRecord = namedtuple('UndoRecord', 'from_coords to_coords piece captured captured_coords '
+                                      'rook_coords unmoved_coords last_move_pawn_coords position_hash '
+                                      'castling_key en_passant_key attack_cache')
+
+FEN_PIECES = {'k': King, 'q': Queen, 'r': Rook, 'b': Bishop, 'n': Knight, 'p': Pawn}
+FEN_CHARS = {piece_class: char for char, piece_class in FEN_PIECES.items()}
+# FEN castling right: (King start coords, Rook start coords)
+FEN_CASTLING = {
+    'K': (Coords(4, 0), Coords(7, 0)),
+    'Q': (Coords(4, 0), Coords(0, 0)),
+    'k': (Coords(4, 7), Coords(7, 7)),
+    'q': (Coords(4, 7), Coords(0, 7))
+}
+CASTLING_KEYS = {castling_right: zobrist_key('castling', castling_right) for castling_right in FEN_CASTLING}
+EN_PASSANT_FILE_KEYS = tuple(zobrist_key('en passant', x_idx) for x_idx in range(8))
+
+PositionStatus = namedtuple('PositionStatus', 'check checkmate stalemate')
+# King square, mask of checking pieces, mask of squares non King moves must land on
+# to answer check and {pinned piece square: mask of squares it may move to}
+MoveConstraints = namedtuple('MoveConstraints', 'king_square checkers evasion_mask pin_masks')
+# Shared by every Chess game in the process, so repeated positions are only analysed once
+_STATUS_CACHE_BYTES = os.environ.get('CHESS_STATUS_CACHE_BYTES')
+POSITION_STATUS_CACHE = TranspositionTable(
+    max_entries=int(os.environ.get('CHESS_STATUS_CACHE_ENTRIES', 100_000)),
+    max_bytes=int(_STATUS_CACHE_BYTES) if _STATUS_CACHE_BYTES else None
+)
+
+
 class Chess(Game):
-    """Contains logic for Chess."""
+    """Contains logic for Chess.
+
+       Alongside Game.board the position is kept as bitboards (one mask per piece
+       type and color plus occupancy masks) which all attack detection runs on.
+
+       position_hash also covers castling rights and the en passant file, so
+       positions only compare equal when the same moves are legal in both.
+
+       Legal moves come from one MoveConstraints (checkers and pins) per
+       position rather than playing out every pseudo legal move. Constraints,
+       attack maps and King danger maps are worked out when first needed and
+       kept until the board changes; undo_move restores the ones from before
+       the move, so a search revisiting a position doesn't recompute them.
+    """
 
     ILLEGAL_MOVE = 'Illegal move for piece'
     ILLEGAL_CAPTURE = 'Illegal capture for piece'
@@ -37,70 +84,385 @@ class Chess(Game):
             'input_err_msg': TWO_COORD_ERR_MSG
         }
 
+        self.bitboards = ChessBitboards()
+        self._attack_cache = {}
+        self.unmoved_coords = set()  # Coords of Kings/Rooks yet to move, used for castling rights
+        self.last_move_pawn_coords = None  # Used for checking legality of en passant attempt
+        self._castling_key = 0
+        self._en_passant_key = 0
+
         super().__init__(CHESS_SETUP, restore_positions)
 
-        self.last_move_pawn = None  # Used for checking legality of en passant attempt
+    @classmethod
+    def from_fen(cls, fen):
+        """Return Chess game set up from Forsyth-Edwards Notation string.
+
+           Castling rights set unmoved_coords and the en passant square
+           sets last_move_pawn_coords. Move clocks are ignored.
+        """
+        placement, color, castling, en_passant = fen.split()[:4]
+        positions = cls._fen_positions(placement, lambda char, piece_color: FEN_PIECES[char](piece_color))
+
+        game = cls(restore_positions=positions)
+        game.playing_color = Color.WHITE if color == 'w' else Color.BLACK
+
+        game.unmoved_coords = {coords for castling_right in castling.replace('-', '')
+                               for coords in FEN_CASTLING[castling_right]}
+
+        if en_passant != '-':
+            x_idx = ALPHABET.index(en_passant[0])
+            # Pawn that moved two squares is one row past the en passant square
+            y_idx = 3 if en_passant[1] == '3' else 4
+            game.last_move_pawn_coords = Coords(x_idx, y_idx)
+        game._update_state_keys()
+        return game
+
+    def to_fen(self):
+        """Return Forsyth-Edwards Notation string for position. Move clocks are always 0 1."""
+        placement = self._fen_placement(lambda piece: FEN_CHARS[type(piece)])
+        color = 'w' if self.playing_color == Color.WHITE else 'b'
+        castling = ''.join(self._castling_rights()) or '-'
+        en_passant = '-'
+        if self.last_move_pawn_coords is not None:
+            pawn_coords = self.last_move_pawn_coords
+            en_passant = f'{ALPHABET[pawn_coords.x]}{3 if pawn_coords.y == 3 else 6}'
+        return f'{placement} {color} {castling} {en_passant} 0 1'
 
     def make_move(self):
         self._raise_errors_if_chess_specific_illegal_move()
 
-        make_move, legal_move, error_message = self._move_type()
+        legal_move, error_message = self._move_type()
 
-        if legal_move(self.to_coords):
-            make_move()
-            if self._check_mate():
-                self.winner = self.playing_color.value
-            self.switch_players()
+        if legal_move(self.from_coords, self.to_coords):
+            self.apply_move(self.from_coords, self.to_coords)
+            status = self.position_status()
+            if status.checkmate:
+                self.winner = self.opponent_color
+            elif status.stalemate:
+                self.winner = Color.NONE
         else:
             raise IllegalMoveError(error_message)
 
     def _move_type(self):
         if self._castle_move():
-            return (self._castle_move_type(),
-                    self._legal_castle,
-                    self.ILLEGAL_CASTLE)
-        if self._prawn_promotion():
-            return (self._promote_pawn,
-                    self.playing_piece.legal_move,
-                    self.ILLEGAL_MOVE)
+            return self._legal_castle, self.ILLEGAL_CASTLE
         if self._en_passant():
-            return (self._capture_en_passant,
-                    self._legal_en_passant,
-                    self.ILLEGAL_EN_PASSANT)
+            return self._legal_en_passant, self.ILLEGAL_EN_PASSANT
         if self._capture_move():
-            return (self._move,
-                    self.playing_piece.legal_capture,
-                    self.ILLEGAL_CAPTURE)
-        return (self._move,
-                self.playing_piece.legal_move,
-                self.ILLEGAL_MOVE)
-
-    def _piece_blocking(self, from_coords, to_coords):
-        if move_direction(from_coords, to_coords) != Direction.NON_LINEAR:
-            # Only Knights move non_linear and they can jump over pieces
-            for coords in self.coords_between(from_coords, to_coords):
-                if self.board[coords.x][coords.y] is not None:
-                    return True
-        return False
-
-    def _promote_pawn(self):
-        self.board[self.from_coords.x][self.from_coords.y] = None
-        # Defaults to Queen as most players want this
-        # TODO Add functionality to choose promotion piece
-        promoted_piece = Queen(self.playing_color)
-        promoted_piece.coords = self.to_coords
-        self.board[self.to_coords.x][self.to_coords.y] = promoted_piece
-
-    def _move(self):
-        self._move_piece_and_update_coords()
-
-        if self._pawn_two_space_first_move():
-            self.last_move_pawn = self.playing_piece
+            return self.playing_piece.legal_capture, self.ILLEGAL_CAPTURE
+        return self.playing_piece.legal_move, self.ILLEGAL_MOVE
+
+    def legal_moves(self):
+        """Return list of legal (from_coords, to_coords) moves for player to move."""
+        constraints = self._move_constraints()
+        moves = []
+        for square in squares(self.bitboards.occupancy[self.playing_color]):
+            moves.extend(self._legal_moves_from_square(square, constraints))
+        return moves
+
+    def legal_moves_from(self, coords):
+        """Return list of legal (from_coords, to_coords) moves for piece at coords."""
+        piece = self.board[coords.x][coords.y]
+        if piece is None or piece.color != self.playing_color:
+            return []
+        return self._legal_moves_from_square(square_index(coords), self._move_constraints())
+
+    def _legal_moves_from_square(self, square, constraints):
+        from_coords = square_coords(square)
+        return [(from_coords, square_coords(to_square))
+                for to_square in squares(self._legal_targets(square, constraints))]
+
+    def _cached(self, key, compute):
+        try:
+            return self._attack_cache[key]
+        except KeyError:
+            value = self._attack_cache[key] = compute()
+            return value
+
+    def attack_map(self, color):
+        """Return mask of all squares attacked by color pieces."""
+        return self._cached(('attacks', color), lambda: self.bitboards.attacks(color))
+
+    def _king_danger_map(self, color):
+        """Return mask of squares color King can't move to: opponent attacks with King lifted off board."""
+        def compute():
+            opponent_color = Color.WHITE if color == Color.BLACK else Color.BLACK
+            occupied = self.bitboards.occupied & ~self.bitboards.pieces[color]['King']
+            return self.bitboards.attacks(opponent_color, occupied)
+        return self._cached(('king danger', color), compute)
+
+    def _move_constraints(self):
+        """Return MoveConstraints for player to move."""
+        return self._cached(('constraints', self.playing_color), self._compute_move_constraints)
+
+    def _compute_move_constraints(self):
+        color = self.playing_color
+        opponent_color = self.opponent_color
+        king_square = lsb_square(self.bitboards.pieces[color]['King'])
+        checkers = self.bitboards.attackers(king_square, opponent_color)
+
+        if not checkers:
+            evasion_mask = ALL_SQUARES
+        elif checkers & (checkers - 1):
+            # Double check, only a King move can escape
+            evasion_mask = 0
         else:
-            self.last_move_pawn = None
+            checker_square = lsb_square(checkers)
+            evasion_mask = checkers | BETWEEN[king_square][checker_square]
+
+        opponent_pieces = self.bitboards.pieces[opponent_color]
+        own_pieces = self.bitboards.occupancy[color]
+        occupied = self.bitboards.occupied
+        # Sliders that would attack the King if the pieces between were lifted off
+        pinners = ((bishop_attacks(king_square, opponent_pieces['Bishop'] | opponent_pieces['Queen'])
+                    & (opponent_pieces['Bishop'] | opponent_pieces['Queen']))
+                   | (rook_attacks(king_square, opponent_pieces['Rook'] | opponent_pieces['Queen'])
+                      & (opponent_pieces['Rook'] | opponent_pieces['Queen'])))
+        pin_masks = {}
+        for pinner_square in squares(pinners):
+            between = BETWEEN[king_square][pinner_square] & occupied
+            if between and not between & (between - 1) and between & own_pieces:
+                pin_masks[lsb_square(between)] = BETWEEN[king_square][pinner_square] | (1 << pinner_square)
+        return MoveConstraints(king_square, checkers, evasion_mask, pin_masks)
+
+    def _legal_targets(self, square, constraints):
+        """Return mask of squares piece on square can legally move to."""
+        if square == constraints.king_square:
+            return self._king_targets(square, constraints.checkers)
+
+        targets = (self._pseudo_legal_targets(square) & constraints.evasion_mask
+                   & constraints.pin_masks.get(square, ALL_SQUARES))
+
+        en_passant_target = self._en_passant_target(square)
+        if en_passant_target:
+            # Removing two pawns from one rank can uncover a check pins don't show, so play it out
+            targets &= ~en_passant_target
+            if self._move_keeps_king_safe(square, lsb_square(en_passant_target)):
+                targets |= en_passant_target
+        return targets
+
+    def _king_targets(self, king_square, checkers):
+        color = self.playing_color
+        targets = KING_ATTACKS[king_square] & ~self.bitboards.occupancy[color] & ~self._king_danger_map(color)
+        if not checkers:
+            king_coords = square_coords(king_square)
+            targets |= self._castle_targets(king_coords, self.board[king_coords.x][king_coords.y])
+        return targets
+
+    def _en_passant_target(self, square):
+        """Return mask of en passant square if Pawn on square can capture en passant, else 0."""
+        pawn_coords = self.last_move_pawn_coords
+        if not pawn_coords:
+            return 0
+        coords = square_coords(square)
+        piece = self.board[coords.x][coords.y]
+        captured_piece = self.board[pawn_coords.x][pawn_coords.y]
+        if not isinstance(piece, Pawn) or not captured_piece or captured_piece.color == piece.color:
+            return 0
+        step = 8 if piece.color == Color.WHITE else -8
+        en_passant_bit = 1 << (square_index(pawn_coords) + step)
+        return PAWN_ATTACKS[piece.color][square] & en_passant_bit & ~self.bitboards.occupied
+
+    def _move_keeps_king_safe(self, from_square, to_square):
+        """Play move out and back, for the en passant cases pins can't answer. Return bool."""
+        playing_color = self.playing_color
+        undo_record = self.apply_move(square_coords(from_square), square_coords(to_square))
+        king_square = lsb_square(self.bitboards.pieces[playing_color]['King'])
+        in_check = self.bitboards.attacked(king_square, self.playing_color)
+        self.undo_move(undo_record)
+        return not in_check
+
+    def _pseudo_legal_targets(self, square):
+        """Return mask of squares piece on square could move to, ignoring own King safety."""
+        coords = square_coords(square)
+        piece = self.board[coords.x][coords.y]
+        color = piece.color
+        own_pieces = self.bitboards.occupancy[color]
+        occupied = self.bitboards.occupied
+
+        if isinstance(piece, Pawn):
+            return self._pawn_targets(square, color)
+        if isinstance(piece, Knight):
+            return KNIGHT_ATTACKS[square] & ~own_pieces
+        if isinstance(piece, King):
+            return (KING_ATTACKS[square] & ~own_pieces) | self._castle_targets(coords, piece)
+
+        attacks = 0
+        if isinstance(piece, (Bishop, Queen)):
+            attacks |= bishop_attacks(square, occupied)
+        if isinstance(piece, (Rook, Queen)):
+            attacks |= rook_attacks(square, occupied)
+        return attacks & ~own_pieces
+
+    def _pawn_targets(self, square, color):
+        occupied = self.bitboards.occupied
+        opponent_color = Color.BLACK if color == Color.WHITE else Color.WHITE
+        step, start_row = (8, 1) if color == Color.WHITE else (-8, 6)
+
+        targets = PAWN_ATTACKS[color][square] & self.bitboards.occupancy[opponent_color]
+        one_forward = square + step
+        if 0 <= one_forward < 64 and not occupied & (1 << one_forward):
+            targets |= 1 << one_forward
+            two_forward = one_forward + step
+            if square // 8 == start_row and not occupied & (1 << two_forward):
+                targets |= 1 << two_forward
+
+        pawn_coords = self.last_move_pawn_coords
+        if pawn_coords and self.board[pawn_coords.x][pawn_coords.y].color == opponent_color:
+            en_passant_square = square_index(pawn_coords) + step
+            if PAWN_ATTACKS[color][square] & (1 << en_passant_square) & ~occupied:
+                targets |= 1 << en_passant_square
+        return targets
+
+    def _castle_targets(self, king_coords, king):
+        start_coords = Coords(4, 0 if king.color == Color.WHITE else 7)
+        if king_coords != start_coords or king_coords not in self.unmoved_coords:
+            return 0
+        targets = 0
+        for to_x_coord in (2, 6):
+            to_coords = Coords(to_x_coord, king_coords.y)
+            if self._can_castle(king.color, king_coords, to_coords):
+                targets |= 1 << square_index(to_coords)
+        return targets
+
+    def apply_move(self, from_coords, to_coords):
+        """Make move in place without legality checks and switch players.
+
+           Handles captures, en passant, castling (Rook moved with King) and
+           promotion to Queen. Return UndoRecord for undo_move.
+        """
+        position_hash = self.position_hash
+        attack_cache = self._attack_cache
+        piece = self._remove_piece(from_coords)
+        captured_coords = self._en_passant_captured_coords(piece, from_coords, to_coords) or to_coords
+        captured = self._remove_piece(captured_coords)
+        rook_coords = self._castle_rook_coords(piece, from_coords, to_coords)
+
+        # King/Rook moving, castling Rook or Rook being captured all lose castling rights
+        unmoved_coords = tuple(coords for coords in (from_coords, to_coords, rook_coords and rook_coords[0])
+                               if coords in self.unmoved_coords)
+        self.unmoved_coords.difference_update(unmoved_coords)
+        if rook_coords:
+            rook = self._remove_piece(rook_coords[0])
+            self._place_piece(rook, rook_coords[1])
+
+        if isinstance(piece, Pawn) and to_coords.y in (0, 7):
+            # Defaults to Queen as most players want this
+            # TODO Add functionality to choose promotion piece
+            self._place_piece(Queen(piece.color), to_coords)
+        else:
+            self._place_piece(piece, to_coords)
+
+        undo_record = UndoRecord(from_coords, to_coords, piece, captured, captured_coords,
+                                 rook_coords, unmoved_coords, self.last_move_pawn_coords, position_hash,
+                                 self._castling_key, self._en_passant_key, attack_cache)
+
+        two_space_pawn_move = isinstance(piece, Pawn) and abs(from_coords.y - to_coords.y) == 2
+        self.last_move_pawn_coords = to_coords if two_space_pawn_move else None
+        self._update_state_keys(castling_changed=bool(unmoved_coords))
+        self.switch_players()
+        return undo_record
+
+    def undo_move(self, undo_record):
+        """Restore position exactly as it was before apply_move returned undo_record."""
+        self.switch_players()
+        self.last_move_pawn_coords = undo_record.last_move_pawn_coords
+
+        self._remove_piece(undo_record.to_coords)
+        if undo_record.rook_coords:
+            rook = self._remove_piece(undo_record.rook_coords[1])
+            self._place_piece(rook, undo_record.rook_coords[0])
+        self.unmoved_coords.update(undo_record.unmoved_coords)
+        if undo_record.captured:
+            self._place_piece(undo_record.captured, undo_record.captured_coords)
+        self._place_piece(undo_record.piece, undo_record.from_coords)
+        self.position_hash = undo_record.position_hash
+        self._castling_key = undo_record.castling_key
+        self._en_passant_key = undo_record.en_passant_key
+        self._attack_cache = undo_record.attack_cache
+
+    def _update_state_keys(self, castling_changed=True):
+        """XOR castling rights and en passant keys into position_hash when they change."""
+        old_keys = self._castling_key ^ self._en_passant_key
+        if castling_changed:
+            self._castling_key = self._castling_rights_key()
+        self._en_passant_key = self._en_passant_file_key()
+        self.position_hash ^= old_keys ^ self._castling_key ^ self._en_passant_key
+
+    def _castling_rights_key(self):
+        key = 0
+        for castling_right in self._castling_rights():
+            key ^= CASTLING_KEYS[castling_right]
+        return key
+
+    def _castling_rights(self):
+        """Return list of FEN castling rights letters (KQkq order) still held."""
+        rights = []
+        for castling_right, (king_coords, rook_coords) in FEN_CASTLING.items():
+            color = Color.WHITE if castling_right.isupper() else Color.BLACK
+            king = self.board[king_coords.x][king_coords.y]
+            rook = self.board[rook_coords.x][rook_coords.y]
+            if (isinstance(king, King) and isinstance(rook, Rook) and king.color == rook.color == color
+                    and king_coords in self.unmoved_coords and rook_coords in self.unmoved_coords):
+                rights.append(castling_right)
+        return rights
+
+    def _en_passant_file_key(self):
+        if self.last_move_pawn_coords is None:
+            return 0
+        return EN_PASSANT_FILE_KEYS[self.last_move_pawn_coords.x]
+
+    def _compute_position_hash(self):
+        return super()._compute_position_hash() ^ self._castling_rights_key() ^ self._en_passant_file_key()
+
+    def _en_passant_captured_coords(self, piece, from_coords, to_coords):
+        if (not isinstance(piece, Pawn) or from_coords.x == to_coords.x
+                or self.board[to_coords.x][to_coords.y] is not None):
+            return None
+        coords = Coords(to_coords.x, from_coords.y)
+        captured_piece = self.board[coords.x][coords.y]
+        if isinstance(captured_piece, Pawn) and captured_piece.color != piece.color:
+            return coords
+        return None
+
+    def _castle_rook_coords(self, piece, from_coords, to_coords):
+        if not isinstance(piece, King) or from_coords.x != 4 or abs(from_coords.x - to_coords.x) != 2:
+            return None
+        rook_from, rook_to = (7, 5) if to_coords.x == 6 else (0, 3)
+        rook = self.board[rook_from][from_coords.y]
+        if isinstance(rook, Rook) and rook.color == piece.color:
+            return Coords(rook_from, from_coords.y), Coords(rook_to, from_coords.y)
+        return None
+
+    def _place_piece(self, piece, coords):
+        super()._place_piece(piece, coords)
+        self.bitboards.place(piece, square_index(coords))
+        # Replaced rather than cleared, an UndoRecord may hold the old cache
+        self._attack_cache = {}
+
+    def _remove_piece(self, coords):
+        piece = super()._remove_piece(coords)
+        if piece:
+            self.bitboards.remove(piece, square_index(coords))
+            self._attack_cache = {}
+        return piece
+
+    def add(self, piece, coords):
+        """Add piece on board at given coordinates. Added Kings/Rooks count as unmoved.
+
+           position_hash is kept up to date, castling rights included.
+        """
+        super().add(piece, coords)
+        if isinstance(piece, (King, Rook)):
+            self.unmoved_coords.add(coords)
+        else:
+            self.unmoved_coords.discard(coords)
+        self._update_state_keys()
 
-        if self.playing_piece in [King(self.playing_color), Rook(self.playing_color)]:
-            self.playing_piece.moved = True
+    def _piece_blocking(self, from_coords, to_coords):
+        # Non linear (Knight) moves have no squares between so are never blocked
+        between = BETWEEN[square_index(from_coords)][square_index(to_coords)]
+        return between & self.bitboards.occupied != 0
 
     def _raise_errors_if_chess_specific_illegal_move(self):
         captured_piece = self.board[self.to_coords.x][self.to_coords.y]
@@ -116,155 +478,52 @@ class Chess(Game):
                 raise IllegalMoveError(self.CASTLE_IN_CHECK)
             raise IllegalMoveError(self.KING_IN_CHECK)
 
-    def _pawn_two_space_first_move(self):
-        if (self.playing_piece == Pawn(Color.WHITE)
-                and self.from_coords.y == 1 and self.to_coords.y == 3):
-            return True
-        if (self.playing_piece == Pawn(Color.BLACK)
-                and self.from_coords.y == 6 and self.to_coords.y == 4):
-            return True
-        return False
-
-    def _capture_en_passant(self):
-        coords = self.last_move_pawn.coords
-        captured_piece = self.board[coords.x][coords.y]
-        captured_piece.coords = None
-        self.board[coords.x][coords.y] = None
-        self._move()
-
     def _castle_move(self):
-        if self.playing_piece == King(Color.WHITE):
-            if (self.from_coords == Coords(4, 0)
-                    and self.to_coords in (Coords(2, 0), Coords(6, 0))):
-                return True
-        if self.playing_piece == King(Color.BLACK):
-            if (self.from_coords == Coords(4, 7)
-                    and self.to_coords in (Coords(2, 7), Coords(6, 7))):
-                return True
-        return False
-
-    def _castle_move_type(self):
-        if self._white_king_row():
-            return self._white_castle()
-        if self._black_king_row():
-            return self._black_castle()
-
-    def _white_king_row(self):
-        return self.to_coords.y == 0
-
-    def _black_king_row(self):
-        return self.to_coords.y == 7
-
-    def _king_side(self):
-        return self.to_coords.x == 6
-
-    def _queen_side(self):
-        return self.to_coords.x == 2
-
-    def _white_castle(self):
-        if self._queen_side():
-            return self._white_castle_queen_side
-        return self._white_castle_king_side
-
-    def _black_castle(self):
-        if self._queen_side():
-            return self._black_castle_queen_side
-        return self._black_castle_king_side
-
-    def _prawn_promotion(self):
-        return (self.playing_piece == Pawn(Color.WHITE) and self._black_king_row()
-                or self.playing_piece == Pawn(Color.BLACK) and self._white_king_row())
-
-    def _legal_castle(self, to_coords=None):
-        playing_color = self.playing_color
-        move_coords = self._castle_coords()
-
-        if (self._king_moved(playing_color) or self._rook_moved(playing_color)
-                or self._king_in_check(playing_color, self.from_coords)):
+        if not isinstance(self.playing_piece, King):
+            return False
+        king_row = 0 if self.playing_piece.color == Color.WHITE else 7
+        return (self.from_coords == Coords(4, king_row)
+                and self.to_coords in (Coords(2, king_row), Coords(6, king_row)))
+
+    def _legal_castle(self, from_coords, to_coords):
+        return self._can_castle(self.playing_color, from_coords, to_coords)
+
+    def _can_castle(self, color, king_coords, to_coords):
+        """Check King and Rook unmoved, squares between them empty and King not
+           castling out of, through or into check. Return bool.
+        """
+        rook_coords = Coords(7 if to_coords.x == 6 else 0, king_coords.y)
+        rook = self.board[rook_coords.x][rook_coords.y]
+
+        if (not isinstance(rook, Rook) or rook.color != color
+                or king_coords not in self.unmoved_coords or rook_coords not in self.unmoved_coords
+                or self._piece_blocking(king_coords, rook_coords)):
             return False
 
-        for coords in move_coords:
-            if (self.board[coords.x][coords.y] is not None
-                    or self._king_in_check(playing_color, coords)):
+        passing_coords = Coords((king_coords.x + to_coords.x) // 2, king_coords.y)
+        for coords in (king_coords, passing_coords, to_coords):
+            if self._king_in_check(color, coords):
                 return False
         return True
 
-    def _castle_coords(self):
-        if self._white_king_row():
-            if self._queen_side():
-                castle_coords = (Coords(x=3, y=0), Coords(x=2, y=0))
-            if self._king_side():
-                castle_coords = (Coords(x=5, y=0), Coords(x=6, y=0))
-        if self._black_king_row():
-            if self._queen_side():
-                castle_coords = (Coords(x=3, y=7), Coords(x=2, y=7))
-            if self._king_side():
-                castle_coords = (Coords(x=5, y=7), Coords(x=6, y=7))
-        return castle_coords
-
-    def _king(self, wanted_color):
-        for piece in self.current_board_pieces():
-            if piece == King(wanted_color):
-                return piece
-
-    def _king_moved(self, playing_color):
-        king = self._king(playing_color)
-        return king.moved
-
-    def _rook_moved(self, playing_color):
-        if playing_color == Color.WHITE:
-            if self._king_side():
-                piece = self.board[7][0]
-            if self._queen_side():
-                piece = self.board[0][0]
-
-        if playing_color == Color.BLACK:
-            if self._king_side():
-                piece = self.board[7][7]
-            if self._queen_side():
-                piece = self.board[0][7]
-
-        return piece and piece == Rook(playing_color) and piece.moved
-
-    def _legal_en_passant(self, to_coords):
-        if not self.last_move_pawn:
+    def _king_coords(self, wanted_color):
+        return square_coords(lsb_square(self.bitboards.pieces[wanted_color]['King']))
+
+    def _legal_en_passant(self, from_coords, to_coords):
+        if not self.last_move_pawn_coords:
             return False
-        if self.playing_piece == Pawn(Color.WHITE) and to_coords.y == 5:
-            return Coords(to_coords.x, to_coords.y - 1) == self.last_move_pawn.coords
-        if self.playing_piece == Pawn(Color.BLACK) and to_coords.y == 2:
-            return Coords(to_coords.x, to_coords.y + 1) == self.last_move_pawn.coords
+        if self.playing_piece.color == Color.WHITE and to_coords.y == 5:
+            return Coords(to_coords.x, to_coords.y - 1) == self.last_move_pawn_coords
+        if self.playing_piece.color == Color.BLACK and to_coords.y == 2:
+            return Coords(to_coords.x, to_coords.y + 1) == self.last_move_pawn_coords
         return False
 
-    def _white_castle_king_side(self):
-        king, rook = self.board[4][0], self.board[7][0]
-        self.board[4][0], self.board[7][0] = None, None
-        self.board[6][0], self.board[5][0] = king, rook
-        king.moved, rook.moved = True, True
-
-    def _white_castle_queen_side(self):
-        king, rook = self.board[4][0], self.board[0][0]
-        self.board[4][0], self.board[0][0] = None, None
-        self.board[2][0], self.board[3][0] = king, rook
-        king.moved, rook.moved = True, True
-
-    def _black_castle_king_side(self):
-        king, rook = self.board[4][7], self.board[7][7]
-        self.board[4][7], self.board[7][7] = None, None
-        self.board[6][7], self.board[5][7] = king, rook
-        king.moved, rook.moved = True, True
-
-    def _black_castle_queen_side(self):
-        king, rook = self.board[4][7], self.board[0][7]
-        self.board[4][7], self.board[0][7] = None, None
-        self.board[2][7], self.board[3][7] = king, rook
-        king.moved, rook.moved = True, True
-
     def _capture_move(self):
         return self.board[self.to_coords.x][self.to_coords.y] is not None
 
     def _en_passant(self):
-        if (self.playing_piece == Pawn(self.playing_color)
-                and self.playing_piece.legal_capture(self.to_coords)
+        if (isinstance(self.playing_piece, Pawn)
+                and self.playing_piece.legal_capture(self.from_coords, self.to_coords)
                 and self.board[self.to_coords.x][self.to_coords.y] is None
                 and self._potential_en_passant_capture_piece()):
             return True
@@ -272,79 +531,65 @@ class Chess(Game):
 
     def _potential_en_passant_capture_piece(self):
         y_coord = self.to_coords.y - 1 if self.playing_color == Color.WHITE else self.to_coords.y + 1
-        if self.board[self.to_coords.x][y_coord] == Pawn(self.opponent_color):
-            return True
-        return False
+        piece = self.board[self.to_coords.x][y_coord]
+        return isinstance(piece, Pawn) and piece.color == self.opponent_color
 
     def _own_king_in_check(self):
         """Check if move will put/keep current player king in check. Return bool."""
-        cloned_game = deepcopy(self)
-        cloned_game.board[self.from_coords.x][self.from_coords.y] = None
-        cloned_game.board[self.to_coords.x][self.to_coords.y] = self.playing_piece
-
-        king = cloned_game._king(self.playing_color)
-        king_coords = self.to_coords if king == self.playing_piece else king.coords
-
-        return cloned_game._king_in_check(self.playing_color, king_coords)
-
-    def _check_mate(self):
-        king = self._king(self.opponent_color)
-
-        if not self._king_in_check(king.color, king.coords):
-            return False
-        if self._king_can_move_out_of_attack(king.coords):
-            return False
-        if self._can_attack_attacking_piece():
-            return False
-        if self._piece_can_block_attack(king.coords):
+        from_square, to_square = square_index(self.from_coords), square_index(self.to_coords)
+        constraints = self._move_constraints()
+        if from_square == constraints.king_square:
+            return self._king_danger_map(self.playing_color) & (1 << to_square) != 0
+        if self._en_passant_captured_coords(self.playing_piece, self.from_coords, self.to_coords):
+            return not self._move_keeps_king_safe(from_square, to_square)
+        allowed = constraints.evasion_mask & constraints.pin_masks.get(from_square, ALL_SQUARES)
+        return allowed & (1 << to_square) == 0
+
+    def in_check(self):
+        """Return True if player to move is in check."""
+        return self._move_constraints().checkers != 0
+
+    def position_status(self):
+        """Return PositionStatus(check, checkmate, stalemate) for player to move.
+
+           Results are cached in POSITION_STATUS_CACHE by position_hash.
+        """
+        return POSITION_STATUS_CACHE.get_or_compute(self.position_hash, self._compute_position_status)
+
+    def outcome(self):
+        """Return None while game in play, else Color of checkmating player or Color.NONE for stalemate."""
+        status = self.position_status()
+        if status.checkmate:
+            return self.opponent_color
+        if status.stalemate:
+            return Color.NONE
+        return None
+
+    def _compute_position_status(self):
+        constraints = self._move_constraints()
+        check = constraints.checkers != 0
+        has_legal_move = self._has_legal_move(constraints)
+        return PositionStatus(
+            check=check,
+            checkmate=check and not has_legal_move,
+            stalemate=not check and not has_legal_move
+        )
+
+    def _has_legal_move(self, constraints):
+        """Return True on the first legal move found, King moves first as usually quickest."""
+        if self._king_targets(constraints.king_square, constraints.checkers):
+            return True
+        if not constraints.evasion_mask:
             return False
-        return True
-
-    def _king_in_check(self, king_color, king_coords):
-        opponent_color = Color.WHITE if king_color == Color.BLACK else Color.BLACK
-
-        for piece in self._board_pieces(opponent_color):
-            if (piece.legal_capture(king_coords)
-                    and not self._piece_blocking(piece.coords, king_coords)):
+        other_pieces = self.bitboards.occupancy[self.playing_color] & ~(1 << constraints.king_square)
+        for square in squares(other_pieces):
+            if self._legal_targets(square, constraints):
                 return True
         return False
 
-    def _king_can_move_out_of_attack(self, king_coords):
-        for square_coords in self._adjacent_empty_square_coords(king_coords):
-            if not self._king_in_check(self.playing_color, square_coords):
-                return True
-        return False
-
-    def _can_attack_attacking_piece(self):
-        for piece in self._board_pieces(self.opponent_color):
-            if (piece.legal_capture(self.to_coords)
-                    and not self._piece_blocking(piece.coords, self.to_coords)):
-                return True
-        return False
-
-    def _piece_can_block_attack(self, king_coords):
-        pieces = self._board_pieces(self.opponent_color, king_wanted=False)
-        for coords in self.coords_between(self.to_coords, king_coords):
-            for piece in pieces:
-                if (piece.legal_move(coords)
-                        and not self._piece_blocking(piece.coords, coords)):
-                    return True
-        return False
-
-    def _board_pieces(self, color, king_wanted=True):
-        king = None if king_wanted else King(color)
-
-        return [piece for piece in self.current_board_pieces()
-                if piece.color == color and piece != king]
-
-    def _adjacent_empty_square_coords(self, king_coords):
-        potential_coords = [adjacent_coord(king_coords)
-                            for adjacent_coord
-                            in NEXT_ADJACENT_COORD.values()]
-
-        return [coords for coords in potential_coords
-                if self.coords_on_board(coords)
-                and self.board[coords.x][coords.y] is None]
+    def _king_in_check(self, king_color, king_coords):
+        opponent_color = Color.WHITE if king_color == Color.BLACK else Color.BLACK
+        return self.attack_map(opponent_color) & (1 << square_index(king_coords)) != 0
 
     @staticmethod
     def _new_board_setup():
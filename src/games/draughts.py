@@ -1,19 +1,38 @@
 """Contains Draughts class."""
-from itertools import cycle, product
+from collections import namedtuple
+from itertools import cycle
 
 from src.game_enums import Color
-from src.games.game import Game, NEXT_ADJACENT_COORD, TWO_COORD_ERR_MSG
+from src.games.game import Game, TWO_COORD_ERR_MSG
 from src.game_pieces.draughts_counter import Counter
 from src.game_errors import IllegalMoveError
 
 
+# captured is a tuple of (Coords, Counter) for every counter taken by the move
+UndoRecord = namedtuple('UndoRecord', 'from_coords to_coords piece captured position_hash')
+
+
 class Draughts(Game):
-    """Game logic for Draughts."""
+    """Game logic for Draughts.
+
+       The Coords of every piece able to capture are kept per color and only
+       rechecked near squares that changed, so forced capture rules are set
+       lookups rather than board scans.
+
+       Methods:
+            from_fen
+            to_fen
+            must_capture
+            simple_move_count
+            apply_move
+            undo_move
+    """
 
-    MAX_CAPTURE_MOVE_COUNT = 4
     CAPTURE_POSSIBLE = 'Move Illegal as capture is possible'
     ILLEGAL_CAPTURE = 'Illegal capture attempted. No piece to capture or piece blocking move'
     ILLEGAL_MOVE = 'Illegal move attempted'
+    AMBIGUOUS_CAPTURE = 'More than one capture route reaches these coords. Choose a square on one route only'
+    DIAGONALS = ('NE', 'SE', 'SW', 'NW')
 
     def __init__(self, restore_positions=None):
 
@@ -26,100 +45,260 @@ class Draughts(Game):
             'input_err_msg': TWO_COORD_ERR_MSG
         }
 
+        self._capturing_coords = {Color.WHITE: set(), Color.BLACK: set()}
+        self._changed_coords = set()
+
         super().__init__(DRAUGHTS_SETUP, restore_positions)
 
+    @classmethod
+    def from_fen(cls, fen):
+        """Return Draughts game set up from FEN style string, as written by to_fen."""
+        placement, color = fen.split()[:2]
+        game = cls(restore_positions=cls._fen_positions(
+            placement, lambda char, piece_color: Counter(piece_color, crowned=char == 'k')))
+        game.playing_color = Color.WHITE if color == 'w' else Color.BLACK
+        return game
+
+    def to_fen(self):
+        """Return FEN style string for position: m for men, k for crowned counters, then player to move."""
+        placement = self._fen_placement(lambda piece: 'k' if piece.crowned else 'm')
+        return f'{placement} {"w" if self.playing_color == Color.WHITE else "b"}'
+
     def make_move(self):
-        if self.playing_piece.legal_move(self.to_coords) and not self._potential_capture():
+        if self.playing_piece.legal_move(self.from_coords, self.to_coords):
+            if self.must_capture():
+                raise IllegalMoveError(self.CAPTURE_POSSIBLE)
             self._move_piece()
-        elif self.playing_piece.legal_capture(self.to_coords):
-            capture_coords = self._collect_capture_coords()
-            self._capture_pieces(capture_coords)
-            self._force_capture_if_extra_captures_possible()
+        elif self.playing_piece.legal_capture(self.from_coords, self.to_coords):
+            if self.from_coords not in self.must_capture():
+                raise IllegalMoveError(self.ILLEGAL_CAPTURE)
+            capture_route = self._capture_route(self.playing_piece, self.from_coords, self.to_coords)
+            self._capture_pieces(capture_route)
+            # Piece must carry on capturing to the end of the route
+            self.to_coords = capture_route[-1]
             self._move_piece()
         else:
             raise IllegalMoveError(self.ILLEGAL_MOVE)
 
         self.switch_players()
 
+    def legal_moves(self):
+        """Return list of legal (from_coords, to_coords) moves for player to move.
+
+           Captures are compulsory, so only capture moves are returned when any exist.
+           Capture moves end on the last square of a capture route, however long,
+           unless the route needs picking out by an earlier square (see _capture_moves).
+        """
+        capturing_coords = self.must_capture()
+        if capturing_coords:
+            return [move for coords in sorted(capturing_coords)
+                    for move in self._capture_moves(self.board[coords.x][coords.y], coords)]
+        return [move for coords, piece in self.color_positions(self.playing_color)
+                for move in self._simple_moves(piece, coords)]
+
+    def legal_moves_from(self, coords):
+        """Return list of legal (from_coords, to_coords) moves for counter at coords."""
+        piece = self.board[coords.x][coords.y]
+        if piece is None or piece.color != self.playing_color:
+            return []
+        capturing_coords = self.must_capture()
+        if coords in capturing_coords:
+            return self._capture_moves(piece, coords)
+        if capturing_coords:
+            return []
+        return self._simple_moves(piece, coords)
+
+    def must_capture(self, color=None):
+        """Return frozenset of Coords of pieces that must capture for color (default player to move).
+
+           Empty if no capture is possible, in which case any simple move may be played.
+        """
+        if self._changed_coords:
+            self._update_capturing_coords()
+        return frozenset(self._capturing_coords[color or self.playing_color])
+
+    def simple_move_count(self, color):
+        """Return int number of non capturing moves open to color's counters."""
+        return sum(len(self._simple_moves(piece, coords)) for coords, piece in self.color_positions(color))
+
+    def apply_move(self, from_coords, to_coords):
+        """Make legal move in place without error checks and switch players.
+
+           Capture moves take every counter on the capture route, as make_move
+           does, and counters reaching their king row are crowned. Return
+           UndoRecord for undo_move.
+        """
+        position_hash = self.position_hash
+        piece = self.board[from_coords.x][from_coords.y]
+        captured = ()
+        if from_coords in self.must_capture():
+            capture_route = self._capture_route(piece, from_coords, to_coords)
+            captured = self._capture_pieces(capture_route)
+            to_coords = capture_route[-1]
+        self._remove_piece(from_coords)
+        moved_piece = piece.crown() if self._king_row_reached(piece.color, to_coords) else piece
+        self._place_piece(moved_piece, to_coords)
+        self.switch_players()
+        return UndoRecord(from_coords, to_coords, piece, captured, position_hash)
+
+    def undo_move(self, undo_record):
+        """Restore position exactly as it was before apply_move returned undo_record."""
+        self.switch_players()
+        self._remove_piece(undo_record.to_coords)
+        for coords, piece in undo_record.captured:
+            self._place_piece(piece, coords)
+        self._place_piece(undo_record.piece, undo_record.from_coords)
+        self.position_hash = undo_record.position_hash
+
+    def _simple_moves(self, piece, from_coords):
+        moves = []
+        neighbours = self.geometry.neighbours
+        for direction in piece.legal_move_directions():
+            to_coords = neighbours[direction][from_coords]
+            if to_coords and self.board[to_coords.x][to_coords.y] is None:
+                moves.append((from_coords, to_coords))
+        return moves
+
+    def _capture_moves(self, piece, from_coords):
+        """Return list of (from_coords, to_coords) capture moves, one for each capture route.
+
+           to_coords is the last square of the route, unless that picks out
+           another route (see _chosen_route) or is from_coords, as when a crowned
+           counter captures round in a loop. Then to_coords is the first square
+           along the route that picks it out.
+        """
+        routes = self._capture_routes(piece, from_coords)
+        moves = []
+        for route in routes:
+            for to_coords in (route[-1],) + route[1:-1]:
+                if to_coords != from_coords and self._chosen_route(routes, to_coords) == route:
+                    moves.append((from_coords, to_coords))
+                    break
+        return sorted(moves)
+
+    def _capture_routes(self, piece, from_coords):
+        """Return list of every complete capture route for piece at from_coords.
+
+           A route is a tuple of landing Coords starting with from_coords. Routes
+           only end when no further capture is possible. Captured counters stay on
+           the board until the move ends, so can't be jumped twice or landed on.
+           Routes taking the same counters to the same square are only listed once.
+        """
+        routes = {}
+        directions = piece.legal_move_directions()
+        stack = [((from_coords,), frozenset())]
+        while stack:
+            route, captured_coords = stack.pop()
+            route_extended = False
+            for direction in directions:
+                to_coords = self._capture_coords(direction, route[-1], piece.color, vacated_coords=from_coords)
+                capture_coords = self.geometry.neighbours[direction][route[-1]]
+                if to_coords and capture_coords not in captured_coords:
+                    route_extended = True
+                    stack.append((route + (to_coords,), captured_coords | {capture_coords}))
+            if len(route) > 1 and not route_extended:
+                routes.setdefault((route[-1], captured_coords), route)
+        return list(routes.values())
+
+    def _capture_route(self, piece, from_coords, to_coords):
+        """Return capture route for piece at from_coords picked out by to_coords (see _chosen_route)."""
+        routes = self._capture_routes(piece, from_coords)
+        route = self._chosen_route(routes, to_coords)
+        if route is None:
+            if any(to_coords in route[1:] for route in routes):
+                raise IllegalMoveError(self.AMBIGUOUS_CAPTURE)
+            raise IllegalMoveError(self.ILLEGAL_CAPTURE)
+        return route
+
+    @staticmethod
+    def _chosen_route(routes, to_coords):
+        """Return route of routes a capture to to_coords plays, or None if no one route is picked out.
+
+           Of routes ending at to_coords the shortest is played, so a single jump
+           is played as it stands. Failing that, the longest route passing through
+           to_coords is played, the piece carrying on to its end.
+        """
+        ending_routes = sorted((route for route in routes if route[-1] == to_coords), key=len)
+        passing_routes = sorted((route for route in routes if to_coords in route[1:-1]), key=len, reverse=True)
+        candidates = ending_routes or passing_routes
+        if not candidates or (len(candidates) > 1 and len(candidates[0]) == len(candidates[1])):
+            return None
+        return candidates[0]
+
     def _move_piece(self):
         self._move_piece_and_update_coords()
 
-        if self._king_row_reached():
-            self.playing_piece.crowned = True
-
-    def _capture_pieces(self, capture_coords):
-        from_coords, to_coords = capture_coords[:-1], capture_coords[1:]
-        for coords in zip(from_coords, to_coords):
-            self._capture(self.coords_between(*coords))
-
-    def _capture(self, capture_coords):
-        captured_piece_coords = (coords for idx, coords in enumerate(capture_coords) if idx % 2 == 0)
-        for coords in captured_piece_coords:
-            self.board[coords.x][coords.y] = None
-
-    def _capture_move_count(self):
-        if self.playing_piece.crowned:
-            return self.MAX_CAPTURE_MOVE_COUNT
-        return int(abs(self.from_coords.y - self.to_coords.y) / 2)
-
-    def _collect_capture_coords(self):
-        capture_coords = []
-        direction_combinations = product(self.playing_piece.legal_move_directions(),
-                                         repeat=self._capture_move_count())
-        for combination in direction_combinations:
-            coords = self.from_coords
-            for direction in combination:
-                if not coords:
-                    break
-                coords = self._capture_coords(direction, coords)
-                capture_coords.append(coords)
-                if self._move_route_found(capture_coords):
-                    return (self.from_coords, *capture_coords)
-            capture_coords = []
-        raise IllegalMoveError(self.ILLEGAL_CAPTURE)
-
-    def _move_route_found(self, capture_coords):
-        return capture_coords[-1] == self.to_coords
-
-    def _king_row_reached(self):
-        if self.playing_color == Color.WHITE:
-            return self.playing_piece.coords.y == 7
-        return self.playing_piece.coords.y == 0
-
-    def _potential_capture(self):
-        for piece in self._playing_pieces():
-            for direction in piece.legal_move_directions():
-                if self._capture_coords(direction, piece.coords):
-                    raise IllegalMoveError(self.CAPTURE_POSSIBLE)
-        return False
-
-    def _playing_pieces(self):
-        return [piece for piece in self.current_board_pieces()
-                if piece.color == self.playing_color]
-
-    def _force_capture_if_extra_captures_possible(self):
-        from_coords = self.to_coords
-        while from_coords:
-            for direction in self.playing_piece.legal_move_directions():
-                to_coords = self._capture_coords(direction, from_coords)
-                if to_coords:
-                    self._capture(self.coords_between(from_coords, to_coords))
-                    self.to_coords = to_coords
-                    # TODO message to screen?
-            from_coords = to_coords if to_coords else None
-
-    def _capture_coords(self, direction, from_coords):
-        capture_coords = NEXT_ADJACENT_COORD[direction](from_coords)
-        to_coords = NEXT_ADJACENT_COORD[direction](capture_coords)
-
-        for coords in (capture_coords, to_coords):
-            if not self.coords_on_board(coords):
-                return None
+        if self._king_row_reached(self.playing_color, self.to_coords):
+            self._crown(self.to_coords)
+
+    def _crown(self, coords):
+        self.playing_piece = self._remove_piece(coords).crown()
+        self._place_piece(self.playing_piece, coords)
+
+    def _capture_pieces(self, capture_route):
+        """Remove counters jumped along capture_route. Return tuple of (Coords, Counter) removed."""
+        captured = []
+        for from_coords, to_coords in zip(capture_route, capture_route[1:]):
+            for coords in self.coords_between(from_coords, to_coords):
+                captured.append((coords, self._remove_piece(coords)))
+        return tuple(captured)
+
+    @staticmethod
+    def _king_row_reached(color, coords):
+        if color == Color.WHITE:
+            return coords.y == 7
+        return coords.y == 0
+
+    def _place_piece(self, piece, coords):
+        super()._place_piece(piece, coords)
+        self._changed_coords.add(coords)
+
+    def _remove_piece(self, coords):
+        piece = super()._remove_piece(coords)
+        if piece:
+            self._changed_coords.add(coords)
+        return piece
+
+    def _update_capturing_coords(self):
+        """Recheck pieces within two diagonal squares of any changed square.
+
+           Only those pieces can have gained or lost a capture since the last check.
+        """
+        recheck_coords = set(self._changed_coords)
+        rays = self.geometry.rays
+        for coords in self._changed_coords:
+            for direction in self.DIAGONALS:
+                recheck_coords.update(rays[direction][coords][:2])
+        self._changed_coords.clear()
+
+        for coords in recheck_coords:
+            piece = self.board[coords.x][coords.y]
+            for color, capturing_coords in self._capturing_coords.items():
+                if piece and piece.color == color and self._can_capture(piece, coords):
+                    capturing_coords.add(coords)
+                else:
+                    capturing_coords.discard(coords)
+
+    def _can_capture(self, piece, coords):
+        return any(self._capture_coords(direction, coords, piece.color)
+                   for direction in piece.legal_move_directions())
+
+    def _capture_coords(self, direction, from_coords, color, vacated_coords=None):
+        """Return landing Coords for capture by color in direction from from_coords or None.
+
+           vacated_coords: square treated as empty, e.g. start of a capture route.
+        """
+        neighbours = self.geometry.neighbours[direction]
+        capture_coords = neighbours[from_coords]
+        to_coords = capture_coords and neighbours[capture_coords]
+        if not to_coords:
+            return None
 
         capture_square = self.board[capture_coords.x][capture_coords.y]
         move_to_square = self.board[to_coords.x][to_coords.y]
 
-        if capture_square == Counter(self.opponent_color) and move_to_square is None:
+        if (capture_square and capture_square.color != color
+                and (move_to_square is None or to_coords == vacated_coords)):
             return to_coords
         return None
 
@@ -13,6 +13,9 @@ from tabulate import tabulate
 
 from src.game_enums import Color, Direction
 from src.game_errors import IllegalMoveError, NotOnBoardError
+# Coords lives with the board geometry tables and is re-exported here for all games and pieces
+from src.games.geometry import board_geometry, Coords
+from src.games.zobrist import piece_key, SIDE_TO_MOVE_KEY
 
 
 ALPHABET = 'abcdefghijklmnopqrstuvwxyz'
@@ -20,18 +23,31 @@ ONE_COORD_ERR_MSG = 'Invalid coords. Example usage: a1'
 TWO_COORD_ERR_MSG = 'Invalid coords, coords seperated by white space. Example usage: a1 a2'
 
 
-Coords = namedtuple('Coords', 'x y')
 BoardSquare = namedtuple('BoardSquare', 'id image')
 
 
 class Game(ABC):
     """Abstract Base class for game.
 
+       Attributes:
+            geometry:      shared BoardGeometry (interned Coords, neighbour, ray and
+                           between tables) for the board size
+            position_hash: Zobrist hash of pieces and player to move, kept up to
+                           date on every board change. Use as an O(1) position key.
+
+       Pieces are also indexed by color and by (color, name) on every board
+       change, so per color positions, counts and piece lookups (e.g. King
+       location) don't scan the board.
+
        Methods:
             add
             move
             coords_on_board
             coords_between
+            color_positions
+            piece_count
+            piece_coords
+            outcome
             switch_players
             opponenet_color
             x_axis
@@ -43,7 +59,14 @@ class Game(ABC):
 
        Abstract methods:
             make_move
+            legal_moves
+            legal_moves_from
+            apply_move
+            undo_move
             _new_board_setup
+
+       legal_moves, apply_move, undo_move and outcome are all a game agnostic
+       search (e.g. src.engines.mcts) needs to play any game.
     """
     SAME_SQUARE = 'Move to same square illegal'
     NO_PIECE = 'No piece found at from coordinates'
@@ -54,10 +77,16 @@ class Game(ABC):
         self.board = setup['board']
         self.board_width = len(self.board[0])
         self.board_height = len(self.board)
+        self.geometry = board_geometry(len(self.board), len(self.board[0]))
         self.board_colors = setup['board_colors']
         self.legal_piece_names = setup['legal_piece_names']
         self.legal_piece_colors = setup['legal_piece_colors']
         self.input_error_msg = setup['input_err_msg']
+        self.position_hash = 0
+        self._playing_color = Color.WHITE
+        self._color_positions = {color: {} for color in self.legal_piece_colors}
+        # Pieces are interned, so each piece instance stands for its color and kind
+        self._piece_coords = {}
         self._setup_game(restore_positions)
         # Move attributes
         self.playing_color = setup['start_color']
@@ -73,6 +102,16 @@ class Game(ABC):
     def __str__(self):
         return tabulate(self.display_board(), tablefmt="fancy_grid")
 
+    def __getstate__(self):
+        # Geometry tables are shared per board size so aren't pickled with each game
+        state = self.__dict__.copy()
+        del state['geometry']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.geometry = board_geometry(len(self.board), len(self.board[0]))
+
     def __eq__(self, other):
         if other.__class__ is self.__class__:
             return (self.board, self.playing_color) == (other.board, other.playing_color)
@@ -89,6 +128,42 @@ class Game(ABC):
         """
         raise NotImplementedError()
 
+    @abstractmethod
+    def legal_moves(self):
+        """Return list of legal (from_coords, to_coords) move tuples for player to move.
+
+           from_coords is None for games where pieces are placed rather than moved,
+           so every move can be played with game.move(*move).
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    def legal_moves_from(self, coords):
+        """Return list of legal (from_coords, to_coords) move tuples for square at coords."""
+        raise NotImplementedError()
+
+    @abstractmethod
+    def apply_move(self, from_coords, to_coords):
+        """Make legal move in place without error checks and pass turn on. Return undo record.
+
+           Moves are taken from legal_moves, so no validation is done.
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    def undo_move(self, undo_record):
+        """Restore position exactly as it was before apply_move returned undo_record."""
+        raise NotImplementedError()
+
+    def outcome(self):
+        """Return None while game in play, else winning Color or Color.NONE for a draw.
+
+           By default a player left without a legal move has lost.
+        """
+        if self.legal_moves():
+            return None
+        return self.opponent_color
+
     @abstractmethod
     def _new_board_setup(self):
         """Return dictionary of new game default piece start postitions and pieces.
@@ -100,6 +175,46 @@ class Game(ABC):
         """
         raise NotImplementedError()
 
+    def _fen_placement(self, piece_char):
+        """Return board as FEN style placement string, top row (highest y) first.
+
+           piece_char: callable returning lower case letter for a piece. White
+           pieces are written upper case and runs of empty squares as digits.
+        """
+        rows = []
+        for y_idx in reversed(range(self.board_height)):
+            row, empty_squares = '', 0
+            for x_idx in range(self.board_width):
+                piece = self.board[x_idx][y_idx]
+                if piece is None:
+                    empty_squares += 1
+                    continue
+                if empty_squares:
+                    row, empty_squares = row + str(empty_squares), 0
+                char = piece_char(piece)
+                row += char.upper() if piece.color == Color.WHITE else char
+            rows.append(row + (str(empty_squares) if empty_squares else ''))
+        return '/'.join(rows)
+
+    @staticmethod
+    def _fen_positions(placement, char_piece):
+        """Return restore_positions dict for FEN style placement string.
+
+           char_piece: callable taking lower case letter and Color, returning piece.
+        """
+        rows = placement.split('/')
+        positions = {}
+        for y_idx, row in zip(reversed(range(len(rows))), rows):
+            x_idx = 0
+            for char in row:
+                if char.isdigit():
+                    x_idx += int(char)
+                    continue
+                piece_color = Color.WHITE if char.isupper() else Color.BLACK
+                positions[f'{x_idx}{y_idx}'] = char_piece(char.lower(), piece_color)
+                x_idx += 1
+        return positions
+
     def _setup_game(self, restore_positions):
         """Setup board for new or previously stored game."""
         game_positions = self._new_board_setup() if restore_positions is None else restore_positions
@@ -107,7 +222,7 @@ class Game(ABC):
         for coords, piece in game_positions.items():
             assert piece.color in self.legal_piece_colors
             assert piece.name in self.legal_piece_names
-            coords = Coords(x=int(coords[0]), y=int(coords[1]))
+            coords = self.geometry.coords(int(coords[0]), int(coords[1]))
             self.add(piece, coords)
 
     def move(self, from_coords=None, to_coords=None):
@@ -125,10 +240,9 @@ class Game(ABC):
         self._set_current_move_attributes_or_raise_errors(from_coords, to_coords)
         self.make_move()
 
-    @staticmethod
-    def _coords_from(input_coords):
+    def _coords_from(self, input_coords):
         x_coord, y_coord = input_coords
-        return Coords(int(x_coord), int(y_coord))
+        return self.geometry.coords(int(x_coord), int(y_coord))
 
     @classmethod
     def restore(cls, file_name):
@@ -151,18 +265,59 @@ class Game(ABC):
             pickle.dump(self, to_file)
 
     def add(self, piece, coords):
-        """Add piece on board at given coordinates and update piece coordinates.
+        """Add piece on board at given coordinates.
         Args:
                 piece:  Any piece that inherits from GamePiece
                 coords: Namedtuple with coordinates x & y. E.g. Coords(x=0, y=1).
         Raises:
                 NotOnBoardError
         """
-        try:
-            self.board[coords.x][coords.y] = piece
-            piece.coords = coords
-        except IndexError:
+        if not self.coords_on_board(coords):
             raise NotOnBoardError(coords, 'Saved coordinates are not legal coordinates')
+        self._remove_piece(coords)
+        self._place_piece(piece, coords)
+
+    def _place_piece(self, piece, coords):
+        """Put piece on empty square at coords.
+
+           All board writes go through _place_piece/_remove_piece so subclasses
+           can keep any extra position representation in step with the board.
+        """
+        self.board[coords.x][coords.y] = piece
+        self.position_hash ^= piece_key(piece, coords)
+        self._color_positions[piece.color][coords] = piece
+        try:
+            self._piece_coords[piece].add(coords)
+        except KeyError:
+            self._piece_coords[piece] = {coords}
+
+    def _remove_piece(self, coords):
+        """Take piece (if any) off square at coords. Return removed piece or None."""
+        piece = self.board[coords.x][coords.y]
+        self.board[coords.x][coords.y] = None
+        if piece:
+            self.position_hash ^= piece_key(piece, coords)
+            del self._color_positions[piece.color][coords]
+            self._piece_coords[piece].discard(coords)
+        return piece
+
+    def _compute_position_hash(self):
+        """Return position hash calculated from scratch rather than incrementally."""
+        position_hash = SIDE_TO_MOVE_KEY if self.playing_color == Color.BLACK else 0
+        for coords, piece in self.current_board_positions():
+            position_hash ^= piece_key(piece, coords)
+        return position_hash
+
+    @property
+    def playing_color(self):
+        """Color enum type of player to move."""
+        return self._playing_color
+
+    @playing_color.setter
+    def playing_color(self, color):
+        if color != self._playing_color:
+            self.position_hash ^= SIDE_TO_MOVE_KEY
+        self._playing_color = color
 
     def switch_players(self):
         """For games with two game colors. Switch player and opponent colors."""
@@ -174,9 +329,9 @@ class Game(ABC):
         return Color.WHITE if self.playing_color == Color.BLACK else Color.BLACK
 
     def _move_piece_and_update_coords(self):
-        self.board[self.from_coords.x][self.from_coords.y] = None
-        self.board[self.to_coords.x][self.to_coords.y] = self.playing_piece
-        self.playing_piece.coords = self.to_coords
+        self._remove_piece(self.from_coords)
+        self._remove_piece(self.to_coords)
+        self._place_piece(self.playing_piece, self.to_coords)
 
     def current_board_pieces(self):
         """Generator of all pieces currently on game board."""
@@ -185,9 +340,35 @@ class Game(ABC):
                 if piece:
                     yield piece
 
+    def current_board_positions(self):
+        """Generator of (Coords, piece) for all pieces currently on game board."""
+        for x_idx, row in enumerate(self.board):
+            for y_idx, piece in enumerate(row):
+                if piece:
+                    yield self.geometry.coords(x_idx, y_idx), piece
+
+    def color_positions(self, color):
+        """Return view of (Coords, piece) for all pieces of color. Don't change board while iterating."""
+        return self._color_positions[color].items()
+
+    def piece_count(self, color, name=None):
+        """Return int count of pieces of color, optionally only those with piece name e.g. 'Pawn'."""
+        if name is None:
+            return len(self._color_positions[color])
+        return sum(len(coords) for coords in self._kind_coords(color, name))
+
+    def piece_coords(self, color, name):
+        """Return frozenset of Coords of pieces of color with piece name e.g. 'King'."""
+        return frozenset().union(*self._kind_coords(color, name))
+
+    def _kind_coords(self, color, name):
+        # Pieces of one kind may be more than one instance, e.g. crowned and uncrowned Counters
+        return [coords for piece, coords in self._piece_coords.items()
+                if piece.color == color and piece.name == name]
+
     def coords_on_board(self, coords):
         """Check if coordinates within board range (negative indexing not allowed). Return bool."""
-        return coords.x in range(self.board_width) and coords.y in range(self.board_height)
+        return self.geometry.on_board(coords)
 
     def _set_current_move_attributes_or_raise_errors(self, from_coords, to_coords):
         if from_coords:
@@ -210,18 +391,8 @@ class Game(ABC):
             self.to_coords = to_coords
 
     def coords_between(self, from_coords, to_coords):
-        """Return generator of all Coords(x, y) between from_coords and to_coords."""
-        x_coords = self._coords_between(from_coords.x, to_coords.x, abs(from_coords.y - to_coords.y))
-        y_coords = self._coords_between(from_coords.y, to_coords.y, abs(from_coords.x - to_coords.x))
-        return (Coords(x, y) for x, y in zip(x_coords, y_coords))
-
-    @staticmethod
-    def _coords_between(from_coord, to_coord, other_coord_length):
-        if from_coord > to_coord:
-            return reversed(list(range(to_coord + 1, from_coord)))
-        if from_coord == to_coord:
-            return [from_coord] * other_coord_length
-        return list(range(from_coord + 1, to_coord))
+        """Return tuple of all Coords(x, y) on the line between from_coords and to_coords."""
+        return self.geometry.between(from_coords, to_coords)
 
     def x_axis(self):
         """Return list of letters in range a-z for length of board x-axis width"""
@@ -274,14 +445,3 @@ def adjacent_squares(from_coords, to_coords):
         return x_abs + y_abs == 1
     return x_abs + y_abs == 2
 
-
-NEXT_ADJACENT_COORD = {
-    'N': lambda c: Coords(c.x, c.y + 1),
-    'NE': lambda c: Coords(c.x + 1, c.y + 1),
-    'E': lambda c: Coords(c.x + 1, c.y),
-    'SE': lambda c: Coords(c.x + 1, c.y - 1),
-    'S': lambda c: Coords(c.x, c.y - 1),
-    'SW': lambda c: Coords(c.x - 1, c.y - 1),
-    'W': lambda c: Coords(c.x - 1, c.y),
-    'NW': lambda c: Coords(c.x - 1, c.y + 1)
-}
@@ -0,0 +1,96 @@
+"""Board geometry tables shared by all games of the same board size.
+
+   Every square of a board has one interned Coords instance, and neighbour,
+   ray and between-square lookups are precomputed per board size. Inner move
+   generation loops then do table lookups instead of building new Coords.
+
+   Functions:
+        board_geometry: return shared BoardGeometry for board size
+
+   Classes:
+        BoardGeometry: interned Coords and lookup tables for one board size
+"""
+from collections import namedtuple
+from functools import lru_cache
+
+
+Coords = namedtuple('Coords', 'x y')
+
+DIRECTION_STEPS = {
+    'N': (0, 1),
+    'NE': (1, 1),
+    'E': (1, 0),
+    'SE': (1, -1),
+    'S': (0, -1),
+    'SW': (-1, -1),
+    'W': (-1, 0),
+    'NW': (-1, 1)
+}
+
+
+@lru_cache(maxsize=None)
+def board_geometry(width, height):
+    """Return BoardGeometry for board of width x height, built once per size."""
+    return BoardGeometry(width, height)
+
+
+class BoardGeometry():
+    """Interned Coords and precomputed lookup tables for one board size.
+
+       Square index of Coords(x, y) is y * width + x.
+
+       Attributes:
+            width:      number of x coordinates
+            height:     number of y coordinates
+            squares:    tuple of interned Coords by square index
+            neighbours: {direction: {Coords: adjacent Coords or None if off board}}
+            rays:       {direction: {Coords: tuple of Coords to board edge}}
+
+       Methods:
+            coords
+            on_board
+            square_index
+            between
+    """
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.squares = tuple(Coords(x, y) for y in range(height) for x in range(width))
+        self._on_board = frozenset(self.squares)
+        self.neighbours = {direction: {} for direction in DIRECTION_STEPS}
+        self.rays = {direction: {} for direction in DIRECTION_STEPS}
+        self._between = {}
+
+        for direction, (x_step, y_step) in DIRECTION_STEPS.items():
+            for square in self.squares:
+                ray = []
+                x_coord, y_coord = square.x + x_step, square.y + y_step
+                while 0 <= x_coord < width and 0 <= y_coord < height:
+                    ray.append(self.squares[y_coord * width + x_coord])
+                    x_coord, y_coord = x_coord + x_step, y_coord + y_step
+                self.rays[direction][square] = tuple(ray)
+                self.neighbours[direction][square] = ray[0] if ray else None
+                for distance, to_square in enumerate(ray):
+                    self._between[square, to_square] = tuple(ray[:distance])
+
+    def coords(self, x_coord, y_coord):
+        """Return interned Coords for x, y. Off board coordinates return a new Coords."""
+        if 0 <= x_coord < self.width and 0 <= y_coord < self.height:
+            return self.squares[y_coord * self.width + x_coord]
+        return Coords(x_coord, y_coord)
+
+    def on_board(self, coords):
+        """Check if coords within board range (negative indexing not allowed). Return bool."""
+        return coords in self._on_board
+
+    def square_index(self, coords):
+        """Return int square index for coords."""
+        return coords.y * self.width + coords.x
+
+    def between(self, from_coords, to_coords):
+        """Return tuple of Coords strictly between from_coords and to_coords.
+
+           Coords not on a shared horizontal, vertical or diagonal line have nothing between.
+        """
+        return self._between.get((from_coords, to_coords), ())
@@ -1,12 +1,36 @@
 """Contains Othello game class."""
+from collections import namedtuple
+
 from src.game_enums import Color
 from src.game_pieces.othello_disc import Disc
 from src.game_errors import IllegalMoveError
-from src.games.game import Coords, Game, NEXT_ADJACENT_COORD, ONE_COORD_ERR_MSG
+from src.games.bitboard import (ALL_SQUARES, othello_flips, othello_moves, pop_count, shift,
+                                SHIFTS, square_coords, square_index, squares)
+from src.games.game import Game, ONE_COORD_ERR_MSG
+
+
+UndoRecord = namedtuple('UndoRecord', 'to_coords flips playing_color winner position_hash')
 
 
 class Othello(Game):
-    """Game logic for Othello."""
+    """Game logic for Othello.
+
+       Alongside Game.board each color's discs and the empty squares are kept
+       as 64 bit masks, and legal placements and flips are computed from the
+       masks with bit shifts. Each color's legal placements and frontier are
+       cached until the board next changes, so the pass check after a move also
+       answers the next player's legal moves.
+
+       Methods:
+            from_fen
+            to_fen
+            apply_move
+            undo_move
+            outcome
+            disc_count
+            empty_count
+            frontier_count
+    """
 
     ILLEGAL_MOVE = 'Either incorrect coords or move not trapping opponent discs'
 
@@ -21,24 +45,71 @@ class Othello(Game):
             'input_err_msg': ONE_COORD_ERR_MSG
         }
 
+        self.discs = {Color.WHITE: 0, Color.BLACK: 0}
+        self.empty = ALL_SQUARES
+        self._moves = {}
+        self._frontier = {}
+
         super().__init__(OTHELLO_SETUP, restore_positions)
 
+    @classmethod
+    def from_fen(cls, fen):
+        """Return Othello game set up from FEN style string, as written by to_fen."""
+        placement, color = fen.split()[:2]
+        game = cls(restore_positions=cls._fen_positions(placement, lambda char, disc_color: Disc(disc_color)))
+        game.playing_color = Color.WHITE if color == 'w' else Color.BLACK
+        return game
+
+    def to_fen(self):
+        """Return FEN style string for position: d for discs, then player to move."""
+        placement = self._fen_placement(lambda piece: 'd')
+        return f'{placement} {"w" if self.playing_color == Color.WHITE else "b"}'
+
     def make_move(self):
-        for disc in self._trapped_discs(self.to_coords):
-            disc.color = self.playing_color
+        square = square_index(self.to_coords)
+        if not self._moves_mask(self.playing_color) & (1 << square):
+            raise IllegalMoveError(self.ILLEGAL_MOVE)
+        self.apply_move(None, self.to_coords)
+
+    def apply_move(self, from_coords, to_coords):
+        """Place disc at to_coords without error checks, flip trapped discs and pass turn on.
+
+           from_coords is unused, as discs are placed. Return UndoRecord for undo_move.
+        """
+        flips = othello_flips(square_index(to_coords), self.discs[self.playing_color],
+                              self.discs[self.opponent_color])
+        undo_record = UndoRecord(to_coords, flips, self.playing_color, self.winner, self.position_hash)
+
+        for flipped_square in squares(flips):
+            self._flip_disc(square_coords(flipped_square))
 
-        self._place_disc(self.to_coords)
+        self._place_disc(to_coords)
         self._declare_winner_or_switch_players()
+        return undo_record
+
+    def undo_move(self, undo_record):
+        """Restore position exactly as it was before apply_move returned undo_record."""
+        self.winner = undo_record.winner
+        self.playing_color = undo_record.playing_color
+        self._remove_piece(undo_record.to_coords)
+        for flipped_square in squares(undo_record.flips):
+            self._flip_disc(square_coords(flipped_square))
+        self.position_hash = undo_record.position_hash
+
+    def outcome(self):
+        """Return None while game in play, else winning Color or Color.NONE for a draw."""
+        return self.winner
 
     def _declare_winner_or_switch_players(self):
-        if not self._empty_square_coords():
+        """Opponent plays next if they can move, else the same player goes again.
+           Game over when neither player can move.
+        """
+        if not self.empty or not self.discs[self.opponent_color]:
             self.winner = self._winning_color()
-        elif self._next_player_cant_move():
-            self.switch_players()
-            if self._next_player_cant_move():
-                self.winner = self._winning_color()
-        else:
+        elif self._can_move(self.opponent_color):
             self.switch_players()
+        elif not self._can_move(self.playing_color):
+            self.winner = self._winning_color()
 
     def _winning_color(self):
         white_discs = self.disc_count(Color.WHITE)
@@ -51,57 +122,72 @@ class Othello(Game):
         return Color.NONE
 
     def _place_disc(self, to_coords):
-        disc = Disc(self.playing_color)
-        self.board[to_coords.x][to_coords.y] = disc
-        disc.coords = to_coords
-
-    def _trapped_discs(self, to_coords):
-        trapped_discs = self._scan_board_for_trapped_discs(to_coords)
-
-        if not trapped_discs:
-            raise IllegalMoveError(self.ILLEGAL_MOVE)
-
-        return trapped_discs
-
-    def _next_player_cant_move(self):
-        empty_square_coords = self._empty_square_coords()
-
-        for square_coords in empty_square_coords:
-            trapped_discs = self._scan_board_for_trapped_discs(square_coords)
-            if trapped_discs:
-                return False
-        return True
-
-    def _scan_board_for_trapped_discs(self, passed_coords):
-        trapped_discs = []
-        for direction in 'N NE E SE S SW W NW'.split():
-            next_coords = passed_coords
-            possible_trapped_discs = []
-            while True:
-                next_coords = NEXT_ADJACENT_COORD[direction](next_coords)
-                if not self.coords_on_board(next_coords):
-                    break
-                disc = self.board[next_coords.x][next_coords.y]
-                if not disc:
-                    break
-                elif disc.color == self.opponent_color:
-                    possible_trapped_discs.append(disc)
-                else:
-                    trapped_discs.extend(possible_trapped_discs)
-        return trapped_discs
-
-    def _empty_square_coords(self):
-        empty_square_coords = []
-        for x_idx, row in enumerate(self.board):
-            for y_idx, disc in enumerate(row):
-                if not disc:
-                    empty_square_coords.append(Coords(x_idx, y_idx))
-        return empty_square_coords
+        self._place_piece(Disc(self.playing_color), to_coords)
+
+    def _flip_disc(self, coords):
+        disc = self._remove_piece(coords)
+        self._place_piece(disc.flip(), coords)
+
+    def _place_piece(self, piece, coords):
+        super()._place_piece(piece, coords)
+        square_bit = 1 << square_index(coords)
+        self.discs[piece.color] |= square_bit
+        self.empty &= ~square_bit
+        self._moves.clear()
+        self._frontier.clear()
+
+    def _remove_piece(self, coords):
+        disc = super()._remove_piece(coords)
+        if disc:
+            square_bit = 1 << square_index(coords)
+            self.discs[disc.color] &= ~square_bit
+            self.empty |= square_bit
+            self._moves.clear()
+            self._frontier.clear()
+        return disc
+
+    def _moves_mask(self, color):
+        """Return mask of legal placements for color, cached until the board changes."""
+        moves = self._moves.get(color)
+        if moves is None:
+            opponent_color = Color.WHITE if color == Color.BLACK else Color.BLACK
+            moves = self._moves[color] = othello_moves(self.discs[color], self.discs[opponent_color])
+        return moves
+
+    def _frontier_mask(self, color):
+        """Return mask of color discs next to an empty square, cached until the board changes."""
+        frontier = self._frontier.get(color)
+        if frontier is None:
+            next_to_empty = 0
+            for direction in SHIFTS:
+                next_to_empty |= shift(self.empty, direction)
+            frontier = self._frontier[color] = self.discs[color] & next_to_empty
+        return frontier
+
+    def _can_move(self, color):
+        return self._moves_mask(color) != 0
+
+    def legal_moves(self):
+        """Return list of legal (None, to_coords) disc placements for player to move."""
+        return [(None, square_coords(square)) for square in squares(self._moves_mask(self.playing_color))]
+
+    def legal_moves_from(self, coords):
+        """Return [(None, coords)] if disc placement at coords legal, else empty list."""
+        if self._moves_mask(self.playing_color) & (1 << square_index(coords)):
+            return [(None, coords)]
+        return []
 
     def disc_count(self, wanted_color):
         """Return int count of discs for given Disc color."""
-        return len([disc for disc in self.current_board_pieces()
-                    if disc.color == wanted_color])
+        return pop_count(self.discs[wanted_color])
+
+    def empty_count(self):
+        """Return int count of empty squares."""
+        return pop_count(self.empty)
+
+    def frontier_count(self, wanted_color):
+        """Return int count of discs of given color next to at least one empty square."""
+        return pop_count(self._frontier_mask(wanted_color))
 
     @staticmethod
     def _new_board_setup():
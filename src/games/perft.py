@@ -0,0 +1,106 @@
+"""Perft (performance test) for the Chess move pipeline.
+
+   Perft counts the leaf nodes of the legal move tree to a fixed depth.
+   Counts for the reference positions are well known, so matching them
+   shows legal move generation, check detection, castling and en passant
+   are intact, and the time taken gives nodes per second throughput.
+
+   Reference counts are only given to depths without pawn promotions, as
+   this project always promotes to Queen while the published counts also
+   include under promotions.
+
+   Functions:
+        perft:         return int leaf node count to depth
+        divide:        return dict of leaf node count per root move
+        run_benchmark: return list of PerftResult for reference positions
+
+   Usage: python -m src.games.perft [MAX_DEPTH]
+"""
+from collections import namedtuple
+import sys
+import time
+
+from src.games.chess import Chess
+
+
+PerftPosition = namedtuple('PerftPosition', 'name fen node_counts')
+PerftResult = namedtuple('PerftResult', 'name depth nodes expected_nodes seconds nodes_per_second')
+
+REFERENCE_POSITIONS = (
+    PerftPosition(
+        name='Start position',
+        fen='rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1',
+        node_counts=(20, 400, 8902, 197281, 4865609)
+    ),
+    PerftPosition(
+        name='Kiwipete',
+        fen='r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1',
+        node_counts=(48, 2039, 97862)
+    ),
+    PerftPosition(
+        name='Rook endgame',
+        fen='8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1',
+        node_counts=(14, 191, 2812, 43238, 674624)
+    ),
+    PerftPosition(
+        name='Middlegame',
+        fen='r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10',
+        node_counts=(46, 2079, 89890)
+    ),
+)
+
+
+def perft(game, depth):
+    """Return count of leaf nodes of legal move tree to depth from game position."""
+    moves = game.legal_moves()
+    if depth == 1:
+        return len(moves)
+
+    nodes = 0
+    for move in moves:
+        undo_record = game.apply_move(*move)
+        nodes += perft(game, depth - 1)
+        game.undo_move(undo_record)
+    return nodes
+
+
+def divide(game, depth):
+    """Return dict of {(from_coords, to_coords): leaf node count} for each root move.
+
+       Comparing divide output with another engine locates the move that breaks a count.
+    """
+    counts = {}
+    for move in game.legal_moves():
+        undo_record = game.apply_move(*move)
+        counts[move] = perft(game, depth - 1) if depth > 1 else 1
+        game.undo_move(undo_record)
+    return counts
+
+
+def run_benchmark(max_depth, positions=REFERENCE_POSITIONS):
+    """Run perft on positions up to max_depth. Return list of PerftResult."""
+    results = []
+    for position in positions:
+        for depth, expected_nodes in enumerate(position.node_counts[:max_depth], start=1):
+            game = Chess.from_fen(position.fen)
+            start = time.perf_counter()
+            nodes = perft(game, depth)
+            seconds = time.perf_counter() - start
+            results.append(PerftResult(position.name, depth, nodes, expected_nodes, seconds,
+                                       nodes / seconds if seconds else 0))
+    return results
+
+
+def _print_benchmark(max_depth):
+    failures = 0
+    for result in run_benchmark(max_depth):
+        status = 'ok' if result.nodes == result.expected_nodes else 'FAIL'
+        failures += status == 'FAIL'
+        print(f'{result.name:<16} depth {result.depth}  nodes {result.nodes:>9}  '
+              f'expected {result.expected_nodes:>9}  {result.seconds:8.3f}s  '
+              f'{result.nodes_per_second:>9.0f} nps  {status}')
+    return failures
+
+
+if __name__ == '__main__':
+    sys.exit(1 if _print_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 3) else 0)
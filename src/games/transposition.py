@@ -0,0 +1,81 @@
+"""Contains TranspositionTable class, a bounded LRU cache keyed by position hash."""
+from collections import namedtuple, OrderedDict
+from threading import Lock
+
+
+CacheStats = namedtuple('CacheStats', 'entries max_entries hits misses evictions')
+
+# Rough CPython cost of one entry: OrderedDict slot and link, int key and small tuple value
+ENTRY_BYTES = 200
+
+
+class TranspositionTable():
+    """Thread safe least recently used cache of position_hash -> value.
+
+       Size is bounded by max_entries and/or max_bytes (converted to entries
+       using ENTRY_BYTES); the tighter limit wins. Oldest entries are evicted first.
+
+       Methods:
+            get
+            put
+            get_or_compute
+            clear
+            stats
+    """
+
+    def __init__(self, max_entries=None, max_bytes=None):
+        limits = [limit for limit in (max_entries, max_bytes and max_bytes // ENTRY_BYTES)
+                  if limit is not None]
+        if not limits:
+            raise ValueError('TranspositionTable needs max_entries or max_bytes')
+        self.max_entries = max(min(limits), 1)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, position_hash):
+        return position_hash in self._entries
+
+    def get(self, position_hash, default=None):
+        """Return cached value for position_hash (marking it recently used) or default."""
+        with self._lock:
+            try:
+                value = self._entries[position_hash]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(position_hash)
+            self.hits += 1
+            return value
+
+    def put(self, position_hash, value):
+        """Store value for position_hash, evicting least recently used entries if full."""
+        with self._lock:
+            self._entries[position_hash] = value
+            self._entries.move_to_end(position_hash)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_compute(self, position_hash, compute):
+        """Return cached value for position_hash, calling compute() and storing result on a miss."""
+        value = self.get(position_hash)
+        if value is None:
+            value = compute()
+            self.put(position_hash, value)
+        return value
+
+    def clear(self):
+        """Remove all entries and reset counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        """Return CacheStats snapshot for sizing the cache."""
+        return CacheStats(len(self._entries), self.max_entries, self.hits, self.misses, self.evictions)
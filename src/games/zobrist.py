@@ -0,0 +1,36 @@
+"""Zobrist hashing keys for game positions.
+
+   A position hash is the XOR of one key per (piece, square) plus keys for
+   extra state such as side to move. Keys are derived from a hash of their
+   parts rather than a random table, so they are identical in every process
+   and exist for any board size.
+
+   Functions:
+        zobrist_key: return deterministic 64 bit key for parts
+        piece_key:   return key for piece on square at coords
+"""
+from functools import lru_cache
+from hashlib import blake2b
+
+
+@lru_cache(maxsize=None)
+def zobrist_key(*parts):
+    """Return deterministic 64 bit int key for hashable str/int parts."""
+    digest = blake2b(repr(parts).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, 'little')
+
+
+_PIECE_KEYS = {}
+
+
+def piece_key(piece, coords):
+    """Return Zobrist key for piece on square at coords."""
+    try:
+        return _PIECE_KEYS[piece, coords]
+    except KeyError:
+        key = zobrist_key(piece.name, piece.color.value, getattr(piece, 'crowned', False), coords.x, coords.y)
+        _PIECE_KEYS[piece, coords] = key
+        return key
+
+
+SIDE_TO_MOVE_KEY = zobrist_key('black to move')
@@ -32,6 +32,30 @@ async function tryMove(event_id) {
   }
 }
 
+async function computerMove(method='search') {
+  try {
+    const ponder = document.getElementById('ponder').checked ? 1 : 0
+    const submitResponse = await fetch(`computer_move/submit?method=${method}&ponder=${ponder}`)
+    const submitData = await submitResponse.json()
+    if (submitData.err) {
+      makeMove(submitData)
+      return
+    }
+
+    // Search runs in the background, poll (waiting up to a second each time) until it finishes
+    let jsonData = {job: 'queued'}
+    while (jsonData.job === 'queued' || jsonData.job === 'running') {
+      const response = await fetch(`computer_move/${submitData.job_id}?wait=1`)
+      jsonData = await response.json()
+    }
+
+    makeMove(jsonData)
+
+  } catch(e) {
+    throw Error(e);
+  }
+}
+
 function makeMove(gameData) {
   const gameError = document.getElementById('game-error')
   const gameWinner = document.getElementById('game-winner')
@@ -40,6 +64,9 @@ function makeMove(gameData) {
 
   if (gameData.err) {
     gameError.innerText = gameData.err
+  } else if (gameData.draw) {
+    gameWinner.innerText = 'Draw!!! Refresh to play again.'
+    updateBoard(gameData.board, gameEnd=true)
   } else if (gameData.winner) {
     gameWinner.innerText = `${gameData.winner} wins!!! Refresh to play again.`
     updateBoard(gameData.board, gameEnd=true)
@@ -6,11 +6,13 @@ from src.games.game import Coords
 from src.game_pieces.bishop import Bishop
 
 
+FROM_COORDS = Coords(x=7, y=4)
+
+
 @pytest.fixture(scope='module')
 def bishop():
-    """Setup Bishop start coords. Return Bishop"""
+    """Return Bishop. Moves are tested from FROM_COORDS"""
     game_bishop = Bishop(Color.BLACK)
-    game_bishop.coords = Coords(x=7, y=4)
     return game_bishop
 
 
@@ -23,9 +25,9 @@ test_data = [
 
 @pytest.mark.parametrize('coords, rt_val', test_data)
 def test_bishop_legal_move(bishop, coords, rt_val):
-    assert bishop.legal_move(coords) == rt_val
+    assert bishop.legal_move(FROM_COORDS, coords) == rt_val
 
 
 @pytest.mark.parametrize('coords, rt_val', test_data)
 def test_bishop_legal_capture(bishop, coords, rt_val):
-    assert bishop.legal_capture(coords) == rt_val
+    assert bishop.legal_capture(FROM_COORDS, coords) == rt_val
@@ -0,0 +1,122 @@
+"""Test module for bitboard tables and ChessBitboards."""
+import pytest
+
+from src.game_enums import Color
+from src.games.bitboard import (BETWEEN, bishop_attacks, ChessBitboards, KING_ATTACKS,
+                                KNIGHT_ATTACKS, othello_flips, othello_moves, pop_count,
+                                rook_attacks, shift, square_coords, square_index, squares)
+from src.games.game import Coords
+from src.game_pieces.knight import Knight
+from src.game_pieces.pawn import Pawn
+from src.game_pieces.rook import Rook
+
+
+def mask(*coords):
+    return sum(1 << square_index(coord) for coord in coords)
+
+
+def test_square_index_round_trip():
+    for square in range(64):
+        assert square_index(square_coords(square)) == square
+    assert square_index(Coords(x=7, y=0)) == 7
+    assert square_index(Coords(x=0, y=7)) == 56
+
+
+def test_squares_yields_set_bits_lowest_first():
+    assert list(squares(mask(Coords(x=3, y=3), Coords(x=0, y=0), Coords(x=7, y=7)))) == [0, 27, 63]
+
+
+def test_corner_step_tables():
+    assert KING_ATTACKS[0] == mask(Coords(x=1, y=0), Coords(x=0, y=1), Coords(x=1, y=1))
+    assert KNIGHT_ATTACKS[0] == mask(Coords(x=1, y=2), Coords(x=2, y=1))
+
+
+@pytest.mark.parametrize('from_coords, to_coords, between', [
+    (Coords(x=0, y=0), Coords(x=3, y=3), (Coords(x=1, y=1), Coords(x=2, y=2))),
+    (Coords(x=3, y=3), Coords(x=0, y=0), (Coords(x=1, y=1), Coords(x=2, y=2))),
+    (Coords(x=4, y=0), Coords(x=4, y=3), (Coords(x=4, y=1), Coords(x=4, y=2))),
+    (Coords(x=6, y=2), Coords(x=2, y=2), (Coords(x=5, y=2), Coords(x=4, y=2), Coords(x=3, y=2))),
+    (Coords(x=4, y=4), Coords(x=4, y=5), ()),   # Adjacent
+    (Coords(x=3, y=3), Coords(x=4, y=5), ())    # Non linear
+])
+def test_between_table(from_coords, to_coords, between):
+    assert BETWEEN[square_index(from_coords)][square_index(to_coords)] == mask(*between)
+
+
+def test_slider_attacks_stop_at_first_blocker():
+    occupied = mask(Coords(x=3, y=5), Coords(x=5, y=3))
+    rook = square_index(Coords(x=3, y=3))
+    attacks = rook_attacks(rook, occupied)
+    assert attacks & mask(Coords(x=3, y=5))        # Blocker itself attacked
+    assert not attacks & mask(Coords(x=3, y=6))    # Squares behind blocker not attacked
+    assert attacks & mask(Coords(x=3, y=0), Coords(x=0, y=3)) == mask(Coords(x=3, y=0), Coords(x=0, y=3))
+
+    bishop = square_index(Coords(x=3, y=1))
+    assert bishop_attacks(bishop, occupied) & mask(Coords(x=5, y=3))
+    assert not bishop_attacks(bishop, occupied) & mask(Coords(x=6, y=4))
+
+
+def test_place_and_remove_update_masks():
+    bitboards = ChessBitboards()
+    square = square_index(Coords(x=2, y=2))
+    bitboards.place(Rook(Color.WHITE), square)
+    assert bitboards.pieces[Color.WHITE]['Rook'] == 1 << square
+    assert bitboards.occupancy[Color.WHITE] == bitboards.occupied == 1 << square
+
+    bitboards.remove(Rook(Color.WHITE), square)
+    assert bitboards.pieces[Color.WHITE]['Rook'] == bitboards.occupied == 0
+
+
+def test_attackers_returns_all_attacking_pieces():
+    bitboards = ChessBitboards()
+    target = square_index(Coords(x=4, y=4))
+    bitboards.place(Rook(Color.BLACK), square_index(Coords(x=4, y=0)))
+    bitboards.place(Knight(Color.BLACK), square_index(Coords(x=3, y=2)))
+    bitboards.place(Pawn(Color.BLACK), square_index(Coords(x=5, y=5)))
+    bitboards.place(Pawn(Color.WHITE), square_index(Coords(x=3, y=3)))
+
+    assert bitboards.attackers(target, Color.BLACK) == mask(Coords(x=4, y=0), Coords(x=3, y=2),
+                                                            Coords(x=5, y=5))
+    assert bitboards.attackers(target, Color.WHITE) == mask(Coords(x=3, y=3))
+
+
+def test_attacks_returns_every_attacked_square():
+    bitboards = ChessBitboards()
+    bitboards.place(Rook(Color.WHITE), square_index(Coords(x=0, y=0)))
+    bitboards.place(Pawn(Color.WHITE), square_index(Coords(x=0, y=2)))
+    bitboards.place(Knight(Color.BLACK), square_index(Coords(x=7, y=7)))
+
+    # Rook blocked by own Pawn on a3, Pawn attacks b4 only
+    assert bitboards.attacks(Color.WHITE) == (mask(Coords(x=0, y=1), Coords(x=0, y=2), Coords(x=1, y=3))
+                                              | mask(*(Coords(x=x_idx, y=0) for x_idx in range(1, 8))))
+    assert bitboards.attacks(Color.BLACK) == mask(Coords(x=6, y=5), Coords(x=5, y=6))
+
+
+def test_shift_drops_bits_leaving_board():
+    assert shift(mask(Coords(x=3, y=3)), 'NE') == mask(Coords(x=4, y=4))
+    assert shift(mask(Coords(x=7, y=3)), 'E') == 0
+    assert shift(mask(Coords(x=0, y=3)), 'SW') == 0
+    assert shift(mask(Coords(x=3, y=7)), 'N') == 0
+
+
+def test_othello_moves_for_start_position():
+    black = mask(Coords(x=3, y=3), Coords(x=4, y=4))
+    white = mask(Coords(x=3, y=4), Coords(x=4, y=3))
+    assert othello_moves(black, white) == mask(Coords(x=2, y=4), Coords(x=3, y=5),
+                                               Coords(x=4, y=2), Coords(x=5, y=3))
+
+
+def test_othello_flips_only_trapped_runs():
+    own = mask(Coords(x=0, y=0), Coords(x=3, y=3))
+    opponent = mask(Coords(x=1, y=1), Coords(x=2, y=2), Coords(x=4, y=3), Coords(x=3, y=4))
+    # Placing at 3,0 flips nothing (no own disc beyond), at 5,3 flips 4,3
+    assert othello_flips(square_index(Coords(x=3, y=0)), own, opponent) == 0
+    assert othello_flips(square_index(Coords(x=5, y=3)), own, opponent) == mask(Coords(x=4, y=3))
+    own_far = mask(Coords(x=3, y=3))
+    assert othello_flips(square_index(Coords(x=0, y=0)), own_far, opponent) == mask(Coords(x=1, y=1),
+                                                                                 Coords(x=2, y=2))
+
+
+def test_pop_count():
+    assert pop_count(0) == 0
+    assert pop_count(mask(Coords(x=0, y=0), Coords(x=7, y=7))) == 2
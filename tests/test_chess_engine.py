@@ -0,0 +1,73 @@
+"""Test module for Chess alpha-beta search engine."""
+import pytest
+
+from src.engines import best_move, chess_engine, SearchBudget
+from src.engines.chess_engine import evaluate, MATE_THRESHOLD
+from src.games.chess import Chess
+from src.games.game import Coords
+from src.games.transposition import TranspositionTable
+
+
+def test_evaluate_new_game_is_level():
+    assert evaluate(Chess()) == 0
+
+
+def test_evaluate_is_from_point_of_view_of_player_to_move():
+    game = Chess.from_fen('4k3/8/8/8/8/8/8/3QK3 w - - 0 1')
+    assert evaluate(game) > 0
+    game.playing_color = game.opponent_color
+    assert evaluate(game) < 0
+
+
+def test_finds_mate_in_one():
+    # Scholar's mate, Queen takes f7
+    game = Chess.from_fen('r1bqkbnr/pppp1ppp/2n5/4p3/2B1P3/5Q2/PPPP1PPP/RNB1K1NR w KQkq - 0 1')
+    result = best_move(game, SearchBudget(seconds=None, depth=3))
+    assert result.move == (Coords(x=5, y=2), Coords(x=5, y=6))
+    assert result.score > MATE_THRESHOLD
+
+
+def test_captures_undefended_queen():
+    game = Chess.from_fen('4k3/8/8/3q4/8/8/3R4/4K3 w - - 0 1')
+    result = best_move(game, SearchBudget(seconds=None, depth=2))
+    assert result.move == (Coords(x=3, y=1), Coords(x=3, y=4))
+
+
+def test_search_leaves_game_unchanged():
+    game = Chess()
+    position_hash = game.position_hash
+    best_move(game, SearchBudget(seconds=None, depth=2))
+    assert game.position_hash == position_hash
+    assert game == Chess()
+
+
+@pytest.mark.parametrize('budget', [
+    SearchBudget(seconds=None, nodes=500),
+    SearchBudget(seconds=0.2),
+])
+def test_search_respects_budget_and_reports_statistics(budget):
+    result = best_move(Chess(), budget)
+    assert result.move in Chess().legal_moves()
+    assert result.depth >= 1
+    if budget.nodes:
+        assert result.nodes <= budget.nodes
+    else:
+        assert result.seconds < budget.seconds + 0.1
+    assert result.nodes_per_second > 0
+
+
+def test_no_move_returned_when_game_over():
+    game = Chess.from_fen('7k/6Q1/6K1/8/8/8/8/8 b - - 0 1')
+    result = best_move(game, SearchBudget(seconds=None, depth=2))
+    assert result.move is None
+
+
+def test_best_move_raises_error_for_game_without_engine():
+    with pytest.raises(ValueError):
+        best_move(object())
+
+
+def test_search_table_can_be_passed_in():
+    table = TranspositionTable(max_entries=1000)
+    chess_engine.best_move(Chess(), SearchBudget(seconds=None, depth=2), table=table)
+    assert len(table) > 0
@@ -1,7 +1,11 @@
 """Test module form Chess class."""
+from copy import deepcopy
+
 import pytest
 
 from src.game_enums import Color
+from src.games.bitboard import square_index
+from src.games.chess import Chess
 from src.games.game import Coords
 from src.game_errors import IllegalMoveError
 
@@ -83,11 +87,9 @@ def test_piece_moved_on_board(game):
     game.move(Coords(x=0, y=1), Coords(x=0, y=2))
     # Start position now empty
     assert game.board[0][1] is None
-    # Move_to postion now_ occupied and piece coordinates updated
+    # Move_to postion now_ occupied
     piece = game.board[0][2]
     assert piece == Pawn(Color.WHITE)
-    assert piece.coords.x == 0
-    assert piece.coords.y == 2
 
 
 def test_captured_piece_removed_from_board(game):
@@ -215,28 +217,6 @@ def test_no_piece_blocking_returns_false(game):
     assert not game._piece_blocking(from_coords, to_coords)
 
 
-def test_correct_adjacent_coords_returned(game):
-    adjacent_coords = game._adjacent_empty_square_coords(Coords(x=4, y=4))
-
-    wanted_coords = [Coords(x=4, y=5), Coords(x=5, y=5), Coords(x=5, y=4), Coords(x=5, y=3),
-                     Coords(x=4, y=3), Coords(x=3, y=3), Coords(x=3, y=4), Coords(x=3, y=5)]
-
-    assert adjacent_coords == wanted_coords
-
-
-def test_adjacent_coords_does_not_return_coords_not_on_board(game):
-    king = game.board[0][0]
-    adjacent_coords = game._adjacent_empty_square_coords(king.coords)
-    assert adjacent_coords == [Coords(x=0, y=1), Coords(x=1, y=1), Coords(x=1, y=0)]
-
-
-def test_adjacent_coords_does_not_return_non_empty_coords(game):
-    king = game.board[0][0]
-    game.add(Pawn(Color.WHITE), Coords(x=0, y=1))
-    adjacent_coords = game._adjacent_empty_square_coords(king.coords)
-    assert adjacent_coords == [Coords(x=1, y=1), Coords(x=1, y=0)]
-
-
 @pytest.mark.parametrize('king, coords, opponent_piece, result', [
     (King(Color.WHITE), Coords(x=4, y=4), Bishop(Color.BLACK), True),
     (King(Color.WHITE), Coords(x=5, y=5), Queen(Color.BLACK), True),
@@ -260,7 +240,7 @@ def test_king_in_check_returns_correct_result(game, king, coords, opponent_piece
     game.add(king, Coords(x=2, y=2))
     game.add(opponent_piece, coords)
     game.playing_color = opponent_piece.color
-    assert game._king_in_check(king.color, king.coords) == result
+    assert game._king_in_check(king.color, Coords(x=2, y=2)) == result
 
 
 def test_own_piece_blocks_king_being_in_check(game):
@@ -270,21 +250,21 @@ def test_own_piece_blocks_king_being_in_check(game):
     game.add(king, Coords(x=2, y=2))
     game.add(blocking_piece, Coords(x=3, y=3))
     game.add(opponent_piece, Coords(x=6, y=6))
-    assert not game._king_in_check(king.color, king.coords)
+    assert not game._king_in_check(king.color, Coords(x=2, y=2))
 
 
 def test_king_moved_is_recorded(castle_game):
-    king = castle_game.board[4][0]
-    assert not king.moved
+    assert Coords(x=4, y=0) in castle_game.unmoved_coords
     castle_game.move(Coords(x=4, y=0), Coords(x=4, y=1))
-    assert king.moved
+    assert Coords(x=4, y=0) not in castle_game.unmoved_coords
+    assert Coords(x=4, y=1) not in castle_game.unmoved_coords
 
 
 def test_rook_moved_is_recorded(castle_game):
-    rook = castle_game.board[0][0]
-    assert not rook.moved
+    assert Coords(x=0, y=0) in castle_game.unmoved_coords
     castle_game.move(Coords(x=0, y=0), Coords(x=0, y=1))
-    assert rook.moved
+    assert Coords(x=0, y=0) not in castle_game.unmoved_coords
+    assert Coords(x=0, y=1) not in castle_game.unmoved_coords
 
 
 @pytest.mark.castle_tests
@@ -319,16 +299,14 @@ def test_black_king_can_castle_queen_side(castle_game):
 
 @pytest.mark.castle_tests
 def test_cant_castle_if_king_already_moved(castle_game):
-    king = castle_game.board[4][0]
-    king.moved = True
+    castle_game.unmoved_coords.discard(Coords(x=4, y=0))
     with pytest.raises(IllegalMoveError, match=castle_game.ILLEGAL_CASTLE):
         castle_game.move(Coords(x=4, y=0), Coords(x=6, y=0))
 
 
 @pytest.mark.castle_tests
 def test_cant_castle_if_rook_already_moved(castle_game):
-    rook = castle_game.board[7][0]
-    rook.moved = True
+    castle_game.unmoved_coords.discard(Coords(x=7, y=0))
     with pytest.raises(IllegalMoveError, match=castle_game.ILLEGAL_CASTLE):
         castle_game.move(Coords(x=4, y=0), Coords(x=6, y=0))
 
@@ -416,7 +394,7 @@ def test_checkmate_results_in_game_ending(new_game):
     # Queen to put king in check mate
     game.move(Coords(x=3, y=7), Coords(x=7, y=3))
     # assert game.check_mate
-    assert game.winner == Color.BLACK.value
+    assert game.winner == Color.BLACK
 
 
 @pytest.mark.no_check_mate
@@ -489,3 +467,214 @@ def test_king_can_escape_out_of_check_mate(game):
     game.move(Coords(x=1, y=4), Coords(x=1, y=0))
     # King can't attack Rook as Bishop is protecting but can escape
     assert not game.winner
+
+
+def test_scholars_mate_results_in_game_ending(new_game):
+    game = new_game
+    game.move(Coords(x=4, y=1), Coords(x=4, y=3))
+    game.move(Coords(x=4, y=6), Coords(x=4, y=4))
+    game.move(Coords(x=5, y=0), Coords(x=2, y=3))
+    game.move(Coords(x=1, y=7), Coords(x=2, y=5))
+    game.move(Coords(x=3, y=0), Coords(x=7, y=4))
+    game.move(Coords(x=6, y=7), Coords(x=5, y=5))
+    assert not game.winner
+    # Queen takes f7, protected by Bishop so King can't capture
+    game.move(Coords(x=7, y=4), Coords(x=5, y=6))
+    assert game.winner == Color.WHITE
+
+
+def test_double_check_can_only_be_escaped_by_king_move(game):
+    game.add(Pawn(Color.WHITE), Coords(x=0, y=1))
+    game.add(Pawn(Color.WHITE), Coords(x=1, y=1))
+    # White Queen could capture the Knight but not both checking pieces
+    game.add(Queen(Color.WHITE), Coords(x=2, y=6))
+    game.add(Rook(Color.BLACK), Coords(x=7, y=0))
+    game.add(Knight(Color.BLACK), Coords(x=4, y=0))
+    game.playing_color = Color.BLACK
+    # Knight gives check and uncovers Rook check
+    game.move(Coords(x=4, y=0), Coords(x=2, y=1))
+    assert game.winner == Color.BLACK
+
+
+def test_pinned_piece_cannot_block_check_mate():
+    game = Chess.from_fen('7k/6b1/8/7r/2nR4/8/P7/K7 b - - 0 1')
+    # White Rook could block on d1 but is pinned to the King by the Bishop
+    game.move(Coords(x=7, y=4), Coords(x=7, y=0))
+    assert game.winner == Color.BLACK
+
+
+def test_stalemate_ends_game_without_winner():
+    game = Chess.from_fen('7k/8/6K1/8/8/8/8/5Q2 w - - 0 1')
+    game.move(Coords(x=5, y=0), Coords(x=5, y=6))
+    assert game.position_status().stalemate
+    assert game.winner == Color.NONE
+
+
+def test_en_passant_capture_of_checking_pawn_is_legal():
+    game = Chess.from_fen('7k/3p4/8/4P3/4K3/8/8/8 b - - 0 1')
+    game.move(Coords(x=3, y=6), Coords(x=3, y=4))
+    assert game.position_status().check
+    assert (Coords(x=4, y=4), Coords(x=3, y=5)) in game.legal_moves()
+
+
+def test_en_passant_exposing_king_along_rank_is_illegal():
+    game = Chess.from_fen('7k/2p5/8/KP5r/8/8/8/8 b - - 0 1')
+    game.move(Coords(x=2, y=6), Coords(x=2, y=4))
+    assert (Coords(x=1, y=4), Coords(x=2, y=5)) not in game.legal_moves()
+    with pytest.raises(IllegalMoveError, match=game.KING_IN_CHECK):
+        game.move(Coords(x=1, y=4), Coords(x=2, y=5))
+
+
+def position_snapshot(game):
+    """Return everything apply_move may change, for exact undo comparison."""
+    return ([list(row) for row in game.board], set(game.unmoved_coords), game.bitboards.pieces,
+            dict(game.bitboards.occupancy), game.bitboards.occupied,
+            game.last_move_pawn_coords, game.playing_color, game.position_hash,
+            {color: dict(game.color_positions(color)) for color in (Color.WHITE, Color.BLACK)},
+            game.piece_coords(Color.WHITE, 'Queen'), game.piece_coords(Color.BLACK, 'Rook'))
+
+
+@pytest.mark.parametrize('from_coords, to_coords', [
+    (Coords(x=4, y=0), Coords(x=6, y=0)),   # Castle, Rook moved too
+    (Coords(x=0, y=0), Coords(x=0, y=7)),   # Rook captures Rook
+    (Coords(x=1, y=6), Coords(x=1, y=7)),   # Promotion
+    (Coords(x=3, y=4), Coords(x=2, y=5)),   # En passant
+    (Coords(x=3, y=4), Coords(x=3, y=5)),   # Pawn move
+])
+def test_undo_move_restores_position_exactly(castle_game, from_coords, to_coords):
+    game = castle_game
+    game.add(Pawn(Color.WHITE), Coords(x=1, y=6))
+    game.add(Pawn(Color.WHITE), Coords(x=3, y=4))
+    game.add(Pawn(Color.BLACK), Coords(x=2, y=4))
+    game.last_move_pawn_coords = Coords(x=2, y=4)
+    before = deepcopy(position_snapshot(game))
+
+    undo_record = game.apply_move(from_coords, to_coords)
+    assert position_snapshot(game) != before
+    game.undo_move(undo_record)
+
+    assert position_snapshot(game) == before
+
+
+def test_undo_move_restores_attack_maps_and_pins(castle_game):
+    game = castle_game
+    game.add(Bishop(Color.WHITE), Coords(x=5, y=1))
+    game.add(Bishop(Color.BLACK), Coords(x=7, y=3))
+    constraints = game._move_constraints()
+    attack_map = game.attack_map(Color.BLACK)
+    assert constraints.pin_masks.keys() == {square_index(Coords(x=5, y=1))}
+
+    undo_record = game.apply_move(Coords(x=0, y=0), Coords(x=0, y=1))
+    assert game.attack_map(Color.BLACK) != attack_map
+    game.undo_move(undo_record)
+
+    assert game._move_constraints() is constraints
+    assert game.attack_map(Color.BLACK) is attack_map
+
+
+def test_pinned_piece_moving_off_pin_line_raises_exception(castle_game):
+    game = castle_game
+    game.add(Bishop(Color.WHITE), Coords(x=5, y=1))
+    game.add(Bishop(Color.BLACK), Coords(x=7, y=3))
+    with pytest.raises(IllegalMoveError, match=game.KING_IN_CHECK):
+        game.move(Coords(x=5, y=1), Coords(x=4, y=2))
+    game.move(Coords(x=5, y=1), Coords(x=6, y=2))
+
+
+def test_apply_move_castles_promotes_and_captures_en_passant(castle_game):
+    game = castle_game
+    game.add(Pawn(Color.WHITE), Coords(x=1, y=6))
+    game.add(Pawn(Color.WHITE), Coords(x=3, y=4))
+    game.add(Pawn(Color.BLACK), Coords(x=2, y=4))
+    game.last_move_pawn_coords = Coords(x=2, y=4)
+
+    game.apply_move(Coords(x=4, y=0), Coords(x=2, y=0))
+    assert game.board[2][0] == King(Color.WHITE) and game.board[3][0] == Rook(Color.WHITE)
+    assert Coords(x=0, y=0) not in game.unmoved_coords
+    assert game.playing_color == Color.BLACK
+
+    game.apply_move(Coords(x=1, y=6), Coords(x=1, y=7))
+    assert game.board[1][7] == Queen(Color.WHITE)
+
+    game.apply_move(Coords(x=3, y=4), Coords(x=2, y=5))
+    assert game.board[2][4] is None
+    assert game.board[2][5] == Pawn(Color.WHITE)
+
+
+def test_new_game_has_twenty_legal_moves(new_game):
+    moves = new_game.legal_moves()
+    assert len(moves) == 20
+    assert (Coords(x=4, y=1), Coords(x=4, y=3)) in moves
+    assert (Coords(x=6, y=0), Coords(x=5, y=2)) in moves
+
+
+def test_legal_moves_from_square(new_game):
+    assert set(new_game.legal_moves_from(Coords(x=1, y=0))) == {
+        (Coords(x=1, y=0), Coords(x=0, y=2)),
+        (Coords(x=1, y=0), Coords(x=2, y=2))
+    }
+    # Blocked piece, empty square and opponent piece have no moves
+    assert new_game.legal_moves_from(Coords(x=0, y=0)) == []
+    assert new_game.legal_moves_from(Coords(x=4, y=4)) == []
+    assert new_game.legal_moves_from(Coords(x=4, y=6)) == []
+
+
+def test_legal_moves_include_castling_and_en_passant(castle_game):
+    game = castle_game
+    game.add(Pawn(Color.WHITE), Coords(x=3, y=4))
+    game.add(Pawn(Color.BLACK), Coords(x=2, y=4))
+    game.last_move_pawn_coords = Coords(x=2, y=4)
+    moves = game.legal_moves()
+    assert (Coords(x=4, y=0), Coords(x=6, y=0)) in moves
+    assert (Coords(x=4, y=0), Coords(x=2, y=0)) in moves
+    assert (Coords(x=3, y=4), Coords(x=2, y=5)) in moves
+
+
+def test_cant_castle_queen_side_with_knight_next_to_rook(castle_game):
+    castle_game.add(Knight(Color.WHITE), Coords(x=1, y=0))
+    assert (Coords(x=4, y=0), Coords(x=2, y=0)) not in castle_game.legal_moves()
+    with pytest.raises(IllegalMoveError, match=castle_game.ILLEGAL_CASTLE):
+        castle_game.move(Coords(x=4, y=0), Coords(x=2, y=0))
+
+
+def test_legal_moves_exclude_moves_leaving_king_in_check(game):
+    game.add(Rook(Color.WHITE), Coords(x=0, y=1))
+    game.add(Rook(Color.BLACK), Coords(x=0, y=5))
+    # Pinned Rook can only move along the pinning file
+    assert {to_coords for _, to_coords in game.legal_moves_from(Coords(x=0, y=1))} == {
+        Coords(x=0, y=2), Coords(x=0, y=3), Coords(x=0, y=4), Coords(x=0, y=5)
+    }
+
+
+def test_pawn_can_capture_into_promotion(game):
+    game.add(Pawn(Color.WHITE), Coords(x=2, y=6))
+    game.add(Rook(Color.BLACK), Coords(x=3, y=7))
+    game.move(Coords(x=2, y=6), Coords(x=3, y=7))
+    assert game.board[3][7] == Queen(Color.WHITE)
+
+
+def test_pawn_cant_promote_by_moving_forward_onto_piece(game):
+    game.add(Pawn(Color.WHITE), Coords(x=2, y=6))
+    game.add(Rook(Color.BLACK), Coords(x=2, y=7))
+    with pytest.raises(IllegalMoveError, match=game.ILLEGAL_CAPTURE):
+        game.move(Coords(x=2, y=6), Coords(x=2, y=7))
+
+
+@pytest.mark.parametrize('fen, expected_outcome', [
+    ('7k/8/6K1/8/8/8/8/5Q2 w - - 0 1', None),
+    ('7k/6Q1/6K1/8/8/8/8/8 b - - 0 1', Color.WHITE),
+    ('7k/5Q2/6K1/8/8/8/8/8 b - - 0 1', Color.NONE),
+])
+def test_outcome(fen, expected_outcome):
+    assert Chess.from_fen(fen).outcome() == expected_outcome
+
+
+@pytest.mark.parametrize('fen', [
+    'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1',
+    'r3k2r/8/8/3pP3/8/8/8/4K2R w Kq d6 0 1',
+    '7k/8/6K1/8/8/8/8/5Q2 b - - 0 1',
+])
+def test_to_fen_round_trip(fen):
+    game = Chess.from_fen(fen)
+    assert game.to_fen() == fen
+    assert Chess.from_fen(game.to_fen()).position_hash == game.position_hash
@@ -18,8 +18,7 @@ black_counter = Counter(Color.BLACK)
     (Coords(x=3, y=3), False)   # can't move more than one space
 ])
 def test_white_counter_legal_move(coords, rt_val):
-    white_counter.coords = Coords(x=1, y=1)
-    assert white_counter.legal_move(coords) == rt_val
+    assert white_counter.legal_move(Coords(x=1, y=1), coords) == rt_val
 
 
 @pytest.mark.parametrize('coords, rt_val', [
@@ -31,8 +30,7 @@ def test_white_counter_legal_move(coords, rt_val):
     (Coords(x=4, y=4), False)   # can't move more than one space
 ])
 def test_black_counter_legal_move(coords, rt_val):
-    black_counter.coords = Coords(x=6, y=6)
-    assert black_counter.legal_move(coords) == rt_val
+    assert black_counter.legal_move(Coords(x=6, y=6), coords) == rt_val
 
 
 @pytest.mark.parametrize('coords, rt_val', [
@@ -44,5 +42,4 @@ def test_black_counter_legal_move(coords, rt_val):
     (Coords(x=4, y=3), False)
 ])
 def test_counter_legal_capture(coords, rt_val):
-    white_counter.coords = Coords(x=3, y=3)
-    assert white_counter.legal_capture(coords) == rt_val
+    assert white_counter.legal_capture(Coords(x=3, y=3), coords) == rt_val
@@ -0,0 +1,83 @@
+"""Test module for Draughts alpha-beta search engine."""
+import pytest
+
+from src.engines import best_move, draughts_engine, SearchBudget
+from src.engines.draughts_engine import evaluate, WIN_THRESHOLD
+from src.game_enums import Color
+from src.game_pieces.draughts_counter import Counter
+from src.games.draughts import Draughts
+from src.games.game import Coords
+from src.games.transposition import TranspositionTable
+
+
+def test_evaluate_new_game_is_level():
+    assert evaluate(Draughts()) == 0
+
+
+def test_evaluate_values_crowned_counters_above_men():
+    game = Draughts({
+        '33': Counter(Color.WHITE, crowned=True),
+        '55': Counter(Color.BLACK),
+    })
+    game.playing_color = Color.WHITE
+    assert evaluate(game) > 0
+    game.playing_color = Color.BLACK
+    assert evaluate(game) < 0
+
+
+def test_takes_longest_capture_route():
+    # Black can take one counter, or two with a different counter
+    game = Draughts({
+        '66': Counter(Color.BLACK),
+        '55': Counter(Color.WHITE),
+        '33': Counter(Color.WHITE),
+        '37': Counter(Color.BLACK),
+        '26': Counter(Color.WHITE),
+        '00': Counter(Color.WHITE),
+    })
+    result = best_move(game, SearchBudget(seconds=None, depth=2))
+    assert result.move == (Coords(x=6, y=6), Coords(x=2, y=2))
+
+
+def test_finds_win_when_opponent_left_without_moves():
+    game = Draughts({
+        '33': Counter(Color.BLACK),
+        '22': Counter(Color.WHITE),
+    })
+    result = best_move(game, SearchBudget(seconds=None, depth=2))
+    assert result.move == (Coords(x=3, y=3), Coords(x=1, y=1))
+    assert result.score > WIN_THRESHOLD
+
+
+def test_search_leaves_game_unchanged():
+    game = Draughts()
+    position_hash = game.position_hash
+    best_move(game, SearchBudget(seconds=None, depth=3))
+    assert game.position_hash == position_hash
+    assert game == Draughts()
+
+
+@pytest.mark.parametrize('budget', [
+    SearchBudget(seconds=None, nodes=500),
+    SearchBudget(seconds=0.2),
+])
+def test_search_respects_budget_and_reports_statistics(budget):
+    result = best_move(Draughts(), budget)
+    assert result.move in Draughts().legal_moves()
+    assert result.depth >= 1
+    if budget.nodes:
+        assert result.nodes <= budget.nodes
+    else:
+        assert result.seconds < budget.seconds + 0.1
+    assert result.nodes_per_second > 0
+
+
+def test_no_move_returned_when_player_has_no_moves():
+    game = Draughts({'00': Counter(Color.WHITE)})
+    assert best_move(game, SearchBudget(seconds=None, depth=2)).move is None
+
+
+def test_search_table_can_be_passed_in():
+    table = TranspositionTable(max_entries=1000)
+    draughts_engine.best_move(Draughts(), SearchBudget(seconds=None, depth=2), table=table)
+    assert len(table) > 0
@@ -36,9 +36,8 @@ def test_draughts_setup_correctly():
         (Color.BLACK, Coords(x=7, y=7))
     ])
     actual_board_setup = set(
-        (counter.color, counter.coords)
-        for row in game.board
-        for counter in row if counter
+        (counter.color, coords)
+        for coords, counter in game.current_board_positions()
     )
     assert actual_board_setup == expected_board_setup
 
@@ -111,6 +110,7 @@ def test_counters_can_be_crowned():
     assert not black_piece.crowned
 
     game.move(Coords(x=1, y=1), Coords(x=0, y=0))
+    black_piece = game.board[0][0]
     assert black_piece.crowned
     assert str(black_piece) == '\u26C3'
 
@@ -118,33 +118,32 @@ def test_counters_can_be_crowned():
     assert not white_piece.crowned
 
     game.move(Coords(x=1, y=6), Coords(x=0, y=7))
+    white_piece = game.board[0][7]
     assert white_piece.crowned
     assert str(white_piece) == '\u26C1'
 
 
 def test_crowned_white_piece_can_capture_backwards():
     game = Draughts({
-        '22': Counter(Color.WHITE),
+        '22': Counter(Color.WHITE, crowned=True),
         '11': Counter(Color.BLACK),
     })
     game.playing_color = Color.WHITE
-    game.board[2][2].crowned = True
 
     game.move(Coords(x=2, y=2), Coords(x=0, y=0))
     assert game.board[1][1] is None
-    assert game.board[0][0] == Counter(Color.WHITE)
+    assert game.board[0][0] == Counter(Color.WHITE, crowned=True)
 
 
 def test_crowned_black_piece_can_capture_backwards():
     game = Draughts({
-        '55': Counter(Color.BLACK),
+        '55': Counter(Color.BLACK, crowned=True),
         '66': Counter(Color.WHITE),
     })
-    game.board[5][5].crowned = True
 
     game.move(Coords(x=5, y=5), Coords(x=7, y=7))
     assert game.board[6][6] is None
-    assert game.board[7][7] == Counter(Color.BLACK)
+    assert game.board[7][7] == Counter(Color.BLACK, crowned=True)
 
 
 def test_can_capture_two_pieces_in_straight_line():
@@ -246,7 +245,7 @@ def test_black_can_capture_three_pieces_in_multiple_directions_s_shape():
     assert game.board[5][5] is None
     assert game.board[5][3] is None
     assert game.board[5][1] is None
-    assert game.board[4][0] == Counter(Color.BLACK)
+    assert game.board[4][0] == Counter(Color.BLACK, crowned=True)
 
 
 def test_move_raises_error_if_capture_possible_for_piece():
@@ -263,9 +262,8 @@ def test_move_raises_error_if_capture_possible_for_crowned_piece():
     game = Draughts({
         '77': Counter(Color.BLACK),
         '55': Counter(Color.WHITE),
-        '64': Counter(Color.BLACK)
+        '64': Counter(Color.BLACK, crowned=True)
     })
-    game.board[6][4].crowned = True
 
     with pytest.raises(IllegalMoveError, match=game.CAPTURE_POSSIBLE):
         game.move(Coords(x=7, y=7), Coords(x=6, y=6))
@@ -300,7 +298,7 @@ def test_two_piece_capture_force_to_make_three_move_capture_if_possible():
     assert game.board[3][3] is None
     assert game.board[2][2] is None
     assert game.board[1][1] is None
-    assert game.board[0][0] == Counter(Color.BLACK)
+    assert game.board[0][0] == Counter(Color.BLACK, crowned=True)
 
 
 def test_two_extra_captures_forced_if_possible():
@@ -316,18 +314,230 @@ def test_two_extra_captures_forced_if_possible():
     assert game.board[5][5] is None
     assert game.board[3][3] is None
     assert game.board[1][1] is None
-    assert game.board[0][0] == Counter(Color.BLACK)
+    assert game.board[0][0] == Counter(Color.BLACK, crowned=True)
 
 
 def test_crowned_piece_can_take_two_pieces_and_return_to_same_y_index():
     game = Draughts({
-        '66': Counter(Color.BLACK),
+        '66': Counter(Color.BLACK, crowned=True),
         '55': Counter(Color.WHITE),
         '35': Counter(Color.WHITE),
     })
-    game.board[6][6].crowned = True
 
     game.move(Coords(x=6, y=6), Coords(x=2, y=6))
     assert game.board[5][5] is None
     assert game.board[3][5] is None
-    assert game.board[2][6] == Counter(Color.BLACK)
+    assert game.board[2][6] == Counter(Color.BLACK, crowned=True)
+
+
+def test_crowned_piece_can_capture_more_than_four_pieces():
+    positions = {
+        '22': Counter(Color.BLACK, crowned=True),
+        '33': Counter(Color.WHITE),
+        '53': Counter(Color.WHITE),
+        '51': Counter(Color.WHITE),
+        '31': Counter(Color.WHITE),
+        '11': Counter(Color.WHITE),
+    }
+    game = Draughts(positions)
+
+    # Route circles back through the vacated start square before the last capture
+    game.move(Coords(x=2, y=2), Coords(x=4, y=4))
+    assert [coords for coords, _ in game.current_board_positions()] == [Coords(x=0, y=0)]
+    assert game.board[0][0] == Counter(Color.BLACK, crowned=True)
+
+    # Single jump ends on the same square, so moving there plays the single jump
+    game = Draughts(positions)
+    game.move(Coords(x=2, y=2), Coords(x=0, y=0))
+    assert game.board[1][1] is None
+    assert len(list(game.current_board_positions())) == 5
+
+
+def test_capture_raises_error_if_no_capture_route_reaches_coords():
+    game = Draughts({
+        '66': Counter(Color.BLACK),
+        '55': Counter(Color.WHITE),
+        '44': Counter(Color.BLACK),
+    })
+
+    with pytest.raises(IllegalMoveError, match=game.ILLEGAL_CAPTURE):
+        game.move(Coords(x=6, y=6), Coords(x=4, y=4))
+
+
+def test_legal_moves_for_new_game():
+    game = Draughts()
+    moves = game.legal_moves()
+    assert len(moves) == 7
+    assert (Coords(x=1, y=5), Coords(x=0, y=4)) in moves
+    assert game.legal_moves_from(Coords(x=0, y=6)) == []
+
+
+def test_legal_moves_only_include_captures_when_capture_possible():
+    game = Draughts({
+        '66': Counter(Color.BLACK),
+        '55': Counter(Color.WHITE),
+        '33': Counter(Color.WHITE),
+        '02': Counter(Color.BLACK),
+    })
+    # Capture route ends after taking both white counters
+    assert game.legal_moves() == [(Coords(x=6, y=6), Coords(x=2, y=2))]
+    assert game.legal_moves_from(Coords(x=0, y=2)) == []
+
+
+def test_legal_moves_include_every_capture_route_end():
+    game = Draughts({
+        '00': Counter(Color.WHITE),
+        '11': Counter(Color.BLACK),
+        '13': Counter(Color.BLACK),
+        '33': Counter(Color.BLACK),
+    })
+    game.playing_color = Color.WHITE
+    assert set(game.legal_moves()) == {
+        (Coords(x=0, y=0), Coords(x=0, y=4)),
+        (Coords(x=0, y=0), Coords(x=4, y=4)),
+    }
+
+
+def test_capture_looping_back_to_start_played_by_square_on_route():
+    positions = {
+        '20': Counter(Color.WHITE, crowned=True),
+        '11': Counter(Color.BLACK),
+        '13': Counter(Color.BLACK),
+        '31': Counter(Color.BLACK),
+        '33': Counter(Color.BLACK),
+    }
+    game = Draughts(positions)
+    game.playing_color = Color.WHITE
+    moves = game.legal_moves()
+    assert len(moves) == 1
+    assert moves[0][1] in (Coords(x=0, y=2), Coords(x=4, y=2))
+
+    game.move(*moves[0])
+    assert [coords for coords, _ in game.current_board_positions()] == [Coords(x=2, y=0)]
+
+    game = Draughts(positions)
+    game.playing_color = Color.WHITE
+    game.apply_move(*moves[0])
+    assert [coords for coords, _ in game.current_board_positions()] == [Coords(x=2, y=0)]
+
+
+def test_capture_routes_ending_on_same_square_each_have_a_move():
+    positions = {
+        '20': Counter(Color.WHITE),
+        '11': Counter(Color.BLACK),
+        '13': Counter(Color.BLACK),
+        '31': Counter(Color.BLACK),
+        '33': Counter(Color.BLACK),
+    }
+    game = Draughts(positions)
+    game.playing_color = Color.WHITE
+    assert game.legal_moves() == [(Coords(x=2, y=0), Coords(x=0, y=2)), (Coords(x=2, y=0), Coords(x=4, y=2))]
+    with pytest.raises(IllegalMoveError, match=game.AMBIGUOUS_CAPTURE):
+        game.move(Coords(x=2, y=0), Coords(x=2, y=4))
+
+    for to_coords, left_coords in ((Coords(x=0, y=2), {Coords(x=3, y=1), Coords(x=3, y=3)}),
+                                   (Coords(x=4, y=2), {Coords(x=1, y=1), Coords(x=1, y=3)})):
+        game = Draughts(positions)
+        game.playing_color = Color.WHITE
+        game.move(Coords(x=2, y=0), to_coords)
+        assert game.board[2][4] == Counter(Color.WHITE)
+        assert {coords for coords, piece in game.current_board_positions() if piece.color == Color.BLACK} \
+            == left_coords
+
+
+def test_must_capture_returns_pieces_able_to_capture_for_each_color():
+    game = Draughts({
+        '66': Counter(Color.BLACK),
+        '55': Counter(Color.WHITE),
+        '04': Counter(Color.WHITE),
+        '15': Counter(Color.BLACK),
+        '00': Counter(Color.WHITE),
+    })
+    assert game.must_capture() == {Coords(x=6, y=6)}
+    assert game.must_capture(Color.WHITE) == {Coords(x=0, y=4), Coords(x=5, y=5)}
+
+
+def test_must_capture_updated_after_move():
+    game = Draughts({
+        '66': Counter(Color.BLACK),
+        '55': Counter(Color.WHITE),
+        '33': Counter(Color.BLACK),
+    })
+    assert game.must_capture(Color.WHITE) == {Coords(x=5, y=5)}
+
+    game.move(Coords(x=6, y=6), Coords(x=4, y=4))
+    assert game.must_capture(Color.WHITE) == frozenset()
+    assert game.must_capture(Color.BLACK) == frozenset()
+
+
+def test_capture_raises_error_for_piece_not_able_to_capture():
+    game = Draughts({
+        '66': Counter(Color.BLACK),
+        '55': Counter(Color.WHITE),
+        '06': Counter(Color.BLACK),
+    })
+
+    with pytest.raises(IllegalMoveError, match=game.ILLEGAL_CAPTURE):
+        game.move(Coords(x=0, y=6), Coords(x=2, y=4))
+
+
+def test_simple_move_count_for_new_game():
+    game = Draughts()
+    assert game.simple_move_count(Color.BLACK) == 7
+    assert game.simple_move_count(Color.WHITE) == 7
+
+
+def test_apply_move_takes_whole_capture_route():
+    game = Draughts({
+        '55': Counter(Color.BLACK),
+        '44': Counter(Color.WHITE),
+        '22': Counter(Color.WHITE),
+    })
+    game.apply_move(Coords(x=5, y=5), Coords(x=1, y=1))
+    assert game.board[1][1] == Counter(Color.BLACK)
+    assert game.board[4][4] is None
+    assert game.board[2][2] is None
+    assert game.playing_color == Color.WHITE
+
+
+def test_undo_move_restores_position():
+    game = Draughts({
+        '22': Counter(Color.BLACK),
+        '11': Counter(Color.WHITE),
+        '33': Counter(Color.WHITE),
+    })
+    expected = Draughts({
+        '22': Counter(Color.BLACK),
+        '11': Counter(Color.WHITE),
+        '33': Counter(Color.WHITE),
+    })
+    undo_record = game.apply_move(Coords(x=2, y=2), Coords(x=0, y=0))
+    assert game.board[0][0] == Counter(Color.BLACK, crowned=True)
+    assert game.board[1][1] is None
+
+    game.undo_move(undo_record)
+    assert game == expected
+    assert game.position_hash == expected.position_hash
+    assert game.must_capture() == {Coords(x=2, y=2)}
+
+
+def test_player_without_moves_loses():
+    game = Draughts({
+        '00': Counter(Color.WHITE),
+        '11': Counter(Color.BLACK),
+        '22': Counter(Color.BLACK),
+    })
+    game.playing_color = Color.WHITE
+    assert game.outcome() == Color.BLACK
+    assert Draughts().outcome() is None
+
+
+def test_fen_round_trip():
+    game = Draughts({
+        '00': Counter(Color.WHITE),
+        '77': Counter(Color.BLACK, crowned=True),
+    })
+    game.playing_color = Color.WHITE
+    assert game.to_fen() == '7k/8/8/8/8/8/8/M7 w'
+    assert Draughts.from_fen(game.to_fen()) == game
+    assert Draughts().to_fen() == '1m1m1m1m/m1m1m1m1/1m1m1m1m/8/8/M1M1M1M1/1M1M1M1M/M1M1M1M1 b'
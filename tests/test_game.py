@@ -7,7 +7,10 @@ from src.game_enums import Color, Direction
 from src.games.chess import Chess
 from src.games.game import adjacent_squares, Coords, move_direction
 from src.game_errors import IllegalMoveError, NotOnBoardError
+from src.game_pieces.king import King
 from src.game_pieces.pawn import Pawn
+from src.game_pieces.queen import Queen
+from src.game_pieces.rook import Rook
 
 
 @pytest.mark.parametrize('to_coords, direction', [
@@ -70,3 +73,30 @@ def test_game_not_restored_for_invalid_file_path():
     file_path = Path.cwd() / 'saved_games' / 'fail.pkl'
     restored_game = Chess.restore(file_path)
     assert not restored_game
+
+
+def test_piece_index_counts_and_coords_for_new_game(new_game):
+    assert new_game.piece_count(Color.WHITE) == 16
+    assert new_game.piece_count(Color.BLACK, 'Pawn') == 8
+    assert new_game.piece_count(Color.BLACK, 'Dragon') == 0
+    assert new_game.piece_coords(Color.WHITE, 'King') == {Coords(x=4, y=0)}
+    assert dict(new_game.color_positions(Color.BLACK))[Coords(x=3, y=7)].name == 'Queen'
+
+
+def test_piece_index_updated_after_capture_and_promotion():
+    game = Chess(restore_positions={
+        '40': King(Color.WHITE),
+        '47': King(Color.BLACK),
+        '16': Pawn(Color.WHITE),
+        '07': Rook(Color.BLACK),
+    })
+    game.move(Coords(x=1, y=6), Coords(x=0, y=7))
+
+    assert game.piece_count(Color.BLACK) == 1
+    assert game.piece_coords(Color.BLACK, 'Rook') == frozenset()
+    assert game.piece_count(Color.WHITE, 'Pawn') == 0
+    assert game.piece_coords(Color.WHITE, 'Queen') == {Coords(x=0, y=7)}
+    assert set(game.color_positions(Color.WHITE)) == {
+        (Coords(x=4, y=0), King(Color.WHITE)),
+        (Coords(x=0, y=7), Queen(Color.WHITE)),
+    }
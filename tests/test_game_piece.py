@@ -1,8 +1,12 @@
 """Test module for GamePieces ABC."""
+from copy import deepcopy
+import pickle
+
 import pytest
 
 from src.game_enums import Color
 from src.game_pieces.game_piece import GamePiece
+from src.game_pieces.draughts_counter import Counter
 from src.game_pieces.pawn import Pawn
 
 
@@ -16,7 +20,6 @@ def test_child_class_inherits_properties():
 
     assert pawn.name == 'Pawn'
     assert pawn.color == Color.BLACK
-    assert pawn.coords is None
     assert repr(pawn) == "Pawn('Black')"
 
 
@@ -44,3 +47,24 @@ def test_abstract_methods_require_implementing():
 
     with pytest.raises(TypeError):
         TestPiece()
+
+
+def test_pieces_are_interned_per_class_and_color():
+    assert Pawn(Color.WHITE) is Pawn(Color.WHITE)
+    assert Pawn(Color.WHITE) is not Pawn(Color.BLACK)
+    assert Counter(Color.WHITE) is not Counter(Color.WHITE, crowned=True)
+    assert Counter(Color.WHITE).crown() is Counter(Color.WHITE, crowned=True)
+
+
+def test_pieces_are_immutable():
+    with pytest.raises(AttributeError):
+        Pawn(Color.WHITE).color = Color.BLACK
+
+    with pytest.raises(AttributeError):
+        Pawn(Color.WHITE).coords = None
+
+
+def test_pickled_and_copied_pieces_stay_interned():
+    crowned = Counter(Color.BLACK, crowned=True)
+    assert pickle.loads(pickle.dumps(crowned)) is crowned
+    assert deepcopy(Pawn(Color.WHITE)) is Pawn(Color.WHITE)
@@ -0,0 +1,58 @@
+"""Test module for BoardGeometry lookup tables."""
+import pickle
+
+from src.games.chess import Chess
+from src.games.geometry import board_geometry, Coords
+
+
+def test_geometry_shared_per_board_size():
+    assert board_geometry(8, 8) is board_geometry(8, 8)
+    assert board_geometry(8, 8) is not board_geometry(10, 10)
+    assert Chess().geometry is board_geometry(8, 8)
+
+
+def test_coords_are_interned():
+    geometry = board_geometry(8, 8)
+    assert geometry.coords(3, 4) is geometry.coords(3, 4)
+    assert geometry.coords(3, 4) == Coords(x=3, y=4)
+    assert geometry.squares[geometry.square_index(Coords(x=3, y=4))] == Coords(x=3, y=4)
+    # Off board coords still returned, just not interned
+    assert geometry.coords(-1, 8) == Coords(x=-1, y=8)
+
+
+def test_on_board():
+    geometry = board_geometry(8, 8)
+    assert geometry.on_board(Coords(x=0, y=0))
+    assert geometry.on_board(Coords(x=7, y=7))
+    assert not geometry.on_board(Coords(x=-1, y=0))
+    assert not geometry.on_board(Coords(x=0, y=8))
+
+
+def test_neighbours_are_none_off_board():
+    geometry = board_geometry(8, 8)
+    assert geometry.neighbours['NE'][Coords(x=3, y=3)] == Coords(x=4, y=4)
+    assert geometry.neighbours['SW'][Coords(x=0, y=0)] is None
+    assert geometry.neighbours['N'][Coords(x=5, y=7)] is None
+
+
+def test_rays_run_to_board_edge():
+    geometry = board_geometry(8, 8)
+    assert geometry.rays['E'][Coords(x=5, y=2)] == (Coords(x=6, y=2), Coords(x=7, y=2))
+    assert geometry.rays['SE'][Coords(x=7, y=0)] == ()
+
+
+def test_between():
+    geometry = board_geometry(8, 8)
+    assert geometry.between(Coords(x=0, y=0), Coords(x=3, y=3)) == (Coords(x=1, y=1), Coords(x=2, y=2))
+    assert geometry.between(Coords(x=4, y=6), Coords(x=4, y=3)) == (Coords(x=4, y=5), Coords(x=4, y=4))
+    assert geometry.between(Coords(x=0, y=0), Coords(x=1, y=0)) == ()
+    # Knight jump isn't on a line so has nothing between
+    assert geometry.between(Coords(x=0, y=0), Coords(x=1, y=2)) == ()
+
+
+def test_geometry_not_pickled_with_game():
+    game = Chess()
+    restored_game = pickle.loads(pickle.dumps(game))
+    assert 'geometry' not in game.__getstate__()
+    assert restored_game.geometry is game.geometry
+    assert restored_game == game
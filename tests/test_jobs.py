@@ -0,0 +1,224 @@
+"""Test module for background search jobs and computer move routes."""
+import threading
+
+import pytest
+
+from src import create_app
+from src.engines import jobs
+from src.engines.jobs import CANCELLED, DONE, FAILED, JobQueueFull, QUEUED, RUNNING, SearchJobs
+from src.games.chess import Chess
+from src.games.draughts import Draughts
+from src.games.othello import Othello
+
+
+@pytest.fixture()
+def search_jobs():
+    search_jobs = SearchJobs(max_workers=1, max_queued=1, max_seconds=0.5)
+    yield search_jobs
+    search_jobs.shutdown()
+
+
+def test_submitted_job_finishes_with_result(search_jobs):
+    game = Othello()
+    job_id = search_jobs.submit(game, 0.1)
+    status = search_jobs.wait(job_id, 2)
+    assert status.state == DONE
+    assert status.result.move in game.legal_moves()
+    assert status.position_hash == game.position_hash
+
+
+def test_job_searches_copy_of_game(search_jobs):
+    game = Othello()
+    job_id = search_jobs.submit(game, 0.1)
+    game.move(*game.legal_moves()[0])
+    assert search_jobs.wait(job_id, 2).position_hash == Othello().position_hash
+
+
+def test_queue_depth_limited(search_jobs):
+    search_jobs.submit(Chess(), 0.5)
+    search_jobs.submit(Chess(), 0.5)
+    with pytest.raises(JobQueueFull):
+        search_jobs.submit(Chess(), 0.5)
+
+
+def test_queued_job_cancelled_before_it_runs(search_jobs):
+    running_id = search_jobs.submit(Chess(), 0.5)
+    queued_id = search_jobs.submit(Chess(), 0.5)
+    assert search_jobs.status(queued_id).state == QUEUED
+    assert search_jobs.cancel(queued_id).state == CANCELLED
+    assert search_jobs.wait(running_id, 2).state == DONE
+
+
+def test_running_job_stopped_early_by_cancel(search_jobs):
+    job_id = search_jobs.submit(Chess(), 0.5)
+    while search_jobs.status(job_id).state == QUEUED:
+        threading.Event().wait(0.01)
+    assert search_jobs.status(job_id).state == RUNNING
+
+    search_jobs.cancel(job_id)
+    status = search_jobs.wait(job_id, 2)
+    assert status.state == CANCELLED
+    assert status.result.seconds < 0.4
+
+
+def test_job_time_budget_capped(search_jobs):
+    status = search_jobs.wait(search_jobs.submit(Chess(), 60), 2)
+    assert status.state == DONE
+    assert status.result.seconds < 0.5 + 0.1
+
+
+def test_failed_search_reports_error(search_jobs):
+    status = search_jobs.wait(search_jobs.submit(Chess(), 0.1, method='minimax'), 2)
+    assert status.state == FAILED
+    assert 'minimax' in status.error
+
+
+def test_unknown_job_id_raises_key_error(search_jobs):
+    with pytest.raises(KeyError):
+        search_jobs.status('no such job')
+
+
+
+def test_mcts_jobs_run_at_once_search_their_own_trees():
+    search_jobs = SearchJobs(max_workers=2, max_queued=1, max_seconds=0.5)
+    games = [Othello(), Draughts(), Chess()]
+    job_ids = [search_jobs.submit(game, 0.3, method='mcts', tree_key='game') for game in games]
+    try:
+        for game, job_id in zip(games, job_ids):
+            status = search_jobs.wait(job_id, 2)
+            assert status.state == DONE
+            assert status.result.move in game.legal_moves()
+    finally:
+        search_jobs.shutdown()
+
+
+def test_mcts_tree_kept_for_tree_key(search_jobs):
+    game = Othello()
+    search_jobs.wait(search_jobs.submit(game, 0.1, method='mcts', tree_key='game'), 2)
+    tree = search_jobs._trees['game']
+    assert tree.root.position_hash == game.position_hash
+
+    game.move(*game.legal_moves()[0])
+    search_jobs.wait(search_jobs.submit(game, 0.1, method='mcts', tree_key='game'), 2)
+    assert search_jobs._trees['game'] is tree
+    assert tree.root.position_hash == game.position_hash
+    search_jobs.wait(search_jobs.submit(game, 0.1, method='mcts'), 2)
+    assert list(search_jobs._trees) == ['game']
+
+@pytest.fixture()
+def app_search_jobs(monkeypatch):
+    search_jobs = SearchJobs(max_workers=1, max_queued=1, max_seconds=0.2)
+    monkeypatch.setattr('src.SEARCH_JOBS', search_jobs)
+    yield search_jobs
+    search_jobs.shutdown()
+
+
+@pytest.fixture()
+def client(app_search_jobs, monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    return create_app().test_client()
+
+
+def test_computer_move_routes_play_move_once_search_done(client):
+    client.get('/othello')
+    job_id = client.get('/computer_move/submit?seconds=0.1').get_json()['job_id']
+
+    response = client.get(f'/computer_move/{job_id}?wait=2').get_json()
+    assert response['job'] == DONE
+    assert response['next_player'] == 'White'
+    assert response['search']['depth'] >= 1
+
+    # Polling again doesn't play the move a second time
+    assert client.get(f'/computer_move/{job_id}').get_json()['next_player'] == 'White'
+
+
+def test_computer_move_route_for_unknown_job(client):
+    client.get('/othello')
+    assert client.get('/computer_move/nojob').status_code == 404
+
+
+def test_cancel_route(client):
+    client.get('/chess')
+    job_id = client.get('/computer_move/submit?seconds=0.2').get_json()['job_id']
+    assert client.get(f'/computer_move/{job_id}/cancel').get_json()['job'] in (CANCELLED, DONE)
+
+
+def test_shared_jobs_capped_by_max_search_seconds():
+    assert jobs.SEARCH_JOBS.max_seconds == jobs.MAX_SEARCH_SECONDS
+
+
+def _predicted_reply(game, position_hash):
+    for move in game.legal_moves():
+        undo_record = game.apply_move(*move)
+        reply_hash = game.position_hash
+        game.undo_move(undo_record)
+        if reply_hash == position_hash:
+            return move
+    return None
+
+
+def test_ponder_job_searches_position_after_predicted_reply(search_jobs):
+    game = Othello()
+    job_id = search_jobs.submit(game, 0.1, ponder=True)
+    status = search_jobs.wait(job_id, 2)
+    assert status.state == DONE
+
+    reply = _predicted_reply(game, status.position_hash)
+    assert reply is not None
+    game.move(*reply)
+    assert search_jobs.reuse(job_id, game) == job_id
+    assert status.result.move in game.legal_moves()
+
+
+def test_ponder_job_cancelled_when_reply_not_predicted(search_jobs):
+    game = Othello()
+    job_id = search_jobs.submit(game, 0.1, ponder=True)
+    predicted_hash = search_jobs.wait(job_id, 2).position_hash
+    game.move(*next(move for move in game.legal_moves() if _predicted_reply(game, predicted_hash) != move))
+
+    assert search_jobs.reuse(job_id, game) is None
+    assert search_jobs.reuse('no such job', game) is None
+
+
+def test_ponder_job_cancelled_when_reused_before_reply_predicted(search_jobs, monkeypatch):
+    monkeypatch.setattr(jobs, 'PONDER_PREDICT_SECONDS', 0.4)
+    game = Othello()
+    job_id = search_jobs.submit(game, 0.5, ponder=True)
+    # Job still carries the position before the reply it is predicting
+    assert search_jobs.status(job_id).position_hash == game.position_hash
+
+    assert search_jobs.reuse(job_id, game) is None
+    assert search_jobs.wait(job_id, 2).state == CANCELLED
+
+
+def test_ponder_job_skipped_without_idle_worker(search_jobs):
+    running_id = search_jobs.submit(Chess(), 0.2)
+    assert search_jobs.submit(Othello(), 0.1, ponder=True) is None
+    assert search_jobs.wait(running_id, 2).state == DONE
+    assert search_jobs.submit(Othello(), 0.1, ponder=True) is not None
+
+def test_pondering_route_reuses_search_for_predicted_reply(client, app_search_jobs):
+    client.get('/othello')
+    job_id = client.get('/computer_move/submit?seconds=0.1&ponder=1').get_json()['job_id']
+    assert client.get(f'/computer_move/{job_id}?wait=2').get_json()['job'] == DONE
+
+    # Play the reply the ponder job predicted
+    with client.session_transaction() as session:
+        game = session['current_game']
+        ponder_job_id = session['ponder_job_id']
+    ponder_status = app_search_jobs.wait(ponder_job_id, 2)
+    reply = _predicted_reply(game, ponder_status.position_hash)
+    client.get(f'/move?from=null&to={reply[1].x}{reply[1].y}')
+
+    response = client.get('/computer_move/submit?seconds=0.1&ponder=1').get_json()
+    assert response == {'job_id': ponder_job_id, 'err': None, 'pondered': True}
+    assert client.get(f'/computer_move/{ponder_job_id}').get_json()['job'] == DONE
+
+
+def test_move_route_reports_chess_winner_as_color_value(client):
+    client.get('/chess')
+    # Fool's mate
+    for from_coords, to_coords in (('51', '52'), ('46', '44'), ('61', '63'), ('37', '73')):
+        response = client.get(f'/move?from={from_coords}&to={to_coords}').get_json()
+    assert response['winner'] == 'Black'
+    assert response['draw'] is False
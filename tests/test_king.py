@@ -6,11 +6,13 @@ from src.games.game import Coords
 from src.game_pieces.king import King
 
 
+FROM_COORDS = Coords(x=1, y=1)
+
+
 @pytest.fixture(scope='module')
 def king():
-    """Setup King start coords. Return King"""
+    """Return King. Moves are tested from FROM_COORDS"""
     game_king = King(Color.BLACK)
-    game_king.coords = Coords(x=1, y=1)
     return game_king
 
 
@@ -32,9 +34,9 @@ test_data = [
 
 @pytest.mark.parametrize('coords, rt_val', test_data)
 def test_king_legal_move(king, coords, rt_val):
-    assert king.legal_move(coords) == rt_val
+    assert king.legal_move(FROM_COORDS, coords) == rt_val
 
 
 @pytest.mark.parametrize('coords, rt_val', test_data)
 def test_king_legal_capture(king, coords, rt_val):
-    assert king.legal_capture(coords) == rt_val
+    assert king.legal_capture(FROM_COORDS, coords) == rt_val
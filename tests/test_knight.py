@@ -6,11 +6,13 @@ from src.games.game import Coords
 from src.game_pieces.knight import Knight
 
 
+FROM_COORDS = Coords(x=4, y=4)
+
+
 @pytest.fixture(scope='module')
 def knight():
-    """Setup Knight start coords. Return Knight"""
+    """Return Knight. Moves are tested from FROM_COORDS"""
     game_knight = Knight(Color.BLACK)
-    game_knight.coords = Coords(x=4, y=4)
     return game_knight
 
 
@@ -32,9 +34,9 @@ test_data = [
 
 @pytest.mark.parametrize('coords, rt_val', test_data)
 def test_knight_legal_move(knight, coords, rt_val):
-    assert knight.legal_move(coords) == rt_val
+    assert knight.legal_move(FROM_COORDS, coords) == rt_val
 
 
 @pytest.mark.parametrize('coords, rt_val', test_data)
 def test_knight_legal_capture(knight, coords, rt_val):
-    assert knight.legal_capture(coords) == rt_val
+    assert knight.legal_capture(FROM_COORDS, coords) == rt_val
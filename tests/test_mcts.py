@@ -0,0 +1,89 @@
+"""Test module for Monte Carlo Tree Search engine."""
+import pytest
+
+from src.engines import best_move, SearchBudget
+from src.engines.mcts import MonteCarloTree
+from src.game_enums import Color
+from src.game_pieces.othello_disc import Disc
+from src.games.chess import Chess
+from src.games.draughts import Draughts
+from src.games.game import Coords
+from src.games.othello import Othello
+
+
+@pytest.mark.parametrize('game_class', [Chess, Draughts, Othello])
+def test_plays_legal_move_in_every_game(game_class):
+    game = game_class()
+    result = MonteCarloTree(seed=1).search(game, SearchBudget(seconds=None, nodes=20))
+    assert result.move in game.legal_moves()
+    assert result.nodes <= 20
+    assert -1000 <= result.score <= 1000
+
+
+def test_search_leaves_game_unchanged():
+    game = Othello()
+    position_hash = game.position_hash
+    MonteCarloTree(seed=1).search(game, SearchBudget(seconds=None, nodes=50))
+    assert game.position_hash == position_hash
+    assert game == Othello()
+
+
+def test_takes_winning_move():
+    # Scholar's mate, Queen takes f7
+    game = Chess.from_fen('r1bqkbnr/pppp1ppp/2n5/4p3/2B1P3/5Q2/PPPP1PPP/RNB1K1NR w KQkq - 0 1')
+    tree = MonteCarloTree(seed=1, max_playout_plies=10)
+    result = tree.search(game, SearchBudget(seconds=None, nodes=200))
+    assert result.move == (Coords(x=5, y=2), Coords(x=5, y=6))
+
+
+def test_tree_reused_after_reply():
+    tree = MonteCarloTree(seed=1)
+    game = Othello()
+    result = tree.search(game, SearchBudget(seconds=None, nodes=300))
+    game.move(*result.move)
+    reply = tree.root.children[0]
+    for child in tree.root.children:
+        if child.move == result.move:
+            reply = max(child.children, key=lambda node: node.visits)
+    game.move(*reply.move)
+    visits = reply.visits
+
+    tree.search(game, SearchBudget(seconds=None, nodes=10))
+    assert tree.root is reply
+    assert tree.root.visits > visits
+
+
+def test_tree_replaced_for_unknown_position():
+    tree = MonteCarloTree(seed=1)
+    tree.search(Othello(), SearchBudget(seconds=None, nodes=50))
+    old_root = tree.root
+    tree.search(Draughts(), SearchBudget(seconds=None, nodes=10))
+    assert tree.root is not old_root
+    assert tree.root.visits == 9
+
+
+def test_respects_time_budget():
+    result = MonteCarloTree(seed=1).search(Chess(), SearchBudget(seconds=0.2))
+    assert result.seconds < 0.4
+    assert result.nodes_per_second > 0
+
+
+def test_no_move_returned_when_game_over():
+    game = Othello(restore_positions={'00': Disc(Color.WHITE)})
+    game.winner = Color.WHITE
+    assert MonteCarloTree().search(game, SearchBudget(seconds=None, nodes=10)).move is None
+
+
+def test_best_move_method_chooses_engine():
+    result = best_move(Draughts(), SearchBudget(seconds=None, nodes=10), method='mcts')
+    assert result.move in Draughts().legal_moves()
+    with pytest.raises(ValueError):
+        best_move(Draughts(), method='minimax')
+
+
+def test_best_move_searches_tree_passed_in():
+    tree = MonteCarloTree(seed=1)
+    best_move(Othello(), SearchBudget(seconds=None, nodes=10), method='mcts', tree=tree)
+    assert tree.root.position_hash == Othello().position_hash
+    assert tree.root.visits > 0
+
@@ -0,0 +1,136 @@
+"""Test module for memory mapped opening books."""
+import random
+
+import pytest
+
+from src.engines import best_move, opening_book, SearchBudget
+from src.engines.opening_book import build_book, OpeningBook
+from src.games.chess import Chess
+from src.games.draughts import Draughts
+from src.games.game import Coords
+
+
+CHESS_RECORDS = [
+    '# Comment lines and blank lines are ignored',
+    '',
+    'e2e4 e7e5 g1f3 b8c6',
+    'e2e4 e7e5 g1f3 g8f6  # Petrov',
+    'e2e4 c7c5',
+    'd2d4 d7d5',
+]
+
+
+@pytest.fixture
+def chess_book(tmp_path):
+    path = tmp_path / 'chess.book'
+    build_book(Chess, CHESS_RECORDS, str(path))
+    book = OpeningBook(str(path))
+    yield book
+    book.close()
+
+
+@pytest.fixture
+def chess_book_variable(tmp_path, monkeypatch):
+    path = tmp_path / 'chess.book'
+    build_book(Chess, CHESS_RECORDS, str(path))
+    monkeypatch.setenv('CHESS_OPENING_BOOK', str(path))
+    monkeypatch.setattr(opening_book, '_books', {})
+    yield path
+
+
+def test_build_book_reports_stats(tmp_path):
+    stats = build_book(Chess, CHESS_RECORDS, str(tmp_path / 'chess.book'))
+    assert stats.games == 4
+    # Start, after e2e4, after e2e4 e7e5, after e2e4 e7e5 g1f3, after d2d4
+    assert stats.positions == 5
+    assert stats.moves == 8
+    assert stats.skipped_lines == []
+
+
+def test_weights_count_times_move_played(chess_book):
+    moves = dict(chess_book.moves(Chess().position_hash))
+    assert moves == {(12, 28): 3, (11, 27): 1}
+
+
+def test_moves_found_for_every_position_in_book(chess_book):
+    game = Chess()
+    for from_coords, to_coords in ((Coords(x=4, y=1), Coords(x=4, y=3)), (Coords(x=4, y=6), Coords(x=4, y=4)),
+                                   (Coords(x=6, y=0), Coords(x=5, y=2))):
+        game.move(from_coords, to_coords)
+    moves = dict(chess_book.moves(game.position_hash))
+    assert moves == {(57, 42): 1, (62, 45): 1}
+
+
+def test_no_moves_out_of_book(chess_book):
+    game = Chess()
+    game.move(Coords(x=0, y=1), Coords(x=0, y=2))
+    assert chess_book.moves(game.position_hash) == []
+    assert chess_book.choose(game, random.Random(0)) is None
+
+
+def test_choose_returns_legal_move(chess_book):
+    game = Chess()
+    for seed in range(10):
+        move = chess_book.choose(game, random.Random(seed))
+        assert move in ((Coords(x=4, y=1), Coords(x=4, y=3)), (Coords(x=3, y=1), Coords(x=3, y=3)))
+
+
+def test_choose_checks_only_moves_from_book_move_square(chess_book, monkeypatch):
+    def all_moves(self):
+        raise AssertionError('Every legal move generated')
+    monkeypatch.setattr(Chess, 'legal_moves', all_moves)
+    assert chess_book.choose(Chess(), random.Random(0)) is not None
+
+def test_illegal_record_cut_short_and_reported(tmp_path):
+    stats = build_book(Chess, ['e2e4 e7e5', 'e2e5 e7e5', 'e2e4 zz99'], str(tmp_path / 'chess.book'))
+    assert stats.skipped_lines == [2, 3]
+    assert stats.moves == 2
+
+
+def test_max_plies_limits_book_depth(tmp_path):
+    stats = build_book(Chess, ['e2e4 e7e5 g1f3 b8c6'], str(tmp_path / 'chess.book'), max_plies=2)
+    assert stats.moves == 2
+
+
+def test_draughts_book(tmp_path):
+    game = Draughts()
+    move = game.legal_moves()[0]
+    token = ''.join(f'{"abcdefgh"[coords.x]}{coords.y + 1}' for coords in move)
+    path = tmp_path / 'draughts.book'
+    build_book(Draughts, [token], str(path))
+    book = OpeningBook(str(path))
+    assert book.choose(game, random.Random(0)) == move
+    book.close()
+
+
+def test_not_a_book_raises_value_error(tmp_path):
+    path = tmp_path / 'records.txt'
+    path.write_bytes(b'e2e4 e7e5\n' * 4)
+    with pytest.raises(ValueError):
+        OpeningBook(str(path))
+
+
+def test_best_move_plays_book_move_without_searching(chess_book_variable):
+    result = best_move(Chess(), SearchBudget(seconds=None, depth=2))
+    assert result.move in Chess().legal_moves()
+    assert result.depth == 0
+    assert result.nodes == 0
+
+
+def test_best_move_searches_when_book_not_used(chess_book_variable):
+    result = best_move(Chess(), SearchBudget(seconds=None, depth=2), use_book=False)
+    assert result.depth == 2
+
+
+def test_best_move_searches_out_of_book(chess_book_variable):
+    game = Chess()
+    game.move(Coords(x=0, y=1), Coords(x=0, y=2))
+    result = best_move(game, SearchBudget(seconds=None, depth=2))
+    assert result.depth == 2
+
+
+def test_best_move_chooses_book_move_with_random_generator(chess_book_variable):
+    moves = {best_move(Chess(), random_generator=random.Random(seed)).move for seed in range(20)}
+    assert len(moves) == 2
+    assert all(best_move(Chess(), random_generator=random.Random(seed)).move
+               == best_move(Chess(), random_generator=random.Random(seed)).move for seed in range(5))
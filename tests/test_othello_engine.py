@@ -0,0 +1,102 @@
+"""Test module for Othello negascout search engine."""
+import random
+
+import pytest
+
+from src.engines import best_move, othello_engine, SearchBudget
+from src.engines.othello_engine import DISC_SCORE, evaluate
+from src.game_enums import Color
+from src.game_pieces.othello_disc import Disc
+from src.games.bitboard import othello_flips, othello_moves, pop_count, squares
+from src.games.game import Coords
+from src.games.othello import Othello
+from src.games.transposition import TranspositionTable
+
+
+def _exact_score(own, opponent, passed=False):
+    """Return final disc difference for player to move by searching every move."""
+    moves = othello_moves(own, opponent)
+    if not moves:
+        if passed:
+            return pop_count(own) - pop_count(opponent)
+        return -_exact_score(opponent, own, True)
+    scores = []
+    for square in squares(moves):
+        flips = othello_flips(square, own, opponent)
+        scores.append(-_exact_score(opponent & ~flips, own | flips | (1 << square)))
+    return max(scores)
+
+
+def _random_endgame(seed, empties):
+    random_generator = random.Random(seed)
+    game = Othello()
+    while game.empty_count() > empties and not game.winner:
+        game.move(*random_generator.choice(game.legal_moves()))
+    return game
+
+
+def test_evaluate_new_game_is_level():
+    game = Othello()
+    assert evaluate(game.discs[Color.BLACK], game.discs[Color.WHITE]) == 0
+
+
+def test_evaluate_prefers_corners():
+    # Same disc counts, one player holding a corner
+    own = 1 << 0 | 1 << 27
+    opponent = 1 << 28 | 1 << 35
+    assert evaluate(own, opponent) > 0
+    assert evaluate(opponent, own) < 0
+
+
+def test_takes_corner():
+    # Black can take the corner by flipping the disc on its X square, or play in the centre
+    game = Othello(restore_positions={
+        '22': Disc(Color.BLACK), '11': Disc(Color.WHITE),
+        '33': Disc(Color.BLACK), '43': Disc(Color.WHITE)
+    })
+    result = best_move(game, SearchBudget(seconds=None, depth=3))
+    assert result.move == (None, Coords(x=0, y=0))
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_endgame_solver_finds_exact_disc_difference(seed):
+    game = _random_endgame(seed, 8)
+    turn = game.playing_color
+    own, opponent = game.discs[turn], game.discs[game.opponent_color]
+    result = othello_engine.best_move(game, SearchBudget(seconds=None), table=TranspositionTable(max_entries=1000))
+    assert result.score == _exact_score(own, opponent) * DISC_SCORE
+
+    # Playing the chosen move keeps the same exact result
+    game.move(*result.move)
+    after = _exact_score(game.discs[game.playing_color], game.discs[game.opponent_color])
+    sign = 1 if game.playing_color == turn else -1
+    assert result.score == sign * after * DISC_SCORE
+
+
+def test_search_leaves_game_unchanged():
+    game = Othello()
+    discs = dict(game.discs)
+    best_move(game, SearchBudget(seconds=None, depth=3))
+    assert game.discs == discs
+    assert game == Othello()
+
+
+@pytest.mark.parametrize('budget', [
+    SearchBudget(seconds=None, nodes=500),
+    SearchBudget(seconds=0.2),
+])
+def test_search_respects_budget_and_reports_statistics(budget):
+    result = best_move(Othello(), budget)
+    assert result.move in Othello().legal_moves()
+    assert result.depth >= 1
+    if budget.nodes:
+        assert result.nodes <= budget.nodes
+    else:
+        assert result.seconds < budget.seconds + 0.1
+    assert result.nodes_per_second > 0
+
+
+def test_no_move_returned_when_game_over():
+    game = Othello()
+    game.winner = Color.WHITE
+    assert best_move(game, SearchBudget(seconds=None, depth=2)).move is None
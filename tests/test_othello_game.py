@@ -13,9 +13,8 @@ def test_othello_board_setup():
                                 (Color.BLACK, Coords(x=3, y=3)),
                                 (Color.BLACK, Coords(x=4, y=4))])
     actual_board_setup = set(
-        (disc.color, disc.coords)
-        for row in game.board
-        for disc in row if disc
+        (disc.color, coords)
+        for coords, disc in game.current_board_positions()
     )
     assert actual_board_setup == expected_board_setup
 
@@ -103,12 +102,31 @@ def test_player_can_move_detected_correctly():
         '11': Disc(Color.WHITE),
         '22': Disc(Color.BLACK)
     })
-    black_can_move = game._scan_board_for_trapped_discs(Coords(x=0, y=0))
+    black_can_move = game.legal_moves_from(Coords(x=0, y=0))
     assert black_can_move
 
 
 
 
+def test_opponent_without_move_passes_and_player_goes_again():
+    game = Othello(restore_positions={
+        '00': Disc(Color.BLACK),
+        '10': Disc(Color.WHITE),
+        '55': Disc(Color.WHITE),
+        '56': Disc(Color.BLACK),
+        '57': Disc(Color.BLACK),
+    })
+
+    game.move(to_coords=Coords(x=2, y=0))
+    # White has no legal placement so Black plays again
+    assert game.winner is None
+    assert game.playing_color == Color.BLACK
+    assert game.legal_moves() == [(None, Coords(x=5, y=4))]
+
+    game.move(to_coords=Coords(x=5, y=4))
+    assert game.winner == Color.BLACK
+
+
 def test_game_ends_if_both_players_cant_move():
     game = Othello(restore_positions={
         '43': Disc(Color.WHITE),
@@ -119,3 +137,69 @@ def test_game_ends_if_both_players_cant_move():
 
     game.move(to_coords=Coords(x=5, y=3))
     assert game.winner == Color.BLACK
+
+
+def test_legal_moves_for_new_game():
+    game = Othello()
+    assert set(game.legal_moves()) == {
+        (None, Coords(x=2, y=4)),
+        (None, Coords(x=3, y=5)),
+        (None, Coords(x=4, y=2)),
+        (None, Coords(x=5, y=3)),
+    }
+    assert game.legal_moves_from(Coords(x=5, y=3)) == [(None, Coords(x=5, y=3))]
+    assert game.legal_moves_from(Coords(x=5, y=4)) == []
+    assert game.legal_moves_from(Coords(x=4, y=4)) == []
+
+
+def test_empty_and_frontier_counts_updated_after_move():
+    game = Othello()
+    assert game.empty_count() == 60
+    assert game.frontier_count(Color.BLACK) == 2
+
+    game.move(to_coords=Coords(x=5, y=3))
+    assert game.empty_count() == 59
+    assert game.disc_count(Color.BLACK) == 4
+    assert game.frontier_count(Color.BLACK) == 4
+    assert game.frontier_count(Color.WHITE) == 1
+
+
+def test_game_ends_when_board_full():
+    positions = {f'{x}{y}': Disc(Color.BLACK) for x in range(8) for y in range(8)}
+    positions['00'] = Disc(Color.WHITE)
+    del positions['02']
+    game = Othello(restore_positions=positions)
+    game.playing_color = Color.WHITE
+
+    game.move(to_coords=Coords(x=0, y=2))
+    assert game.empty_count() == 0
+    assert game.winner == Color.BLACK
+
+
+def test_undo_move_restores_position_and_winner():
+    game = Othello(restore_positions={
+        '43': Disc(Color.WHITE),
+        '33': Disc(Color.BLACK),
+        '77': Disc(Color.WHITE),
+    })
+    position_hash = game.position_hash
+
+    undo_record = game.apply_move(None, Coords(x=5, y=3))
+    assert game.outcome() == Color.BLACK
+
+    game.undo_move(undo_record)
+    assert game.outcome() is None
+    assert game.position_hash == position_hash
+    assert game.playing_color == Color.BLACK
+    assert game.board[4][3] == Disc(Color.WHITE)
+    assert game.board[5][3] is None
+    assert game.legal_moves() == [(None, Coords(x=5, y=3))]
+
+
+def test_fen_round_trip():
+    game = Othello()
+    assert game.to_fen() == '8/8/8/3Dd3/3dD3/8/8/8 b'
+    game.move(to_coords=Coords(x=5, y=3))
+    restored = Othello.from_fen(game.to_fen())
+    assert restored == game
+    assert restored.legal_moves() == game.legal_moves()
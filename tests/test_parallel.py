@@ -0,0 +1,71 @@
+"""Test module for root split parallel search."""
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from src.engines import chess_engine, SearchBudget
+from src.engines.parallel import _decode_move, _encode_move, parallel_best_move
+from src.games.chess import Chess
+from src.games.draughts import Draughts
+from src.games.game import Coords
+from src.games.othello import Othello
+from src.games.transposition import TranspositionTable
+
+
+@pytest.fixture(scope='module')
+def executor():
+    with ProcessPoolExecutor(max_workers=2) as pool:
+        yield pool
+
+
+@pytest.mark.parametrize('move', [
+    (Coords(x=1, y=2), Coords(x=2, y=4)),
+    (None, Coords(x=7, y=0)),
+])
+def test_move_encoding_round_trip(move):
+    assert _decode_move(Chess(), _encode_move(move)) == move
+
+
+@pytest.mark.parametrize('game_class', [Chess, Draughts, Othello])
+def test_returns_legal_move_for_every_game(game_class, executor):
+    game = game_class()
+    result = parallel_best_move(game, SearchBudget(seconds=None, depth=2), workers=2, executor=executor)
+    assert result.move in game.legal_moves()
+    assert result.depth == 2
+    assert result.nodes > 0
+
+
+def test_score_matches_single_process_search(executor):
+    game = Chess.from_fen('r1bqk2r/pppp1ppp/2n2n2/2b1p3/2B1P3/3P1N2/PPP2PPP/RNBQK2R w KQkq - 0 1')
+    budget = SearchBudget(seconds=None, depth=3)
+    single = chess_engine.best_move(game, budget, table=TranspositionTable(max_entries=10_000))
+    split = parallel_best_move(game, budget, workers=2, executor=executor)
+    assert split.score == single.score
+
+
+def test_finds_move_only_one_worker_was_given(executor):
+    # Scholar's mate, Queen takes f7
+    game = Chess.from_fen('r1bqkbnr/pppp1ppp/2n5/4p3/2B1P3/5Q2/PPPP1PPP/RNB1K1NR w KQkq - 0 1')
+    result = parallel_best_move(game, SearchBudget(seconds=None, depth=2), workers=2, executor=executor)
+    assert result.move == (Coords(x=5, y=2), Coords(x=5, y=6))
+
+
+def test_late_worker_moves_still_compared():
+    # Scholar's mate, Queen takes f7 is in the last of three shares. With one
+    # process the first share takes the whole deadline, so the last starts late
+    game = Chess.from_fen('r1bqkbnr/pppp1ppp/2n5/4p3/2B1P3/5Q2/PPPP1PPP/RNB1K1NR w KQkq - 0 1')
+    assert game.legal_moves().index((Coords(x=5, y=2), Coords(x=5, y=6))) % 3 == 2
+    with ProcessPoolExecutor(max_workers=1) as single_executor:
+        result = parallel_best_move(game, SearchBudget(seconds=0.3), workers=3, executor=single_executor)
+    assert result.move == (Coords(x=5, y=2), Coords(x=5, y=6))
+    assert result.depth >= 1
+
+def test_honours_shared_deadline(executor):
+    result = parallel_best_move(Chess(), SearchBudget(seconds=0.3), workers=2, executor=executor)
+    assert result.seconds < 0.3 + 0.5
+    assert result.move in Chess().legal_moves()
+
+
+def test_no_move_returned_when_game_over(executor):
+    game = Chess.from_fen('7k/6Q1/6K1/8/8/8/8/8 b - - 0 1')
+    assert parallel_best_move(game, SearchBudget(seconds=None, depth=2), executor=executor).move is None
@@ -6,20 +6,20 @@ from src.games.game import Coords
 from src.game_pieces.pawn import Pawn
 
 
+BLACK_FROM_COORDS = Coords(x=1, y=6)
+WHITE_FROM_COORDS = Coords(x=1, y=1)
+
+
 @pytest.fixture(scope='module')
 def black_pawn():
-    """Setup Pawn start coords. Return Pawn"""
-    pawn = Pawn(Color.BLACK)
-    pawn.coords = Coords(x=1, y=6)
-    return pawn
+    """Return black Pawn. Moves are tested from BLACK_FROM_COORDS"""
+    return Pawn(Color.BLACK)
 
 
 @pytest.fixture(scope='module')
 def white_pawn():
-    """Setup Pawn start coords. Return Pawn"""
-    pawn = Pawn(Color.WHITE)
-    pawn.coords = Coords(x=1, y=1)
-    return pawn
+    """Return white Pawn. Moves are tested from WHITE_FROM_COORDS"""
+    return Pawn(Color.WHITE)
 
 
 @pytest.mark.parametrize('coords, rt_val', [
@@ -31,7 +31,7 @@ def white_pawn():
     (Coords(x=1, y=3), False)   # Can't move forward more than one (or two) spaces
 ])
 def test_black_pawn_legal_move(black_pawn, coords, rt_val):
-    assert black_pawn.legal_move(coords) == rt_val
+    assert black_pawn.legal_move(BLACK_FROM_COORDS, coords) == rt_val
 
 
 @pytest.mark.parametrize('coords, rt_val', [
@@ -43,7 +43,7 @@ def test_black_pawn_legal_move(black_pawn, coords, rt_val):
     (Coords(x=1, y=4), False)   # Can't move forward more than one (or two) spaces
 ])
 def test_white_pawn_legal_move(white_pawn, coords, rt_val):
-    assert white_pawn.legal_move(coords) == rt_val
+    assert white_pawn.legal_move(WHITE_FROM_COORDS, coords) == rt_val
 
 
 @pytest.mark.parametrize('coords, rt_val', [
@@ -55,7 +55,7 @@ def test_white_pawn_legal_move(white_pawn, coords, rt_val):
     (Coords(x=3, y=4), False)   # Can't capture two spaces diagonally
 ])
 def test_black_pawn_legal_capture(black_pawn, coords, rt_val):
-    assert black_pawn.legal_capture(coords) == rt_val
+    assert black_pawn.legal_capture(BLACK_FROM_COORDS, coords) == rt_val
 
 
 @pytest.mark.parametrize('coords, rt_val', [
@@ -67,4 +67,4 @@ def test_black_pawn_legal_capture(black_pawn, coords, rt_val):
     (Coords(x=3, y=3), False)   # Can't capture two spaces diagonally
 ])
 def test_white_pawn_legal_capture(white_pawn, coords, rt_val):
-    assert white_pawn.legal_capture(coords) == rt_val
+    assert white_pawn.legal_capture(WHITE_FROM_COORDS, coords) == rt_val
@@ -0,0 +1,60 @@
+"""Test module for Chess perft driver and reference counts."""
+import pytest
+
+from src.game_enums import Color
+from src.games.chess import Chess
+from src.games.game import Coords
+from src.games.perft import divide, perft, REFERENCE_POSITIONS, run_benchmark
+from src.game_pieces.king import King
+from src.game_pieces.pawn import Pawn
+from src.game_pieces.rook import Rook
+
+
+def test_from_fen_sets_up_new_game():
+    game = Chess.from_fen(REFERENCE_POSITIONS[0].fen)
+    assert game == Chess()
+    assert game.unmoved_coords == Chess().unmoved_coords
+    assert game.last_move_pawn_coords is None
+
+
+def test_from_fen_sets_castling_en_passant_and_color():
+    game = Chess.from_fen('r3k2r/8/8/8/3pP3/8/8/R3K2R b Kq e3 0 1')
+    assert game.playing_color == Color.BLACK
+    assert game.board[4][3] == Pawn(Color.WHITE)
+    assert game.last_move_pawn_coords == Coords(x=4, y=3)
+    assert game.board[4][0] == King(Color.WHITE)
+    assert game.unmoved_coords == {Coords(x=4, y=0), Coords(x=7, y=0), Coords(x=4, y=7), Coords(x=0, y=7)}
+    assert (Coords(x=3, y=3), Coords(x=4, y=2)) in game.legal_moves()
+
+
+@pytest.mark.parametrize('position', REFERENCE_POSITIONS, ids=lambda position: position.name)
+def test_perft_matches_reference_counts(position):
+    game = Chess.from_fen(position.fen)
+    for depth, expected_nodes in enumerate(position.node_counts[:2], start=1):
+        assert perft(game, depth) == expected_nodes
+
+
+def test_perft_depth_three_start_position():
+    assert perft(Chess(), 3) == 8902
+
+
+def test_perft_leaves_position_unchanged():
+    game = Chess.from_fen(REFERENCE_POSITIONS[1].fen)
+    perft(game, 2)
+    assert game == Chess.from_fen(REFERENCE_POSITIONS[1].fen)
+    assert isinstance(game.board[7][0], Rook) and Coords(x=7, y=0) in game.unmoved_coords
+
+
+def test_divide_sums_to_perft():
+    game = Chess()
+    counts = divide(game, 2)
+    assert len(counts) == 20
+    assert counts[(Coords(x=4, y=1), Coords(x=4, y=3))] == 20
+    assert sum(counts.values()) == 400
+
+
+def test_run_benchmark_reports_results():
+    results = run_benchmark(1, REFERENCE_POSITIONS[:1])
+    assert len(results) == 1
+    assert results[0].nodes == results[0].expected_nodes == 20
+    assert results[0].nodes_per_second > 0
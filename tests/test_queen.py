@@ -6,11 +6,13 @@ from src.games.game import Coords
 from src.game_pieces.queen import Queen
 
 
+FROM_COORDS = Coords(x=7, y=4)
+
+
 @pytest.fixture(scope='module')
 def queen():
-    """Setup Queen start coords. Return Queen"""
+    """Return Queen. Moves are tested from FROM_COORDS"""
     game_queen = Queen(Color.BLACK)
-    game_queen.coords = Coords(x=7, y=4)
     return game_queen
 
 
@@ -24,9 +26,9 @@ test_data = [
 
 @pytest.mark.parametrize('coords, rt_val', test_data)
 def test_queen_legal_move(queen, coords, rt_val):
-    assert queen.legal_move(coords) == rt_val
+    assert queen.legal_move(FROM_COORDS, coords) == rt_val
 
 
 @pytest.mark.parametrize('coords, rt_val', test_data)
 def test_queen_legal_capture(queen, coords, rt_val):
-    assert queen.legal_capture(coords) == rt_val
+    assert queen.legal_capture(FROM_COORDS, coords) == rt_val
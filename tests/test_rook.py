@@ -6,11 +6,13 @@ from src.games.game import Coords
 from src.game_pieces.rook import Rook
 
 
+FROM_COORDS = Coords(x=7, y=4)
+
+
 @pytest.fixture(scope='module')
 def rook():
-    """Setup Rook start coords. Return Rook"""
+    """Return Rook. Moves are tested from FROM_COORDS"""
     game_rook = Rook(Color.BLACK)
-    game_rook.coords = Coords(x=7, y=4)
     return game_rook
 
 
@@ -24,9 +26,9 @@ test_data = [
 
 @pytest.mark.parametrize('coords, rt_val', test_data)
 def test_rook_legal_move(rook, coords, rt_val):
-    assert rook.legal_move(coords) == rt_val
+    assert rook.legal_move(FROM_COORDS, coords) == rt_val
 
 
 @pytest.mark.parametrize('coords, rt_val', test_data)
 def test_rook_legal_capture(rook, coords, rt_val):
-    assert rook.legal_capture(coords) == rt_val
+    assert rook.legal_capture(FROM_COORDS, coords) == rt_val
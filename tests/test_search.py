@@ -0,0 +1,81 @@
+"""Test module for shared engine search budget and iterative deepening."""
+import threading
+
+import pytest
+
+from src.engines.search import (iterative_deepening, SearchBudget, SearchClock, SearchResult,
+                                SearchTimeout)
+
+
+def test_search_budget_defaults_to_one_second():
+    assert SearchBudget() == SearchBudget(seconds=1.0, nodes=None, depth=None)
+
+
+def test_clock_raises_timeout_when_node_budget_spent():
+    clock = SearchClock(SearchBudget(seconds=None, nodes=3))
+    clock.tick()
+    clock.tick()
+    with pytest.raises(SearchTimeout):
+        clock.tick()
+    assert clock.nodes == 3
+
+
+def test_iterative_deepening_stops_at_depth_limit():
+    searched_depths = []
+
+    def search_root(depth):
+        searched_depths.append(depth)
+        return f'move {depth}', depth * 10
+
+    clock = SearchClock(SearchBudget(seconds=None, depth=3))
+    result = iterative_deepening(search_root, clock, 'fallback')
+    assert searched_depths == [1, 2, 3]
+    assert isinstance(result, SearchResult)
+    assert (result.move, result.score, result.depth) == ('move 3', 30, 3)
+
+
+def test_iterative_deepening_keeps_last_completed_depth_on_timeout():
+    clock = SearchClock(SearchBudget(seconds=None, nodes=5))
+
+    def search_root(depth):
+        for _ in range(depth):
+            clock.tick()
+        return f'move {depth}', depth
+
+    # Depths 1 and 2 take 3 nodes, depth 3 runs out part way
+    result = iterative_deepening(search_root, clock, 'fallback')
+    assert (result.move, result.depth, result.nodes) == ('move 2', 2, 5)
+
+
+def test_iterative_deepening_returns_fallback_if_no_depth_completes():
+    clock = SearchClock(SearchBudget(seconds=None, nodes=1))
+
+    def search_root(depth):
+        clock.tick()
+        return 'move', 0
+
+    assert iterative_deepening(search_root, clock, 'fallback').move == 'fallback'
+
+
+def test_iterative_deepening_stops_at_decisive_score():
+    clock = SearchClock(SearchBudget(seconds=None, depth=10))
+    result = iterative_deepening(lambda depth: ('mate', 1000), clock, 'fallback', decisive_score=1000)
+    assert result.depth == 1
+
+
+def test_iterative_deepening_records_history_of_completed_depths():
+    history = []
+    clock = SearchClock(SearchBudget(seconds=None, depth=3))
+    iterative_deepening(lambda depth: (f'move {depth}', depth * 10), clock, 'fallback', history=history)
+    assert history == [(1, 'move 1', 10), (2, 'move 2', 20), (3, 'move 3', 30)]
+
+
+def test_clock_raises_timeout_once_stop_event_set():
+    stop = threading.Event()
+    clock = SearchClock(SearchBudget(seconds=None, stop=stop))
+    for _ in range(SearchClock.CHECK_EVERY):
+        clock.tick()
+    stop.set()
+    with pytest.raises(SearchTimeout):
+        for _ in range(SearchClock.CHECK_EVERY):
+            clock.tick()
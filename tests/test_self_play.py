@@ -0,0 +1,107 @@
+"""Test module for headless self-play."""
+from concurrent.futures import ProcessPoolExecutor
+import gzip
+
+import pytest
+
+from src.engines import SearchBudget
+from src.engines.opening_book import build_book
+from src.engines.self_play import (_notation, BLACK, DRAW, ERROR, play_game, run_self_play, UNFINISHED,
+                                   WHITE)
+from src.game_errors import IllegalMoveError
+from src.games.chess import Chess
+from src.games.draughts import Draughts
+from src.games.game import Coords
+from src.games.othello import Othello
+
+
+@pytest.fixture(scope='module')
+def executor():
+    with ProcessPoolExecutor(max_workers=2) as pool:
+        yield pool
+
+
+@pytest.mark.parametrize('game_class', [Chess, Draughts, Othello])
+def test_random_game_played_to_the_end(game_class):
+    record = play_game(game_class, seed=1)
+    assert record.result in (WHITE, BLACK, DRAW, UNFINISHED)
+    assert record.error is None
+    assert record.moves
+
+
+def test_same_seed_plays_same_game():
+    assert play_game(Chess, seed=7) == play_game(Chess, seed=7)
+    assert play_game(Chess, seed=7) != play_game(Chess, seed=8)
+
+
+@pytest.mark.parametrize('player', ['search', 'mcts'])
+def test_same_seed_plays_same_engine_game(player):
+    budget = SearchBudget(seconds=None, nodes=30)
+    first, second = (play_game(Othello, player, budget, max_plies=10, seed=7) for _ in range(2))
+    assert first == second
+
+
+def test_unfinished_after_max_plies():
+    record = play_game(Chess, max_plies=10, seed=1)
+    assert record.result == UNFINISHED
+    assert len(record.moves) == 10
+
+
+@pytest.mark.parametrize('player', ['search', 'mcts'])
+def test_engine_players(player):
+    record = play_game(Othello, player, SearchBudget(seconds=None, nodes=50), max_plies=8, seed=1)
+    assert record.result == UNFINISHED
+    assert len(record.moves) == 8
+
+
+def test_unknown_player_raises_value_error():
+    with pytest.raises(ValueError):
+        play_game(Chess, 'human')
+
+
+def test_rules_failure_recorded_as_error(monkeypatch):
+    def reject_move(self, from_coords=None, to_coords=None):
+        raise IllegalMoveError('Rejected')
+    monkeypatch.setattr(Draughts, 'move', reject_move)
+    record = play_game(Draughts, seed=1)
+    assert record.result == ERROR
+    assert record.error == 'IllegalMoveError: Rejected'
+    assert record.moves == []
+
+
+@pytest.mark.parametrize('move, notation', [
+    ((Coords(x=4, y=1), Coords(x=4, y=3)), 'e2e4'),
+    ((None, Coords(x=3, y=2)), 'd3'),
+])
+def test_notation(move, notation):
+    assert _notation(move) == notation
+
+
+def test_run_streams_records_and_reports_rates(executor, tmp_path):
+    path = str(tmp_path / 'chess.txt')
+    stats = run_self_play(Chess, 20, path, max_plies=30, seed=1, executor=executor)
+    with open(path) as records:
+        lines = records.read().splitlines()
+    assert len(lines) == stats.games == 20
+    assert sum(stats.results.values()) == 20
+    assert stats.moves == sum(len(line.split('#')[0].split()) for line in lines)
+    assert stats.games_per_second > 0 and stats.moves_per_second > 0
+
+
+def test_run_appends_gzip_records(executor, tmp_path):
+    path = str(tmp_path / 'othello.txt.gz')
+    run_self_play(Othello, 3, path, seed=1, executor=executor)
+    run_self_play(Othello, 2, path, seed=1, executor=executor)
+    with gzip.open(path, 'rt') as records:
+        lines = records.read().splitlines()
+    assert len(lines) == 5
+    assert all(line.split('# ')[1] in (WHITE, BLACK, DRAW) for line in lines)
+
+
+def test_records_build_opening_book(executor, tmp_path):
+    path = str(tmp_path / 'draughts.txt')
+    run_self_play(Draughts, 10, path, max_plies=20, seed=1, executor=executor)
+    with open(path) as records:
+        stats = build_book(Draughts, records, str(tmp_path / 'draughts.book'))
+    assert stats.games == 10
+    assert stats.skipped_lines == []
@@ -0,0 +1,161 @@
+"""Test module for retrograde analysis endgame tablebases."""
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from src.engines import draughts_engine, SearchBudget
+from src.engines.tablebase import (_Layout, _position_game, _required_signatures, _successor_chunk,
+                                   _table_path, DRAW, generate, LOSS, search_score, TablebaseResult,
+                                   Tablebases, WIN)
+from src.game_enums import Color
+from src.games.chess import Chess
+from src.games.draughts import Draughts
+from src.games.transposition import TranspositionTable
+
+
+@pytest.fixture(scope='module')
+def tablebase_directory(tmp_path_factory):
+    directory = str(tmp_path_factory.mktemp('tablebases'))
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        generate(Draughts, 'MvK', directory, executor=executor)
+        generate(Chess, 'KvK', directory, executor=executor)
+    return directory
+
+
+@pytest.fixture
+def tablebases(tablebase_directory):
+    return Tablebases(tablebase_directory)
+
+
+class _NoWorkers():
+    """Executor for tests where every chunk should already be saved."""
+
+    def submit(self, *args):
+        raise AssertionError('Chunk worked out again')
+
+
+def _layout_games(game_class, signature):
+    layout = _Layout(game_class, signature)
+    for index in range(layout.size):
+        game = _position_game(layout, *layout.position(index))
+        if game is not None:
+            yield game
+
+
+def _assert_consistent_with_successors(tablebases, game):
+    """Check probe of game agrees with probes (or outcomes) of every position one move on."""
+    result = tablebases.probe(game)
+    successor_results = []
+    for move in game.legal_moves():
+        undo_record = game.apply_move(*move)
+        successor = tablebases.probe(game)
+        if successor is None:
+            # Side with no counters left to move has lost
+            assert not game.legal_moves()
+            successor = TablebaseResult(LOSS, 0)
+        successor_results.append(successor)
+        game.undo_move(undo_record)
+
+    if not successor_results:
+        assert result == TablebaseResult(LOSS, 0)
+    elif result.wdl == WIN:
+        assert result.plies == 1 + min(plies for wdl, plies in successor_results if wdl == LOSS)
+    elif result.wdl == LOSS:
+        assert all(wdl == WIN for wdl, _ in successor_results)
+        assert result.plies == 1 + max(plies for _, plies in successor_results)
+    else:
+        assert all(wdl != LOSS for wdl, _ in successor_results)
+        assert any(wdl == DRAW for wdl, _ in successor_results)
+
+
+def test_required_signatures_smallest_first():
+    assert _required_signatures(Chess, 'KPvK') == ['KvK', 'KQvK', 'KPvK']
+    assert _required_signatures(Draughts, 'KvM') == ['KvK', 'KvM']
+
+
+@pytest.mark.parametrize('game_class, signature', [
+    (Chess, 'KQvK'),
+    (Chess, 'KPvK'),
+    (Draughts, 'KKvK'),
+])
+def test_layout_index_round_trip(game_class, signature):
+    layout = _Layout(game_class, signature)
+    for index in range(0, layout.size, 997):
+        assert layout.index(*layout.position(index)) == index
+
+
+def test_chess_symmetric_positions_share_index():
+    layout = _Layout(Chess, 'KQvK')
+    # a1 King, b3 Queen, h8 King mirrored to h1, g3, a8
+    assert layout.index([0, 17, 63], True) == layout.index([7, 22, 56], True)
+
+
+def test_draughts_kings_table_consistent(tablebases):
+    for game in _layout_games(Draughts, 'KvK'):
+        _assert_consistent_with_successors(tablebases, game)
+
+
+def test_draughts_man_table_consistent_with_colors_swapped(tablebases):
+    # Stored as KvM, so every probe of White man against Black King swaps colors
+    for game in _layout_games(Draughts, 'KvM'):
+        flipped = Draughts.from_fen(_flip_fen(game.to_fen()))
+        assert tablebases.probe(flipped) == tablebases.probe(game)
+        _assert_consistent_with_successors(tablebases, flipped)
+
+
+def test_chess_bare_kings_all_draws(tablebases):
+    assert {tablebases.probe(game) for game in _layout_games(Chess, 'KvK')} == {TablebaseResult(DRAW, 0)}
+
+
+def test_probe_single_corner_king_lost(tablebases):
+    game = Draughts.from_fen('7k/8/8/8/8/8/8/K7 w')
+    assert tablebases.probe(game) == TablebaseResult(WIN, 11)
+    assert tablebases.outcome(game) == Color.WHITE
+
+
+def test_probe_none_without_table(tablebases):
+    assert tablebases.probe(Draughts()) is None
+    assert tablebases.probe(Chess.from_fen('7k/6Q1/6K1/8/8/8/8/8 b - - 0 1')) is None
+    assert tablebases.outcome(Draughts()) is None
+
+
+def test_missing_directory_has_no_tables(tmp_path):
+    assert Tablebases(str(tmp_path / 'missing')).probe(Draughts.from_fen('7k/8/8/8/8/8/8/K7 w')) is None
+    assert Tablebases(None).probe(Chess.from_fen('8/8/8/3k4/8/8/8/K7 w - - 0 1')) is None
+
+
+def test_generation_resumes_from_saved_chunks(tablebase_directory, tmp_path):
+    directory = str(tmp_path)
+    layout = _Layout(Draughts, 'KvK')
+    _successor_chunk('draughts', 'KvK', directory, 0, layout.size)
+    stats = generate(Draughts, 'KvK', directory, executor=_NoWorkers())
+    assert [table_stats.signature for table_stats in stats] == ['KvK']
+    with open(_table_path(directory, Draughts, 'KvK'), 'rb') as resumed, \
+            open(_table_path(tablebase_directory, Draughts, 'KvK'), 'rb') as original:
+        assert resumed.read() == original.read()
+
+
+def test_existing_tables_not_generated_again(tablebase_directory):
+    assert generate(Draughts, 'MvK', tablebase_directory, executor=_NoWorkers()) == []
+
+
+def test_search_score_orders_quick_wins_first():
+    assert search_score(TablebaseResult(WIN, 3), 2, 1000) > search_score(TablebaseResult(WIN, 5), 2, 1000)
+    assert search_score(TablebaseResult(LOSS, 4), 1, 1000) > search_score(TablebaseResult(LOSS, 2), 1, 1000)
+    assert search_score(TablebaseResult(DRAW, 0), 1, 1000) == 0
+
+
+def test_engine_scores_endgame_from_tablebase(tablebases):
+    game = Draughts.from_fen('7k/8/8/8/8/8/8/K7 w')
+    result = draughts_engine.best_move(game, SearchBudget(seconds=None, depth=1),
+                                       table=TranspositionTable(max_entries=1000), tablebases=tablebases)
+    assert result.score == draughts_engine.WIN_SCORE - 11
+    game.move(*result.move)
+    assert tablebases.probe(game) == TablebaseResult(LOSS, 10)
+
+
+def _flip_fen(fen):
+    """Return Draughts FEN with colors swapped and board turned around."""
+    placement, color = fen.split()
+    rows = [row.swapcase()[::-1] for row in reversed(placement.split('/'))]
+    return f'{"/".join(rows)} {"b" if color == "w" else "w"}'
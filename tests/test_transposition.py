@@ -0,0 +1,77 @@
+"""Test module for TranspositionTable LRU cache and Chess position status cache."""
+import pytest
+
+from src.games.chess import Chess, POSITION_STATUS_CACHE, PositionStatus
+from src.games.transposition import ENTRY_BYTES, TranspositionTable
+
+
+def test_get_returns_default_and_counts_miss():
+    table = TranspositionTable(max_entries=2)
+    assert table.get(1) is None
+    assert table.get(1, 'default') == 'default'
+    assert table.stats().misses == 2
+
+
+def test_put_then_get_counts_hit():
+    table = TranspositionTable(max_entries=2)
+    table.put(1, 'one')
+    assert table.get(1) == 'one'
+    assert 1 in table
+    assert table.stats().hits == 1
+
+
+def test_least_recently_used_entry_evicted():
+    table = TranspositionTable(max_entries=2)
+    table.put(1, 'one')
+    table.put(2, 'two')
+    table.get(1)
+    table.put(3, 'three')
+    assert 2 not in table
+    assert 1 in table and 3 in table
+    assert len(table) == 2
+    assert table.stats().evictions == 1
+
+
+def test_max_bytes_limits_entries():
+    table = TranspositionTable(max_entries=1000, max_bytes=ENTRY_BYTES * 10)
+    assert table.max_entries == 10
+
+
+def test_limit_required():
+    with pytest.raises(ValueError):
+        TranspositionTable()
+
+
+def test_get_or_compute_only_computes_on_miss():
+    table = TranspositionTable(max_entries=2)
+    calls = []
+    compute = lambda: calls.append(1) or 'value'
+    assert table.get_or_compute(1, compute) == 'value'
+    assert table.get_or_compute(1, compute) == 'value'
+    assert len(calls) == 1
+
+
+def test_clear_resets_entries_and_counters():
+    table = TranspositionTable(max_entries=2)
+    table.put(1, 'one')
+    table.get(1)
+    table.clear()
+    assert table.stats() == (0, 2, 0, 0, 0)
+
+
+@pytest.mark.parametrize('fen, expected_status', [
+    ('rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1', PositionStatus(False, False, False)),
+    ('7k/6Q1/6K1/8/8/8/8/8 b - - 0 1', PositionStatus(True, True, False)),
+    ('7k/5Q2/6K1/8/8/8/8/8 b - - 0 1', PositionStatus(False, False, True)),
+    ('7k/8/6K1/8/8/8/8/7Q b - - 0 1', PositionStatus(True, False, False)),
+])
+def test_chess_position_status(fen, expected_status):
+    assert Chess.from_fen(fen).position_status() == expected_status
+
+
+def test_chess_position_status_reused_across_games():
+    POSITION_STATUS_CACHE.clear()
+    Chess().position_status()
+    Chess().position_status()
+    assert POSITION_STATUS_CACHE.stats().hits == 1
+    assert POSITION_STATUS_CACHE.stats().misses == 1
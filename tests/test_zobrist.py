@@ -0,0 +1,108 @@
+"""Test module for Zobrist position hashing."""
+import random
+
+import pytest
+
+from src.game_enums import Color
+from src.games.chess import Chess
+from src.games.draughts import Draughts
+from src.games.game import Coords
+from src.games.othello import Othello
+from src.games.zobrist import piece_key, SIDE_TO_MOVE_KEY, zobrist_key
+from src.game_pieces.draughts_counter import Counter
+from src.game_pieces.king import King
+from src.game_pieces.pawn import Pawn
+from src.game_pieces.rook import Rook
+
+
+def test_zobrist_key_is_deterministic_64_bit_int():
+    assert zobrist_key('a', 1) == zobrist_key('a', 1)
+    assert zobrist_key('a', 1) != zobrist_key('a', 2)
+    assert 0 <= zobrist_key('a', 1) < 2 ** 64
+
+
+def test_piece_key_depends_on_piece_color_and_square():
+    assert piece_key(Pawn(Color.WHITE), Coords(0, 1)) != piece_key(Pawn(Color.BLACK), Coords(0, 1))
+    assert piece_key(Pawn(Color.WHITE), Coords(0, 1)) != piece_key(Pawn(Color.WHITE), Coords(1, 1))
+
+
+@pytest.mark.parametrize('game_class', [Chess, Draughts, Othello])
+def test_new_game_hash_matches_full_recompute(game_class):
+    game = game_class()
+    assert game.position_hash == game._compute_position_hash()
+    assert game.position_hash == game_class().position_hash
+
+
+@pytest.mark.parametrize('game_class', [Chess, Draughts, Othello])
+def test_incremental_hash_matches_full_recompute_during_random_game(game_class):
+    random.seed(5)
+    game = game_class()
+    for _ in range(40):
+        moves = game.legal_moves()
+        if not moves or game.winner:
+            break
+        game.move(*random.choice(sorted(moves, key=str)))
+        assert game.position_hash == game._compute_position_hash()
+
+
+def test_side_to_move_changes_hash(new_game):
+    position_hash = new_game.position_hash
+    new_game.switch_players()
+    assert new_game.position_hash == position_hash ^ SIDE_TO_MOVE_KEY
+    new_game.switch_players()
+    assert new_game.position_hash == position_hash
+
+
+def test_transposed_chess_positions_hash_equal():
+    knights_first = Chess()
+    for move in (('10', '22'), ('17', '25'), ('60', '52'), ('67', '55')):
+        knights_first.move(*move)
+    kings_side_first = Chess()
+    for move in (('60', '52'), ('67', '55'), ('10', '22'), ('17', '25')):
+        kings_side_first.move(*move)
+    assert knights_first.position_hash == kings_side_first.position_hash
+
+
+def test_castling_rights_change_hash():
+    game = Chess.from_fen('r3k2r/8/8/8/8/8/8/R3K2R w KQkq - 0 1')
+    no_king_side = Chess.from_fen('r3k2r/8/8/8/8/8/8/R3K2R w Qkq - 0 1')
+    assert game.position_hash != no_king_side.position_hash
+
+    # Rook there and back leaves same pieces but loses castling right
+    for move in (('70', '71'), ('77', '76'), ('71', '70'), ('76', '77')):
+        game.move(*move)
+    assert game.position_hash == Chess.from_fen('r3k2r/8/8/8/8/8/8/R3K2R w Qq - 0 1').position_hash
+    assert game.position_hash == game._compute_position_hash()
+
+
+def test_add_keeps_castling_rights_in_hash():
+    game = Chess(restore_positions={'40': King(Color.WHITE), '47': King(Color.BLACK)})
+    game.add(Rook(Color.WHITE), Coords(x=7, y=0))
+    assert game.position_hash == game._compute_position_hash()
+    assert Chess.from_fen(game.to_fen()).position_hash == game.position_hash
+
+
+def test_en_passant_square_changes_hash():
+    with_en_passant = Chess.from_fen('4k3/8/8/8/3pP3/8/8/4K3 b - e3 0 1')
+    without_en_passant = Chess.from_fen('4k3/8/8/8/3pP3/8/8/4K3 b - - 0 1')
+    assert with_en_passant.position_hash != without_en_passant.position_hash
+
+
+def test_undo_move_restores_hash():
+    game = Chess.from_fen('r3k2r/8/8/8/3pP3/8/8/R3K2R b KQkq e3 0 1')
+    position_hash = game.position_hash
+    for move in game.legal_moves():
+        undo_record = game.apply_move(*move)
+        assert game.position_hash == game._compute_position_hash()
+        game.undo_move(undo_record)
+        assert game.position_hash == position_hash
+
+
+def test_draughts_crowning_changes_hash():
+    game = Draughts({'16': Counter(Color.WHITE), '11': Counter(Color.BLACK)})
+    game.move(Coords(x=1, y=1), Coords(x=0, y=0))
+    assert game.board[0][0].crowned
+    assert game.position_hash == game._compute_position_hash()
+
+    game.board[0][0] = Counter(Color.BLACK)
+    assert game.position_hash != game._compute_position_hash()